@@ -1,19 +1,30 @@
 """The Dashboard Backup integration."""
 from __future__ import annotations
 
+import asyncio
+from functools import partial
 import os
 import logging
+import time
+from typing import Any, Callable
 import voluptuous as vol
-from datetime import datetime
+from datetime import datetime, timedelta
 import yaml
-import json
 
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
 from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import slugify
+import homeassistant.util.dt as dt_util
 from homeassistant.exceptions import HomeAssistantError
+# Validation errors were added in Home Assistant 2023.11
+try:
+    from homeassistant.exceptions import ServiceValidationError
+except ImportError:
+    ServiceValidationError = HomeAssistantError
 # Try to import frontend functions, with fallbacks for different HA versions
 try:
     from homeassistant.components.frontend import async_get_frontend_data
@@ -22,32 +33,158 @@ except ImportError:
     async def async_get_frontend_data(hass):
         """Fallback implementation when async_get_frontend_data is not available."""
         return None
+# Service responses were added in Home Assistant 2023.7
+try:
+    from homeassistant.core import SupportsResponse
+except ImportError:
+    SupportsResponse = None
 from homeassistant.components.lovelace import dashboard
 
 from .const import (
     DOMAIN,
     CONF_BACKUP_PATH,
+    CONF_BACKUP_MODE,
+    DATA_INDEX,
+    DATA_RESOLVER,
+    DATA_PRUNE_TASK,
+    DATA_WATCHER,
+    DATA_SCHEDULER,
+    DATA_COORDINATOR,
+    DATA_STATS,
+    DATA_STRATEGIES,
+    DATA_VERIFY_TASK,
+    DATA_JOBS,
+    DATA_SETUP_TIMER,
+    CONF_FULL_BACKUP_INTERVAL,
+    CONF_COMPRESSION,
+    CONF_COMPRESSION_LEVEL,
+    CONF_AUTO_BACKUP,
+    CONF_AUTO_BACKUP_DELAY,
+    CONF_SCHEDULE_INTERVAL,
+    CONF_SCHEDULE_JITTER,
+    CONF_RETENTION_KEEP_LAST,
+    CONF_RETENTION_DAILY,
+    CONF_RETENTION_WEEKLY,
+    CONF_RETENTION_MONTHLY,
+    CONF_RETENTION_MAX_SIZE,
     DEFAULT_BACKUP_PATH,
+    DEFAULT_BACKUP_MODE,
+    DEFAULT_FULL_BACKUP_INTERVAL,
+    DEFAULT_COMPRESSION,
+    DEFAULT_COMPRESSION_LEVEL,
+    DEFAULT_AUTO_BACKUP,
+    DEFAULT_AUTO_BACKUP_DELAY,
+    DEFAULT_SCHEDULE_INTERVAL,
+    DEFAULT_SCHEDULE_JITTER,
+    DEFAULT_RETENTION_KEEP_LAST,
+    DEFAULT_RETENTION_DAILY,
+    DEFAULT_RETENTION_WEEKLY,
+    DEFAULT_RETENTION_MONTHLY,
+    DEFAULT_RETENTION_MAX_SIZE,
+    PRUNE_INTERVAL_HOURS,
+    BACKUP_MODE_INCREMENTAL,
     SERVICE_CREATE_BACKUP,
     SERVICE_RESTORE_BACKUP,
+    SERVICE_LIST_BACKUPS,
+    SERVICE_BACKUP_ALL,
+    SERVICE_DIFF_BACKUPS,
+    SERVICE_VERIFY_BACKUPS,
+    SERVICE_GET_JOB,
+    SERVICE_ADD_CARD_RESOURCE,
     ATTR_DASHBOARD_ID,
     ATTR_BACKUP_FILE,
     ATTR_TIMESTAMP,
+    ATTR_VIEW,
+    ATTR_CARD,
+    ATTR_FROM_BACKUP,
+    ATTR_TO_BACKUP,
+    ATTR_START,
+    ATTR_END,
+    ATTR_ORDER,
+    ATTR_OFFSET,
+    ATTR_LIMIT,
+    ATTR_MAX_WORKERS,
+    ATTR_MAX_RATE,
+    ATTR_BACKGROUND,
+    ATTR_JOB_ID,
+    DEFAULT_MAX_WORKERS,
+    MAX_WORKERS,
+    DEFAULT_VERIFY_RATE,
+    MAX_VERIFY_RATE,
+    JOB_WORKERS,
+    JOB_HISTORY,
+    ORDER_NEWEST,
+    ORDER_OLDEST,
+    DEFAULT_LIST_LIMIT,
+    MAX_LIST_LIMIT,
+    TIMESTAMP_FORMAT,
+    PRE_RESTORE_DIR,
+    PRE_RESTORE_KEEP,
     EVENT_BACKUP_CREATED,
     EVENT_BACKUP_RESTORED,
     EVENT_BACKUP_FAILED,
     EVENT_RESTORE_FAILED,
+    EVENT_BATCH_BACKUP_COMPLETED,
+    EVENT_VERIFY_COMPLETED,
+    EVENT_LOVELACE_UPDATED,
     ERROR_DASHBOARD_NOT_FOUND,
     ERROR_BACKUP_FAILED,
     ERROR_RESTORE_FAILED,
     ERROR_BACKUP_NOT_FOUND,
+    ERROR_INVALID_BACKUP_FILE,
     ERROR_INVALID_YAML,
+    ERROR_VERIFY_RUNNING,
+    ERROR_JOB_NOT_FOUND,
 )
+from .compare import diff_backups as compare_backups
+from .coordinator import JobCoordinator, next_timestamp
 from .frontend import async_setup_frontend
-from .update_www import copy_card_files
+from .index import BackupIndex, is_bare_filename
+from .jobs import JOB_BACKUP, JOB_BACKUP_ALL, JOB_RESTORE, JobQueue
+from .partial import load_backup_config, merge_backup_subtree
+from .resolver import StoragePathResolver
+from .retention import RetentionPolicy, async_prune_backups
+from .scheduler import BackupScheduler
+from .stats import BackupStats, SetupTimer, backup_metrics, describe_backup
+from .strategies import StrategyRegistry
+from .pipeline import (
+    MODE_FORMATS,
+    create_backup_files,
+    create_incremental_backup_files,
+    is_json_backup,
+    restore_storage_file,
+)
+from .storage_io import (
+    async_make_dirs,
+    async_path_exists,
+    async_read_json,
+    async_read_yaml,
+    async_run,
+    async_preserve_file,
+    async_write_json,
+    async_write_json_atomic,
+    async_write_yaml_atomic,
+)
+from .verify import async_verify_backups
+from .watcher import DashboardWatcher
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["sensor"]
+
+# Services registered by the integration, removed with its last config entry
+SERVICES = [
+    SERVICE_CREATE_BACKUP,
+    SERVICE_RESTORE_BACKUP,
+    SERVICE_LIST_BACKUPS,
+    SERVICE_BACKUP_ALL,
+    SERVICE_DIFF_BACKUPS,
+    SERVICE_VERIFY_BACKUPS,
+    SERVICE_GET_JOB,
+    SERVICE_ADD_CARD_RESOURCE,
+]
+
 CONFIG_SCHEMA = vol.Schema(
     {
         DOMAIN: vol.Schema(
@@ -62,13 +199,70 @@ CONFIG_SCHEMA = vol.Schema(
 BACKUP_SCHEMA = vol.Schema(
     {
         vol.Optional(ATTR_DASHBOARD_ID): cv.string,
+        vol.Optional(ATTR_BACKGROUND, default=False): cv.boolean,
+    }
+)
+
+RESTORE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DASHBOARD_ID): cv.string,
+            vol.Optional(ATTR_BACKUP_FILE): cv.string,
+            vol.Optional(ATTR_VIEW): cv.string,
+            vol.Optional(ATTR_CARD): cv.string,
+            vol.Optional(ATTR_BACKGROUND, default=False): cv.boolean,
+        }
+    ),
+    # A card is looked up inside a view
+    cv.key_dependency(ATTR_CARD, ATTR_VIEW),
+)
+
+BACKUP_ALL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_MAX_WORKERS, default=DEFAULT_MAX_WORKERS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_WORKERS)
+        ),
+        vol.Optional(ATTR_BACKGROUND, default=False): cv.boolean,
+    }
+)
+
+DIFF_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional(ATTR_DASHBOARD_ID): cv.string,
+            vol.Optional(ATTR_FROM_BACKUP): cv.string,
+            vol.Optional(ATTR_TO_BACKUP): cv.string,
+        }
+    ),
+    # The side without a backup is the live dashboard
+    cv.has_at_least_one_key(ATTR_FROM_BACKUP, ATTR_TO_BACKUP),
+)
+
+VERIFY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DASHBOARD_ID): cv.string,
+        vol.Optional(ATTR_MAX_RATE, default=DEFAULT_VERIFY_RATE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_VERIFY_RATE)
+        ),
     }
 )
 
-RESTORE_SCHEMA = vol.Schema(
+GET_JOB_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_JOB_ID): cv.string,
+    }
+)
+
+LIST_SCHEMA = vol.Schema(
     {
         vol.Optional(ATTR_DASHBOARD_ID): cv.string,
-        vol.Optional(ATTR_BACKUP_FILE): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_ORDER, default=ORDER_NEWEST): vol.In([ORDER_NEWEST, ORDER_OLDEST]),
+        vol.Optional(ATTR_OFFSET, default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional(ATTR_LIMIT, default=DEFAULT_LIST_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_LIST_LIMIT)
+        ),
     }
 )
 
@@ -85,150 +279,727 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Dashboard Backup from a config entry."""
+    timer = SetupTimer()
+
     # Store the config entry data
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = entry.data
 
+    # Make the entry's settings, overridden by its options, visible to the services
+    hass.data[DOMAIN].update({**entry.data, **entry.options})
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
     # Create backup directory if it doesn't exist
-    backup_path = entry.data.get(CONF_BACKUP_PATH, DEFAULT_BACKUP_PATH)
-    full_backup_path = os.path.join(hass.config.config_dir, backup_path)
-    os.makedirs(full_backup_path, exist_ok=True)
+    full_backup_path = get_backup_path(hass)
+    await async_make_dirs(hass, full_backup_path)
+
+    # Load the backup index, rebuilding it from the directory if needed
+    index = BackupIndex(full_backup_path)
+    await async_run(hass, index.load)
+    hass.data[DOMAIN][DATA_INDEX] = index
+
+    # Backup metrics for the sensors, starting from the newest indexed backup
+    stats = BackupStats(hass)
+    _, newest = index.query(limit=1)
+    if newest:
+        stats.last_backup = {
+            ATTR_DASHBOARD_ID: newest[0]["dashboard_id"],
+            ATTR_BACKUP_FILE: newest[0]["file"],
+            ATTR_TIMESTAMP: newest[0]["timestamp"],
+            **backup_metrics(newest[0]),
+        }
+    hass.data[DOMAIN][DATA_STATS] = stats
+    timer.lap("index")
+
+    # Remember how each dashboard's configuration is read and saved
+    strategies = StrategyRegistry(hass)
+    await strategies.async_load()
+    hass.data[DOMAIN][DATA_STRATEGIES] = strategies
+    timer.lap("strategies")
+
+    # Coalesce concurrent backups and serialize restores per dashboard
+    hass.data[DOMAIN][DATA_COORDINATOR] = JobCoordinator(hass)
+
+    # Run the work of services called in the background
+    jobs = JobQueue(hass, JOB_WORKERS, JOB_HISTORY)
+    jobs.async_start()
+    hass.data[DOMAIN][DATA_JOBS] = jobs
+    entry.async_on_unload(jobs.async_stop)
+
+    # Resolve dashboard storage files from a cached scan of .storage
+    resolver = StoragePathResolver(hass.config.config_dir)
+    hass.data[DOMAIN][DATA_RESOLVER] = resolver
+
+    @callback
+    def _invalidate_resolver(event) -> None:
+        """Rescan .storage after a dashboard changes."""
+        resolver.invalidate()
+
+    entry.async_on_unload(
+        hass.bus.async_listen(EVENT_LOVELACE_UPDATED, _invalidate_resolver)
+    )
+
+    # Back up dashboards automatically after they are edited
+    if hass.data[DOMAIN].get(CONF_AUTO_BACKUP, DEFAULT_AUTO_BACKUP):
+        watcher = DashboardWatcher(
+            hass,
+            index,
+            resolver,
+            hass.data[DOMAIN].get(CONF_AUTO_BACKUP_DELAY, DEFAULT_AUTO_BACKUP_DELAY),
+            partial(async_auto_backup, hass),
+        )
+        watcher.async_start()
+        hass.data[DOMAIN][DATA_WATCHER] = watcher
+        entry.async_on_unload(watcher.async_stop)
+
+    # Back up every dashboard on the built-in schedule
+    schedule_interval = hass.data[DOMAIN].get(
+        CONF_SCHEDULE_INTERVAL, DEFAULT_SCHEDULE_INTERVAL
+    )
+    if schedule_interval:
+        scheduler = BackupScheduler(
+            hass,
+            resolver,
+            timedelta(hours=schedule_interval),
+            timedelta(
+                minutes=hass.data[DOMAIN].get(CONF_SCHEDULE_JITTER, DEFAULT_SCHEDULE_JITTER)
+            ),
+            get_coordinator(hass).in_flight,
+            partial(async_scheduled_backup, hass),
+        )
+        await scheduler.async_start()
+        hass.data[DOMAIN][DATA_SCHEDULER] = scheduler
+        entry.async_on_unload(scheduler.async_stop)
+    timer.lap("background")
+
+    # Apply the retention policy periodically, and once Home Assistant has started
+    @callback
+    def _scheduled_prune(now) -> None:
+        """Prune old backups on the retention interval."""
+        async_schedule_prune(hass)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _scheduled_prune, timedelta(hours=PRUNE_INTERVAL_HOURS)
+        )
+    )
+    if hass.is_running:
+        async_schedule_prune(hass)
+    else:
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _scheduled_prune)
 
     # Register services
     register_services(hass)
 
-    # Copy card files to www directory
-    copy_card_files()
-    
-    # Set up frontend
-    await async_setup_frontend(hass)
+    # Register the websocket commands used by the card
+    async_register_websocket_commands(
+        hass,
+        partial(async_canonical_dashboard_id, hass),
+        partial(async_diff_backups, hass),
+    )
+
+    # Set up frontend, serving the card files and registering the card once started
+    async_setup_frontend(hass, timer)
+    timer.lap("services")
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    timer.lap("platforms")
+
+    hass.data[DOMAIN][DATA_SETUP_TIMER] = timer
+    _LOGGER.info(
+        "Set up in %.3f s (%s)",
+        timer.total,
+        ", ".join(f"{phase} {duration:.3f} s" for phase, duration in timer.phases.items()),
+    )
 
     return True
 
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the integration when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+
     # Remove the config entry data
     hass.data[DOMAIN].pop(entry.entry_id)
 
-    # If there are no more config entries, remove the component data
-    if not hass.data[DOMAIN]:
-        hass.data.pop(DOMAIN)
+    # If there are no more loaded config entries, remove the component data
+    if not any(
+        other.entry_id in hass.data[DOMAIN]
+        for other in hass.config_entries.async_entries(DOMAIN)
+    ):
+        _async_unload_integration(hass)
 
     return True
 
 
+@callback
+def _async_unload_integration(hass: HomeAssistant) -> None:
+    """Stop the background work, remove the services and drop the component data.
+
+    The next setup starts from a fresh index, coordinator and job queue.
+    """
+    data = hass.data.pop(DOMAIN)
+    for key in (DATA_PRUNE_TASK, DATA_VERIFY_TASK):
+        task = data.get(key)
+        if task is not None and not task.done():
+            task.cancel()
+    # These are stopped by the entry too, stopping them again does nothing
+    for key in (DATA_JOBS, DATA_WATCHER, DATA_SCHEDULER):
+        if key in data:
+            data[key].async_stop()
+    for service in SERVICES:
+        # Response services are not registered on older Home Assistant versions
+        if hass.services.has_service(DOMAIN, service):
+            hass.services.async_remove(DOMAIN, service)
+
+
+def get_backup_path(hass: HomeAssistant) -> str:
+    """Return the full path of the backup directory."""
+    backup_path = hass.data[DOMAIN].get(CONF_BACKUP_PATH, DEFAULT_BACKUP_PATH)
+    return os.path.join(hass.config.config_dir, backup_path)
+
+
+def get_pre_restore_path(hass: HomeAssistant) -> str:
+    """Return the directory holding copies of files replaced by restores."""
+    return os.path.join(get_backup_path(hass), PRE_RESTORE_DIR)
+
+
+def get_index(hass: HomeAssistant) -> BackupIndex:
+    """Return the backup index."""
+    return hass.data[DOMAIN][DATA_INDEX]
+
+
+def get_resolver(hass: HomeAssistant) -> StoragePathResolver:
+    """Return the dashboard storage file resolver."""
+    return hass.data[DOMAIN][DATA_RESOLVER]
+
+
+def get_stats(hass: HomeAssistant) -> BackupStats:
+    """Return the backup metrics."""
+    return hass.data[DOMAIN][DATA_STATS]
+
+
+def get_strategies(hass: HomeAssistant) -> StrategyRegistry:
+    """Return the registry of dashboard read and save strategies."""
+    return hass.data[DOMAIN][DATA_STRATEGIES]
+
+
+def get_jobs(hass: HomeAssistant) -> JobQueue:
+    """Return the queue of background jobs."""
+    return hass.data[DOMAIN][DATA_JOBS]
+
+
+def get_coordinator(hass: HomeAssistant) -> JobCoordinator:
+    """Return the coordinator of concurrent backups and restores."""
+    return hass.data[DOMAIN][DATA_COORDINATOR]
+
+
+def canonical_dashboard_id(hass: HomeAssistant, dashboard_id: str) -> str:
+    """Return the storage id of a dashboard given by id or alias.
+
+    Backups, index entries and locks are keyed by the storage id, so
+    ``kitchen`` and ``dashboard_kitchen`` share them. A dashboard without a
+    storage file keeps its backups' id, or the id it was given. This checks
+    the filesystem and must be run in the executor.
+    """
+    resolved = get_resolver(hass).dashboard_id(dashboard_id)
+    if resolved is not None:
+        return resolved
+    # A deleted dashboard is only known by its backups
+    index = get_index(hass)
+    prefixed = f"dashboard_{dashboard_id}"
+    if index.latest(dashboard_id) is None and index.latest(prefixed) is not None:
+        return prefixed
+    return dashboard_id
+
+
+async def async_canonical_dashboard_id(hass: HomeAssistant, dashboard_id: str) -> str:
+    """Return the storage id of a dashboard given by id or alias."""
+    return await async_run(hass, canonical_dashboard_id, hass, dashboard_id)
+
+
+@callback
+def validate_backup_file(hass: HomeAssistant, dashboard_id: str, backup_file: str) -> dict:
+    """Return the index entry of one of a dashboard's backup files.
+
+    Only bare file names the index knows for the dashboard are accepted, so a
+    caller cannot reach files outside the backup directory.
+    """
+    if not is_bare_filename(backup_file):
+        raise ServiceValidationError(f"{ERROR_INVALID_BACKUP_FILE}: {backup_file}")
+    entry = get_index(hass).find(backup_file)
+    if entry is None or entry["dashboard_id"] != dashboard_id:
+        raise ServiceValidationError(f"{ERROR_BACKUP_NOT_FOUND}: {backup_file}")
+    return entry
+
+
+async def async_create_backup(
+    hass: HomeAssistant,
+    dashboard_id: str,
+    storage_file: str | None = None,
+    timestamp: str | None = None,
+) -> dict:
+    """Back up a dashboard and record it in the backup index.
+
+    A dashboard with a backup already in flight is not backed up again, the
+    caller shares that backup's result. Returns the backup's index entry.
+    """
+
+    async def run() -> dict:
+        try:
+            index_entry = await _async_create_backup(hass, dashboard_id, storage_file, timestamp)
+        except Exception:
+            get_stats(hass).async_record_backup_failure()
+            raise
+        get_stats(hass).async_record_backup(dashboard_id, index_entry)
+        return index_entry
+
+    return await get_coordinator(hass).async_backup(dashboard_id, run)
+
+
+async def _async_create_backup(
+    hass: HomeAssistant,
+    dashboard_id: str,
+    storage_file: str | None,
+    timestamp: str | None,
+) -> dict:
+    """Write a backup of a dashboard and add it to the index.
+
+    Runs while holding the dashboard's lock.
+    """
+    started = time.monotonic()
+
+    # Determine the storage file path
+    if storage_file is None:
+        storage_file = await async_run(hass, find_storage_file, hass, dashboard_id)
+
+    # Create a timestamp for the backup filename, later than the latest backup
+    if timestamp is None:
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    previous = get_index(hass).latest(dashboard_id)
+    timestamp = next_timestamp(timestamp, previous["timestamp"] if previous else None)
+
+    # Get the backup directory
+    full_backup_path = get_backup_path(hass)
+
+    # Read the storage file once and write every format of the backup mode
+    backup_mode = hass.data[DOMAIN].get(CONF_BACKUP_MODE, DEFAULT_BACKUP_MODE)
+    compression = hass.data[DOMAIN].get(CONF_COMPRESSION, DEFAULT_COMPRESSION)
+    compression_level = hass.data[DOMAIN].get(
+        CONF_COMPRESSION_LEVEL, DEFAULT_COMPRESSION_LEVEL
+    )
+    base_name = f"dashboard_{dashboard_id}_{timestamp}"
+    if backup_mode == BACKUP_MODE_INCREMENTAL:
+        index_entry = await async_run(
+            hass,
+            create_incremental_backup_files,
+            storage_file,
+            full_backup_path,
+            base_name,
+            previous["file"] if previous else None,
+            hass.data[DOMAIN].get(
+                CONF_FULL_BACKUP_INTERVAL, DEFAULT_FULL_BACKUP_INTERVAL
+            ),
+            compression,
+            compression_level,
+        )
+    else:
+        index_entry = await async_run(
+            hass,
+            create_backup_files,
+            storage_file,
+            full_backup_path,
+            base_name,
+            MODE_FORMATS[backup_mode],
+            compression,
+            compression_level,
+        )
+    index_entry["timestamp"] = timestamp
+    index_entry["duration"] = round(time.monotonic() - started, 3)
+    await async_run(hass, get_index(hass).add, dashboard_id, index_entry)
+
+    _LOGGER.info("Created backup of dashboard %s: %s",
+                 dashboard_id, ", ".join(index_entry["files"]))
+
+    return index_entry
+
+
+async def async_restore_backup(
+    hass: HomeAssistant,
+    dashboard_id: str,
+    backup_file: str | None = None,
+    view: str | None = None,
+    card: str | None = None,
+) -> str:
+    """Restore a dashboard, or one view or card of it, from a backup.
+
+    Waits for backups of the dashboard that are running, and holds its lock
+    so backups and other restores wait in turn. Without a backup file the
+    latest backup is restored. Returns the backup file that was restored.
+    """
+    async with get_coordinator(hass).lock(dashboard_id):
+        return await _async_restore_backup(hass, dashboard_id, backup_file, view, card)
+
+
+async def _async_restore_backup(
+    hass: HomeAssistant,
+    dashboard_id: str,
+    backup_file: str | None,
+    view: str | None,
+    card: str | None,
+) -> str:
+    """Restore a backup while holding the dashboard's lock."""
+    # Get the backup directory
+    full_backup_path = get_backup_path(hass)
+
+    # If no backup file is specified, use the most recent one
+    if not backup_file:
+        latest = await async_run(hass, get_index(hass).find_latest, dashboard_id)
+        if not latest:
+            raise HomeAssistantError(ERROR_BACKUP_NOT_FOUND)
+        backup_file = latest["file"]
+    else:
+        validate_backup_file(hass, dashboard_id, backup_file)
+
+    # Get the full path to the backup file
+    backup_file_path = os.path.join(full_backup_path, backup_file)
+
+    if not await async_path_exists(hass, backup_file_path):
+        raise HomeAssistantError(ERROR_BACKUP_NOT_FOUND)
+
+    # Backup files are checked against these while they are read
+    checksums = get_index(hass).chain_checksums([backup_file])
+
+    # Determine the storage file path
+    storage_file = await async_run(hass, get_storage_file_path, hass, dashboard_id)
+
+    # Copy a single view or card into the current configuration
+    if view is not None:
+        if not await async_path_exists(hass, storage_file):
+            raise HomeAssistantError(ERROR_DASHBOARD_NOT_FOUND)
+
+        merged = await async_run(
+            hass,
+            merge_backup_subtree,
+            full_backup_path,
+            backup_file,
+            storage_file,
+            view,
+            card,
+            checksums,
+        )
+        subtree = f"view '{view}'" + (f" card '{card}'" if card is not None else "")
+        if merged is None:
+            _LOGGER.info(
+                "The %s of dashboard %s already matches backup %s",
+                subtree, dashboard_id, backup_file,
+            )
+        else:
+            await restore_dashboard_config(hass, dashboard_id, merged)
+            _LOGGER.info(
+                "Restored the %s of dashboard %s from backup: %s",
+                subtree, dashboard_id, backup_file,
+            )
+
+    # If it's a JSON, manifest or delta backup, write its content directly to the storage file
+    elif is_json_backup(backup_file):
+        _LOGGER.info("Restoring JSON backup directly to storage file")
+
+        # Keep a rotated copy of the original file if it exists
+        await async_preserve_file(
+            hass, storage_file, get_pre_restore_path(hass), PRE_RESTORE_KEEP
+        )
+
+        # Atomically replace the storage file, decompressing and
+        # verifying the backup as it streams
+        await async_run(
+            hass,
+            restore_storage_file,
+            full_backup_path,
+            backup_file,
+            storage_file,
+            checksums,
+        )
+
+        # Try to reload the UI
+        try:
+            _LOGGER.debug("Reloading UI")
+            await hass.services.async_call("lovelace", "reload")
+        except Exception as ex:
+            _LOGGER.debug("Could not reload UI: %s", str(ex))
+
+        _LOGGER.info("Restored dashboard %s from backup: %s", dashboard_id, backup_file)
+    else:
+        # For YAML backups, use the normal restore process
+        _LOGGER.info("Restoring YAML backup through configuration API")
+
+        # Load and verify the dashboard configuration from the backup file
+        try:
+            dashboard_config = await async_run(
+                hass, load_backup_config, full_backup_path, backup_file, checksums
+            )
+        except yaml.YAMLError:
+            raise HomeAssistantError(ERROR_INVALID_YAML)
+
+        # Restore the dashboard configuration
+        await restore_dashboard_config(hass, dashboard_id, dashboard_config)
+
+        _LOGGER.info("Restored dashboard %s from backup: %s", dashboard_id, backup_file)
+
+    return backup_file
+
+
+async def async_diff_backups(
+    hass: HomeAssistant,
+    dashboard_id: str,
+    from_backup: str | None,
+    to_backup: str | None,
+) -> dict:
+    """Compare two backups, or a backup and the live dashboard.
+
+    A side without a backup file is the dashboard's storage file.
+    """
+    dashboard_id = await async_canonical_dashboard_id(hass, dashboard_id)
+    full_backup_path = get_backup_path(hass)
+
+    for backup_file in (from_backup, to_backup):
+        if backup_file is None:
+            continue
+        validate_backup_file(hass, dashboard_id, backup_file)
+        if not await async_path_exists(hass, os.path.join(full_backup_path, backup_file)):
+            raise HomeAssistantError(f"{ERROR_BACKUP_NOT_FOUND}: {backup_file}")
+
+    storage_file = None
+    if from_backup is None or to_backup is None:
+        storage_file = await async_run(hass, find_storage_file, hass, dashboard_id)
+
+    try:
+        changes = await async_run(
+            hass,
+            compare_backups,
+            full_backup_path,
+            from_backup,
+            to_backup,
+            storage_file,
+            get_index(hass).chain_checksums([from_backup, to_backup]),
+        )
+    except (OSError, ValueError, yaml.YAMLError) as ex:
+        raise HomeAssistantError(f"Could not compare backups: {ex}") from ex
+
+    return {
+        ATTR_DASHBOARD_ID: dashboard_id,
+        ATTR_FROM_BACKUP: from_backup,
+        ATTR_TO_BACKUP: to_backup,
+        **changes,
+    }
+
+
+async def async_auto_backup(
+    hass: HomeAssistant, dashboard_id: str, storage_file: str
+) -> dict | None:
+    """Back up a dashboard that changed, without a notification.
+
+    Returns the index entry, or None if the backup failed.
+    """
+    try:
+        index_entry = await async_create_backup(hass, dashboard_id, storage_file)
+    except Exception as ex:  # pylint: disable=broad-except
+        _LOGGER.error("Failed to back up changed dashboard %s: %s", dashboard_id, str(ex))
+        hass.bus.async_fire(
+            EVENT_BACKUP_FAILED,
+            {
+                ATTR_DASHBOARD_ID: dashboard_id,
+                "error": str(ex),
+            },
+        )
+        return None
+
+    hass.bus.async_fire(
+        EVENT_BACKUP_CREATED,
+        {
+            ATTR_DASHBOARD_ID: dashboard_id,
+            ATTR_BACKUP_FILE: index_entry["file"],
+            ATTR_TIMESTAMP: index_entry["timestamp"],
+            **backup_metrics(index_entry),
+        },
+    )
+    async_schedule_prune(hass)
+    return index_entry
+
+
+async def async_create_all_backups(
+    hass: HomeAssistant,
+    max_workers: int,
+    dashboard_ids: list[str] | None = None,
+    progress: Callable[[float], None] | None = None,
+) -> dict:
+    """Back up every UI dashboard, or only some, with bounded concurrency.
+
+    Writes one batch manifest listing the result for each dashboard and
+    returns it. ``progress`` is called with the fraction of dashboards done.
+    """
+    storage_files = await async_run(hass, get_resolver(hass).dashboards)
+    if dashboard_ids is not None:
+        storage_files = {
+            dashboard_id: path
+            for dashboard_id, path in storage_files.items()
+            if dashboard_id in dashboard_ids
+        }
+    # Batches started within the same second still get their own file
+    coordinator = get_coordinator(hass)
+    timestamp = next_timestamp(
+        datetime.now().strftime(TIMESTAMP_FORMAT), coordinator.last_batch
+    )
+    coordinator.last_batch = timestamp
+    semaphore = asyncio.Semaphore(max_workers)
+    started = time.monotonic()
+    done = 0
+
+    def finished_one() -> None:
+        nonlocal done
+        done += 1
+        if progress is not None:
+            progress(done / len(storage_files))
+
+    async def backup_one(dashboard_id: str, storage_file: str) -> dict:
+        async with semaphore:
+            try:
+                index_entry = await async_create_backup(
+                    hass, dashboard_id, storage_file, timestamp
+                )
+                return {
+                    ATTR_DASHBOARD_ID: dashboard_id,
+                    ATTR_BACKUP_FILE: index_entry["file"],
+                    **backup_metrics(index_entry),
+                }
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.error("Failed to back up dashboard %s: %s", dashboard_id, str(ex))
+                return {ATTR_DASHBOARD_ID: dashboard_id, "error": str(ex)}
+            finally:
+                finished_one()
+
+    results = await asyncio.gather(
+        *(backup_one(dashboard_id, path) for dashboard_id, path in sorted(storage_files.items()))
+    )
+
+    batch = {
+        ATTR_TIMESTAMP: timestamp,
+        "duration": round(time.monotonic() - started, 3),
+        "backups": [result for result in results if "error" not in result],
+        "failed": [result for result in results if "error" in result],
+    }
+    batch_file = f"batch_{timestamp}.json"
+    await async_write_json(hass, os.path.join(get_backup_path(hass), batch_file), batch)
+    batch[ATTR_BACKUP_FILE] = batch_file
+    return batch
+
+
+def get_retention_policy(hass: HomeAssistant) -> RetentionPolicy:
+    """Return the configured retention policy."""
+    data = hass.data[DOMAIN]
+    return RetentionPolicy(
+        keep_last=data.get(CONF_RETENTION_KEEP_LAST, DEFAULT_RETENTION_KEEP_LAST),
+        daily=data.get(CONF_RETENTION_DAILY, DEFAULT_RETENTION_DAILY),
+        weekly=data.get(CONF_RETENTION_WEEKLY, DEFAULT_RETENTION_WEEKLY),
+        monthly=data.get(CONF_RETENTION_MONTHLY, DEFAULT_RETENTION_MONTHLY),
+        max_bytes=data.get(CONF_RETENTION_MAX_SIZE, DEFAULT_RETENTION_MAX_SIZE) * 1024 * 1024,
+    )
+
+
+@callback
+def async_schedule_prune(hass: HomeAssistant) -> None:
+    """Prune old backups in the background unless a prune is already running."""
+    policy = get_retention_policy(hass)
+    running = hass.data[DOMAIN].get(DATA_PRUNE_TASK)
+    if not policy.enabled or (running and not running.done()):
+        return
+
+    async def prune() -> None:
+        try:
+            if await async_prune_backups(hass, get_index(hass), policy):
+                get_stats(hass).async_updated()
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Failed to prune old backups: %s", str(ex))
+
+    # Background tasks were added in Home Assistant 2023.4 and do not delay startup
+    if hasattr(hass, "async_create_background_task"):
+        task = hass.async_create_background_task(prune(), f"{DOMAIN}_prune")
+    else:
+        task = hass.async_create_task(prune())
+    hass.data[DOMAIN][DATA_PRUNE_TASK] = task
+
+
+async def async_scheduled_backup(hass: HomeAssistant, dashboard_ids: list[str]) -> dict:
+    """Back up the dashboards due on the built-in schedule in one batch."""
+    batch = await async_create_all_backups(hass, DEFAULT_MAX_WORKERS, dashboard_ids)
+    hass.bus.async_fire(EVENT_BATCH_BACKUP_COMPLETED, _batch_event_data(batch))
+    async_schedule_prune(hass)
+    return batch
+
+
+def _batch_event_data(batch: dict) -> dict:
+    """Return the summary event payload of a batch backup."""
+    return {
+        ATTR_BACKUP_FILE: batch[ATTR_BACKUP_FILE],
+        ATTR_TIMESTAMP: batch[ATTR_TIMESTAMP],
+        "duration": batch["duration"],
+        "bytes_read": sum(result["bytes_read"] or 0 for result in batch["backups"]),
+        "bytes_written": sum(result["bytes_written"] or 0 for result in batch["backups"]),
+        "dashboards": [result[ATTR_DASHBOARD_ID] for result in batch["backups"]],
+        "failed": [result[ATTR_DASHBOARD_ID] for result in batch["failed"]],
+    }
+
+
+async def async_notify(hass: HomeAssistant, message: str, title: str) -> None:
+    """Show a persistent notification."""
+    try:
+        hass.components.persistent_notification.async_create(message, title=title)
+    except AttributeError:
+        # Fall back to using the service directly
+        await hass.services.async_call(
+            "persistent_notification",
+            "create",
+            {"message": message, "title": title},
+        )
+
+
 def register_services(hass: HomeAssistant) -> None:
     """Register component services."""
 
-    @callback
-    async def create_backup(call: ServiceCall) -> None:
-        """Create a backup of the specified dashboard."""
-        dashboard_id = call.data.get(ATTR_DASHBOARD_ID, "lovelace")
-        
+    async def run_backup(dashboard_id: str, notify: bool = True) -> dict:
+        """Back up a dashboard, announcing the result.
+
+        Without ``notify`` only failures show a notification.
+        """
         try:
-            # Determine the storage file path
-            storage_file = get_storage_file_path(hass, dashboard_id)
-            
-            # If the storage file doesn't exist, try to find it
-            if not os.path.exists(storage_file):
-                # Try to find the storage file with different formats
-                _LOGGER.warning("Storage file not found at %s, trying to find it with different formats", storage_file)
-                
-                # List all files in the .storage directory
-                storage_dir = os.path.join(hass.config.config_dir, ".storage")
-                if os.path.exists(storage_dir):
-                    storage_files = os.listdir(storage_dir)
-                    lovelace_files = [f for f in storage_files if f.startswith("lovelace")]
-                    
-                    _LOGGER.info("Found lovelace files: %s", lovelace_files)
-                    
-                    # Try to find a file that matches the dashboard ID
-                    for file in lovelace_files:
-                        if dashboard_id == "lovelace" and file == "lovelace":
-                            storage_file = os.path.join(storage_dir, file)
-                            _LOGGER.info("Found main dashboard storage file: %s", storage_file)
-                            break
-                        elif dashboard_id in file:
-                            storage_file = os.path.join(storage_dir, file)
-                            _LOGGER.info("Found matching dashboard storage file: %s", storage_file)
-                            break
-                    
-                    # If we still haven't found a file and this is the main dashboard, try lovelace
-                    if not os.path.exists(storage_file) and dashboard_id == "lovelace":
-                        for file in lovelace_files:
-                            if file == "lovelace":
-                                storage_file = os.path.join(storage_dir, file)
-                                _LOGGER.info("Using main lovelace file: %s", storage_file)
-                                break
-                
-                # If we still haven't found a file, raise an error
-                if not os.path.exists(storage_file):
-                    available_files = "\n".join(lovelace_files) if 'lovelace_files' in locals() else "None"
-                    raise HomeAssistantError(
-                        f"Storage file not found for dashboard '{dashboard_id}'. "
-                        f"Available lovelace files:\n{available_files}"
-                    )
-            
-            # Create a timestamp for the backup filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Get the backup directory
-            backup_path = hass.data[DOMAIN].get(CONF_BACKUP_PATH, DEFAULT_BACKUP_PATH)
-            full_backup_path = os.path.join(hass.config.config_dir, backup_path)
-            
-            # Create the backup filename (JSON format)
-            json_filename = f"dashboard_{dashboard_id}_{timestamp}.json"
-            json_backup_file = os.path.join(full_backup_path, json_filename)
-            
-            # Copy the storage file directly
-            with open(storage_file, "r") as src, open(json_backup_file, "w") as dst:
-                dst.write(src.read())
-            
-            # Also create a YAML version for human readability
-            yaml_filename = f"dashboard_{dashboard_id}_{timestamp}.yaml"
-            yaml_backup_file = os.path.join(full_backup_path, yaml_filename)
-            
-            # Read the JSON file
-            with open(storage_file, "r") as f:
-                storage_data = json.load(f)
-            
-            # Extract the dashboard configuration
-            dashboard_config = storage_data.get("data", {})
-            
-            # Save the dashboard configuration to the YAML file
-            with open(yaml_backup_file, "w") as f:
-                yaml.dump(dashboard_config, f, default_flow_style=False)
-            
-            _LOGGER.info("Created backup of dashboard %s: %s and %s", 
-                        dashboard_id, json_backup_file, yaml_backup_file)
+            index_entry = await async_create_backup(hass, dashboard_id)
+            result = {
+                ATTR_DASHBOARD_ID: dashboard_id,
+                ATTR_BACKUP_FILE: index_entry["file"],
+                ATTR_TIMESTAMP: index_entry["timestamp"],
+                **backup_metrics(index_entry),
+            }
             
             # Fire an event to notify of successful backup
-            hass.bus.async_fire(
-                EVENT_BACKUP_CREATED,
-                {
-                    ATTR_DASHBOARD_ID: dashboard_id,
-                    ATTR_BACKUP_FILE: json_filename,
-                    ATTR_TIMESTAMP: timestamp,
-                },
-            )
+            hass.bus.async_fire(EVENT_BACKUP_CREATED, result)
+
+            async_schedule_prune(hass)
             
             # Show a notification
-            try:
-                hass.components.persistent_notification.async_create(
+            if notify:
+                await async_notify(
+                    hass,
                     f"Successfully created backup of dashboard '{dashboard_id}'.",
-                    title="Dashboard Backup",
-                )
-            except AttributeError:
-                # Fall back to using the service directly
-                await hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "message": f"Successfully created backup of dashboard '{dashboard_id}'.",
-                        "title": "Dashboard Backup"
-                    }
+                    "Dashboard Backup",
                 )
+
+            return result
             
         except Exception as ex:
             _LOGGER.error("Failed to create backup: %s", str(ex))
@@ -262,117 +1033,62 @@ def register_services(hass: HomeAssistant) -> None:
             raise HomeAssistantError(f"{ERROR_BACKUP_FAILED}: {str(ex)}")
 
     @callback
-    async def restore_backup(call: ServiceCall) -> None:
-        """Restore a dashboard from a backup."""
-        dashboard_id = call.data.get(ATTR_DASHBOARD_ID, "lovelace")
-        backup_file = call.data.get(ATTR_BACKUP_FILE)
+    async def create_backup(call: ServiceCall) -> dict:
+        """Create a backup of the specified dashboard."""
+        dashboard_id = await async_canonical_dashboard_id(
+            hass, call.data.get(ATTR_DASHBOARD_ID, "lovelace")
+        )
+        if call.data[ATTR_BACKGROUND]:
+            job = get_jobs(hass).async_submit(
+                JOB_BACKUP, dashboard_id, lambda report: run_backup(dashboard_id, notify=False)
+            )
+            return {ATTR_JOB_ID: job.job_id}
+        return await run_backup(dashboard_id)
+
+    async def run_restore(
+        dashboard_id: str,
+        backup_file: str | None,
+        view: str | None,
+        card: str | None,
+        notify: bool = True,
+    ) -> dict:
+        """Restore a dashboard from a backup, announcing the result.
+
+        Without ``notify`` only failures show a notification.
+        """
+        started = time.monotonic()
         
         try:
-            # Get the backup directory
-            backup_path = hass.data[DOMAIN].get(CONF_BACKUP_PATH, DEFAULT_BACKUP_PATH)
-            full_backup_path = os.path.join(hass.config.config_dir, backup_path)
-            
-            # If no backup file is specified, use the most recent one
-            if not backup_file:
-                # Look for JSON backups first
-                json_backup_files = [
-                    f for f in os.listdir(full_backup_path)
-                    if f.startswith(f"dashboard_{dashboard_id}_") and f.endswith(".json")
-                ]
-                
-                if json_backup_files:
-                    # Sort by timestamp (newest first)
-                    json_backup_files.sort(reverse=True)
-                    backup_file = json_backup_files[0]
-                else:
-                    # Fall back to YAML backups
-                    yaml_backup_files = [
-                        f for f in os.listdir(full_backup_path)
-                        if f.startswith(f"dashboard_{dashboard_id}_") and f.endswith(".yaml")
-                    ]
-                    
-                    if not yaml_backup_files:
-                        raise HomeAssistantError(ERROR_BACKUP_NOT_FOUND)
-                    
-                    # Sort by timestamp (newest first)
-                    yaml_backup_files.sort(reverse=True)
-                    backup_file = yaml_backup_files[0]
-            
-            # Get the full path to the backup file
-            backup_file_path = os.path.join(full_backup_path, backup_file)
-            
-            if not os.path.exists(backup_file_path):
-                raise HomeAssistantError(ERROR_BACKUP_NOT_FOUND)
-            
-            # Determine the storage file path
-            storage_file = get_storage_file_path(hass, dashboard_id)
-            
-            # If it's a JSON backup and ends with .json, directly copy it to the storage file
-            if backup_file.endswith(".json"):
-                _LOGGER.info("Restoring JSON backup directly to storage file")
-                
-                # Make a backup of the original file if it exists
-                if os.path.exists(storage_file):
-                    backup_storage = f"{storage_file}.bak"
-                    with open(storage_file, "r") as src, open(backup_storage, "w") as dst:
-                        dst.write(src.read())
-                
-                # Copy the backup file to the storage file
-                with open(backup_file_path, "r") as src, open(storage_file, "w") as dst:
-                    dst.write(src.read())
-                
-                # Try to reload the UI
-                try:
-                    _LOGGER.debug("Reloading UI")
-                    await hass.services.async_call("lovelace", "reload")
-                except Exception as ex:
-                    _LOGGER.debug("Could not reload UI: %s", str(ex))
-                
-                _LOGGER.info("Restored dashboard %s from backup: %s", dashboard_id, backup_file)
-            else:
-                # For YAML backups, use the normal restore process
-                _LOGGER.info("Restoring YAML backup through configuration API")
-                
-                # Load the dashboard configuration from the backup file
-                with open(backup_file_path, "r") as f:
-                    try:
-                        dashboard_config = yaml.safe_load(f)
-                    except yaml.YAMLError:
-                        raise HomeAssistantError(ERROR_INVALID_YAML)
-                
-                # Restore the dashboard configuration
-                await restore_dashboard_config(hass, dashboard_id, dashboard_config)
-                
-                _LOGGER.info("Restored dashboard %s from backup: %s", dashboard_id, backup_file)
+            backup_file = await async_restore_backup(
+                hass, dashboard_id, backup_file, view, card
+            )
             
+            duration = round(time.monotonic() - started, 3)
+            get_stats(hass).async_record_restore(dashboard_id, backup_file, duration)
+            result = {
+                ATTR_DASHBOARD_ID: dashboard_id,
+                ATTR_BACKUP_FILE: backup_file,
+                ATTR_VIEW: view,
+                ATTR_CARD: card,
+                "duration": duration,
+            }
+
             # Fire an event to notify of successful restore
-            hass.bus.async_fire(
-                EVENT_BACKUP_RESTORED,
-                {
-                    ATTR_DASHBOARD_ID: dashboard_id,
-                    ATTR_BACKUP_FILE: backup_file,
-                },
-            )
+            hass.bus.async_fire(EVENT_BACKUP_RESTORED, result)
             
             # Show a notification
-            try:
-                hass.components.persistent_notification.async_create(
+            if notify:
+                await async_notify(
+                    hass,
                     f"Successfully restored dashboard '{dashboard_id}' from backup.",
-                    title="Dashboard Backup",
-                )
-            except AttributeError:
-                # Fall back to using the service directly
-                await hass.services.async_call(
-                    "persistent_notification",
-                    "create",
-                    {
-                        "message": f"Successfully restored dashboard '{dashboard_id}' from backup.",
-                        "title": "Dashboard Backup"
-                    }
+                    "Dashboard Backup",
                 )
+
+            return result
             
         except Exception as ex:
             _LOGGER.error("Failed to restore backup: %s", str(ex))
+            get_stats(hass).async_record_restore_failure()
             
             # Fire an event to notify of failed restore
             hass.bus.async_fire(
@@ -380,6 +1096,7 @@ def register_services(hass: HomeAssistant) -> None:
                 {
                     ATTR_DASHBOARD_ID: dashboard_id,
                     "error": str(ex),
+                    "duration": round(time.monotonic() - started, 3),
                 },
             )
             
@@ -402,17 +1119,236 @@ def register_services(hass: HomeAssistant) -> None:
             
             raise HomeAssistantError(f"{ERROR_RESTORE_FAILED}: {str(ex)}")
 
+    @callback
+    async def restore_backup(call: ServiceCall) -> dict:
+        """Restore a dashboard from a backup."""
+        args = (
+            await async_canonical_dashboard_id(
+                hass, call.data.get(ATTR_DASHBOARD_ID, "lovelace")
+            ),
+            call.data.get(ATTR_BACKUP_FILE),
+            call.data.get(ATTR_VIEW),
+            call.data.get(ATTR_CARD),
+        )
+        if args[1]:
+            validate_backup_file(hass, args[0], args[1])
+        if call.data[ATTR_BACKGROUND]:
+            job = get_jobs(hass).async_submit(
+                JOB_RESTORE, args[0], lambda report: run_restore(*args, notify=False)
+            )
+            return {ATTR_JOB_ID: job.job_id}
+        return await run_restore(*args)
+
+    async def run_batch(
+        max_workers: int,
+        progress: Callable[[float], None] | None = None,
+        notify: bool = True,
+    ) -> dict:
+        """Back up every UI dashboard, announcing the result.
+
+        Without ``notify`` only batches with failures show a notification.
+        """
+        batch = await async_create_all_backups(hass, max_workers, progress=progress)
+        succeeded = len(batch["backups"])
+        failed = batch["failed"]
+
+        # Fire a single summary event for the whole batch
+        hass.bus.async_fire(EVENT_BATCH_BACKUP_COMPLETED, _batch_event_data(batch))
+
+        async_schedule_prune(hass)
+
+        message = f"Backed up {succeeded} dashboard(s)."
+        if failed:
+            message += " Failed: " + ", ".join(
+                f"'{result[ATTR_DASHBOARD_ID]}' ({result['error']})" for result in failed
+            )
+        if notify or failed:
+            await async_notify(
+                hass,
+                message,
+                "Dashboard Backup Error" if failed else "Dashboard Backup",
+            )
+
+        return batch
+
+    async def backup_all(call: ServiceCall) -> dict:
+        """Back up every UI dashboard in one batch."""
+        max_workers = call.data[ATTR_MAX_WORKERS]
+        if call.data[ATTR_BACKGROUND]:
+            job = get_jobs(hass).async_submit(
+                JOB_BACKUP_ALL, None, lambda report: run_batch(max_workers, report, notify=False)
+            )
+            return {ATTR_JOB_ID: job.job_id}
+        return await run_batch(max_workers)
+
+    async def get_job(call: ServiceCall) -> dict:
+        """Report the status of a background job, or of every remembered job."""
+        jobs = get_jobs(hass)
+        job_id = call.data.get(ATTR_JOB_ID)
+        if job_id is None:
+            return {"jobs": [job.as_dict() for job in jobs.jobs()]}
+        job = jobs.get(job_id)
+        if job is None:
+            raise HomeAssistantError(f"{ERROR_JOB_NOT_FOUND}: {job_id}")
+        return job.as_dict()
+
+    async def list_backups(call: ServiceCall) -> dict:
+        """List backups from the backup index."""
+        offset = call.data[ATTR_OFFSET]
+        limit = call.data[ATTR_LIMIT]
+        dashboard_id = call.data.get(ATTR_DASHBOARD_ID)
+        if dashboard_id is not None:
+            dashboard_id = await async_canonical_dashboard_id(hass, dashboard_id)
+        total, entries = get_index(hass).query(
+            dashboard_id=dashboard_id,
+            start=_to_timestamp(call.data.get(ATTR_START)),
+            end=_to_timestamp(call.data.get(ATTR_END)),
+            newest_first=call.data[ATTR_ORDER] == ORDER_NEWEST,
+            offset=offset,
+            limit=limit,
+        )
+        return {
+            "backups": [describe_backup(entry) for entry in entries],
+            "total": total,
+            ATTR_OFFSET: offset,
+            ATTR_LIMIT: limit,
+        }
+
+    async def diff_backups(call: ServiceCall) -> dict:
+        """Compare two backups, or a backup and the live dashboard."""
+        return await async_diff_backups(
+            hass,
+            call.data.get(ATTR_DASHBOARD_ID, "lovelace"),
+            call.data.get(ATTR_FROM_BACKUP),
+            call.data.get(ATTR_TO_BACKUP),
+        )
+
+    async def verify_backups(call: ServiceCall) -> None:
+        """Check every backup file against its checksum in the background."""
+        running = hass.data[DOMAIN].get(DATA_VERIFY_TASK)
+        if running and not running.done():
+            raise HomeAssistantError(ERROR_VERIFY_RUNNING)
+        dashboard_id = call.data.get(ATTR_DASHBOARD_ID)
+        if dashboard_id is not None:
+            dashboard_id = await async_canonical_dashboard_id(hass, dashboard_id)
+        max_rate = call.data[ATTR_MAX_RATE] * 1024 * 1024
+
+        async def verify() -> None:
+            try:
+                result = await async_verify_backups(
+                    hass, get_index(hass), max_rate, dashboard_id
+                )
+            except Exception as ex:  # pylint: disable=broad-except
+                _LOGGER.error("Failed to verify backups: %s", str(ex))
+                hass.bus.async_fire(
+                    EVENT_VERIFY_COMPLETED,
+                    {ATTR_DASHBOARD_ID: dashboard_id, "status": "failed", "error": str(ex)},
+                )
+                await async_notify(
+                    hass, f"Failed to verify backups: {ex}", "Dashboard Backup Error"
+                )
+                return
+
+            hass.bus.async_fire(
+                EVENT_VERIFY_COMPLETED,
+                {ATTR_DASHBOARD_ID: dashboard_id, "status": "completed", **result},
+            )
+            corrupt = result["corrupt"]
+            message = f"Verified {result['checked']} backup file(s)."
+            if corrupt:
+                message += " Corrupt: " + ", ".join(
+                    f"'{item['file']}' ({item['error']})" for item in corrupt
+                )
+            await async_notify(
+                hass,
+                message,
+                "Dashboard Backup Error" if corrupt else "Dashboard Backup",
+            )
+
+        # Background tasks were added in Home Assistant 2023.4 and do not delay startup
+        if hasattr(hass, "async_create_background_task"):
+            task = hass.async_create_background_task(verify(), f"{DOMAIN}_verify")
+        else:
+            task = hass.async_create_task(verify())
+        hass.data[DOMAIN][DATA_VERIFY_TASK] = task
+
     # Register the services
     hass.services.async_register(
-        DOMAIN, SERVICE_CREATE_BACKUP, create_backup, schema=BACKUP_SCHEMA
+        DOMAIN,
+        SERVICE_CREATE_BACKUP,
+        create_backup,
+        schema=BACKUP_SCHEMA,
+        **({"supports_response": SupportsResponse.OPTIONAL} if SupportsResponse else {}),
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE_BACKUP,
+        restore_backup,
+        schema=RESTORE_SCHEMA,
+        **({"supports_response": SupportsResponse.OPTIONAL} if SupportsResponse else {}),
     )
     hass.services.async_register(
-        DOMAIN, SERVICE_RESTORE_BACKUP, restore_backup, schema=RESTORE_SCHEMA
+        DOMAIN, SERVICE_VERIFY_BACKUPS, verify_backups, schema=VERIFY_SCHEMA
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKUP_ALL,
+        backup_all,
+        schema=BACKUP_ALL_SCHEMA,
+        **({"supports_response": SupportsResponse.OPTIONAL} if SupportsResponse else {}),
+    )
+    if SupportsResponse is not None:
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_LIST_BACKUPS,
+            list_backups,
+            schema=LIST_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_DIFF_BACKUPS,
+            diff_backups,
+            schema=DIFF_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_GET_JOB,
+            get_job,
+            schema=GET_JOB_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+    else:
+        _LOGGER.debug(
+            "Service responses are not supported by this version of Home Assistant, "
+            "%s.%s, %s.%s and %s.%s are not available",
+            DOMAIN, SERVICE_LIST_BACKUPS, DOMAIN, SERVICE_DIFF_BACKUPS,
+            DOMAIN, SERVICE_GET_JOB,
+        )
+
+
+def _to_timestamp(value: datetime | None) -> str | None:
+    """Convert a datetime to the timestamp format used in backup filenames."""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        # Backup timestamps are in local time
+        value = dt_util.as_local(value)
+    return value.strftime(TIMESTAMP_FORMAT)
 
 
 def get_storage_file_path(hass: HomeAssistant, dashboard_id: str) -> str:
-    """Get the path to the storage file for a dashboard."""
+    """Get the path to the storage file for a dashboard.
+
+    Returns the resolved storage file if the dashboard exists, otherwise the
+    path it would have. This checks the filesystem and must be run in the
+    executor.
+    """
+    storage_path = get_resolver(hass).resolve(dashboard_id)
+    if storage_path:
+        return storage_path
+
     # Handle different dashboard ID formats
     if dashboard_id == "lovelace":
         # Main dashboard
@@ -424,333 +1360,340 @@ def get_storage_file_path(hass: HomeAssistant, dashboard_id: str) -> str:
         # Dashboard without prefix
         storage_file = f".storage/lovelace.dashboard_{dashboard_id}"
     
-    # Get the full path
-    storage_path = os.path.join(hass.config.config_dir, storage_file)
-    
-    # Check if the file exists
-    if os.path.exists(storage_path):
-        return storage_path
-    
-    # If not, try alternative formats
-    alternatives = [
-        f".storage/lovelace.{dashboard_id}",  # Without dashboard_ prefix
-        f".storage/lovelace.dashboard_{dashboard_id}",  # With dashboard_ prefix
-        f".storage/lovelace_{dashboard_id}",  # With underscore
-        f".storage/lovelace-{dashboard_id}",  # With hyphen
-    ]
-    
-    for alt in alternatives:
-        alt_path = os.path.join(hass.config.config_dir, alt)
-        if os.path.exists(alt_path):
-            return alt_path
-    
-    # If no alternatives found, return the original path
-    return storage_path
+    return os.path.join(hass.config.config_dir, storage_file)
+
+
+def find_storage_file(hass: HomeAssistant, dashboard_id: str) -> str:
+    """Find the storage file for an existing dashboard.
+
+    This checks the filesystem and must be run in the executor.
+    """
+    resolver = get_resolver(hass)
+    storage_file = resolver.resolve(dashboard_id)
+    if storage_file is None:
+        available = "\n".join(sorted(resolver.dashboards())) or "None"
+        raise HomeAssistantError(
+            f"Storage file not found for dashboard '{dashboard_id}'. "
+            f"Available dashboards:\n{available}"
+        )
+    return storage_file
+
+
+def _storage_path(hass: HomeAssistant, dashboard_id: str) -> str:
+    """Return the storage file Lovelace would use for a dashboard id."""
+    storage_file = f".storage/lovelace.{dashboard_id}"
+    if dashboard_id == "lovelace":
+        storage_file = ".storage/lovelace"
+    return os.path.join(hass.config.config_dir, storage_file)
+
+
+async def _read_from_lovelace_api(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration directly from the lovelace API."""
+    # This is the most direct method to get the raw configuration
+    if dashboard_id == "lovelace":
+        # For the main dashboard
+        dashboard_instance = await dashboard.get_default_config(hass)
+    else:
+        # For other dashboards
+        dashboard_instance = await dashboard.get_dashboard_for_mode(hass, dashboard_id)
+
+    if dashboard_instance and hasattr(dashboard_instance, "config"):
+        return dashboard_instance.config or None
+    return None
+
+
+async def _read_from_state(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration from the states."""
+    state = hass.states.get(f"lovelace.{dashboard_id}")
+    if state:
+        return state.attributes.get("config") or None
+    return None
+
+
+async def _read_from_lovelace_component(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration from the lovelace component."""
+    if "lovelace" in hass.data and dashboard_id in hass.data["lovelace"]:
+        return hass.data["lovelace"][dashboard_id].config or None
+    return None
+
+
+async def _read_from_lovelace_service(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration from the lovelace service."""
+    # Create a temporary event to get the result
+    event_name = f"dashboard_backup_get_config_{dashboard_id}"
+    result = None
+
+    # Define a callback to handle the result
+    @callback
+    def handle_result(event):
+        nonlocal result
+        result = event.data.get("config")
+
+    # Register a temporary event listener
+    remove_listener = hass.bus.async_listen(event_name, handle_result)
+    try:
+        await hass.services.async_call(
+            "lovelace",
+            "get_config",
+            {"dashboard_id": dashboard_id},
+            blocking=True
+        )
+    finally:
+        remove_listener()
+
+    return result or None
+
+
+async def _read_from_storage_file(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration from the .storage directory."""
+    storage_path = _storage_path(hass, dashboard_id)
+    if await async_path_exists(hass, storage_path):
+        storage_data = await async_read_json(hass, storage_path)
+        if "data" in storage_data:
+            return storage_data.get("data", {})
+    return None
+
+
+async def _read_from_frontend_data(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration from the frontend data."""
+    frontend_data = await async_get_frontend_data(hass)
+    if frontend_data and "dashboards" in frontend_data:
+        return frontend_data["dashboards"].get(dashboard_id)
+    return None
+
+
+async def _read_from_yaml_file(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the dashboard configuration from ui-lovelace.yaml."""
+    config_file = os.path.join(hass.config.config_dir, "ui-lovelace.yaml")
+    if await async_path_exists(hass, config_file):
+        return await async_read_yaml(hass, config_file) or None
+    return None
+
+
+async def _read_from_browser_storage(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the current UI configuration from the browser storage."""
+    browser_storage_file = os.path.join(hass.config.config_dir, ".storage", "browser_mod.browserEntities")
+    if await async_path_exists(hass, browser_storage_file):
+        browser_data = await async_read_json(hass, browser_storage_file)
+        for entity_data in browser_data.get("data", {}).values():
+            if "lovelace" in entity_data and dashboard_id in entity_data["lovelace"]:
+                return entity_data["lovelace"][dashboard_id]
+    return None
+
+
+async def _read_from_raw_editor(hass: HomeAssistant, dashboard_id: str) -> dict | None:
+    """Get the raw configuration saved by the editor."""
+    raw_config_file = os.path.join(hass.config.config_dir, f"ui-lovelace.{dashboard_id}.yaml")
+    if dashboard_id == "lovelace":
+        raw_config_file = os.path.join(hass.config.config_dir, "ui-lovelace.yaml")
+
+    if await async_path_exists(hass, raw_config_file):
+        return await async_read_yaml(hass, raw_config_file) or None
+    return None
+
+
+# Ways to read a dashboard configuration, in the order they are probed
+READ_STRATEGIES = [
+    ("lovelace_api", _read_from_lovelace_api),
+    ("state", _read_from_state),
+    ("lovelace_component", _read_from_lovelace_component),
+    ("lovelace_service", _read_from_lovelace_service),
+    ("storage_file", _read_from_storage_file),
+    ("frontend_data", _read_from_frontend_data),
+    ("yaml_file", _read_from_yaml_file),
+    ("browser_storage", _read_from_browser_storage),
+    ("raw_editor", _read_from_raw_editor),
+]
 
 
 async def get_dashboard_config(hass: HomeAssistant, dashboard_id: str) -> dict:
     """Get the configuration for a dashboard."""
     try:
-        # Method 1: Try to get the dashboard configuration directly from the lovelace API
-        try:
-            _LOGGER.debug("Trying to get config directly from lovelace API")
-            # This is the most direct method to get the raw configuration
-            from homeassistant.components.lovelace import dashboard
-            
-            # Get the dashboard instance
-            if dashboard_id == "lovelace":
-                # For the main dashboard
-                dashboard_instance = await dashboard.get_default_config(hass)
-            else:
-                # For other dashboards
-                dashboard_instance = await dashboard.get_dashboard_for_mode(hass, dashboard_id)
-            
-            if dashboard_instance and hasattr(dashboard_instance, "config"):
-                config = dashboard_instance.config
-                if config:
-                    _LOGGER.info("Got dashboard config directly from lovelace API: %s", config)
-                    return config
-        except Exception as ex:
-            _LOGGER.debug("Could not get config directly from lovelace API: %s", str(ex))
-        
-        # Method 2: Try to get the dashboard configuration directly from the states
-        try:
-            # This is another reliable method to get the current UI state
-            state = hass.states.get(f"lovelace.{dashboard_id}")
-            if state and state.attributes.get("config"):
-                config = state.attributes.get("config")
-                _LOGGER.info("Got dashboard config from state: %s", config)
-                return config
-        except Exception as ex:
-            _LOGGER.debug("Could not get config from state: %s", str(ex))
-        
-        # Method 3: Try to get it from the lovelace component
-        try:
-            if "lovelace" in hass.data and dashboard_id in hass.data["lovelace"]:
-                lovelace_config = hass.data["lovelace"][dashboard_id].config
-                if lovelace_config:
-                    _LOGGER.info("Got dashboard config from lovelace component: %s", lovelace_config)
-                    return lovelace_config
-        except Exception as ex:
-            _LOGGER.debug("Could not get config from lovelace component: %s", str(ex))
-        
-        # Method 4: Try to get it directly from the lovelace service
-        try:
-            # Try to call the lovelace.get_config service
-            from homeassistant.components.websocket_api import async_register_command
-            
-            # Create a temporary event to get the result
-            event_name = f"dashboard_backup_get_config_{dashboard_id}"
-            result = None
-            
-            # Define a callback to handle the result
-            @callback
-            def handle_result(event):
-                nonlocal result
-                result = event.data.get("config")
-            
-            # Register a temporary event listener
-            remove_listener = hass.bus.async_listen(event_name, handle_result)
-            
-            # Call the service
-            await hass.services.async_call(
-                "lovelace",
-                "get_config",
-                {"dashboard_id": dashboard_id},
-                blocking=True
-            )
-            
-            # Remove the listener
-            remove_listener()
-            
-            # Check if we got a result
-            if result:
-                _LOGGER.info("Got dashboard config from lovelace service: %s", result)
-                return result
-        except Exception as ex:
-            _LOGGER.debug("Could not get config from lovelace service: %s", str(ex))
-        
-        # Method 5: Try to get it from the .storage directory
-        try:
-            storage_file = f".storage/lovelace.{dashboard_id}"
-            if dashboard_id == "lovelace":
-                storage_file = ".storage/lovelace"
-            
-            storage_path = os.path.join(hass.config.config_dir, storage_file)
-            
-            if os.path.exists(storage_path):
-                with open(storage_path, "r") as f:
-                    storage_data = json.load(f)
-                    if "data" in storage_data:
-                        _LOGGER.info("Got dashboard config from storage file: %s", storage_data.get("data"))
-                        return storage_data.get("data", {})
-        except Exception as ex:
-            _LOGGER.debug("Could not get config from storage file: %s", str(ex))
-        
-        # Method 6: Try to get it from the frontend data
-        try:
-            frontend_data = await async_get_frontend_data(hass)
-            if frontend_data and "dashboards" in frontend_data:
-                for dash_id, dash_data in frontend_data["dashboards"].items():
-                    if dash_id == dashboard_id:
-                        _LOGGER.info("Got dashboard config from frontend data: %s", dash_data)
-                        return dash_data
-        except Exception as ex:
-            _LOGGER.debug("Could not get frontend data: %s", str(ex))
-            
-        # Method 7: Try to get it from the configuration.yaml file
-        try:
-            config_file = os.path.join(hass.config.config_dir, "ui-lovelace.yaml")
-            if os.path.exists(config_file):
-                with open(config_file, "r") as f:
-                    config_data = yaml.safe_load(f)
-                    if config_data:
-                        _LOGGER.info("Got dashboard config from YAML file: %s", config_data)
-                        return config_data
-        except Exception as ex:
-            _LOGGER.debug("Could not get configuration from YAML file: %s", str(ex))
-        
-        # Method 8: Try to get it from the browser storage
-        try:
-            # Try to get the current UI configuration from the browser storage
-            browser_storage_file = os.path.join(hass.config.config_dir, ".storage", "browser_mod.browserEntities")
-            if os.path.exists(browser_storage_file):
-                with open(browser_storage_file, "r") as f:
-                    browser_data = json.load(f)
-                    if "data" in browser_data:
-                        for entity_id, entity_data in browser_data["data"].items():
-                            if "lovelace" in entity_data and dashboard_id in entity_data["lovelace"]:
-                                _LOGGER.info("Got dashboard config from browser storage: %s", entity_data["lovelace"][dashboard_id])
-                                return entity_data["lovelace"][dashboard_id]
-        except Exception as ex:
-            _LOGGER.debug("Could not get config from browser storage: %s", str(ex))
-        
-        # Method 9: Try to get it from the raw editor
-        try:
-            # Try to get the raw configuration from the editor
-            raw_config_file = os.path.join(hass.config.config_dir, f"ui-lovelace.{dashboard_id}.yaml")
-            if dashboard_id == "lovelace":
-                raw_config_file = os.path.join(hass.config.config_dir, "ui-lovelace.yaml")
-            
-            if os.path.exists(raw_config_file):
-                with open(raw_config_file, "r") as f:
-                    raw_config = yaml.safe_load(f)
-                    if raw_config:
-                        _LOGGER.info("Got dashboard config from raw editor file: %s", raw_config)
-                        return raw_config
-        except Exception as ex:
-            _LOGGER.debug("Could not get config from raw editor file: %s", str(ex))
-        
-        # Method 10: Create a dummy config if we can't find one
-        try:
-            # Create a dummy config if we can't find one
-            _LOGGER.debug("Creating dummy dashboard config")
-            return {
-                "title": f"Dashboard {dashboard_id}",
-                "views": [
-                    {
-                        "title": "Home",
-                        "path": "home",
-                        "cards": []
-                    }
-                ]
-            }
-        except Exception as ex:
-            _LOGGER.debug("Could not create dummy config: %s", str(ex))
-        
-        # If all else fails, return None
-        _LOGGER.warning("Could not find dashboard configuration for %s", dashboard_id)
-        return None
-    
+        found = await get_strategies(hass).async_run(
+            "read", dashboard_id, READ_STRATEGIES, hass, dashboard_id
+        )
+        if found:
+            name, config = found
+            _LOGGER.debug("Got config of dashboard %s using %s", dashboard_id, name)
+            return config
+
+        # Create a dummy config if we can't find one. This is never
+        # remembered as a strategy, so the real ones are probed every time.
+        _LOGGER.debug("Creating dummy dashboard config")
+        return {
+            "title": f"Dashboard {dashboard_id}",
+            "views": [
+                {
+                    "title": "Home",
+                    "path": "home",
+                    "cards": []
+                }
+            ]
+        }
+
     except Exception as ex:
         _LOGGER.error("Error getting dashboard configuration: %s", str(ex))
         return None
 
 
+def _lovelace_dashboard(hass: HomeAssistant, dashboard_id: str) -> Any | None:
+    """Return the dashboard object Lovelace keeps for a storage dashboard."""
+    lovelace = hass.data.get("lovelace")
+    # LovelaceData since Home Assistant 2024.3, a dict before
+    dashboards = getattr(lovelace, "dashboards", None)
+    if dashboards is None and isinstance(lovelace, dict):
+        dashboards = lovelace.get("dashboards")
+    for url_path, dashboard_instance in (dashboards or {}).items():
+        if url_path is None:
+            dashboard_config = {"id": "lovelace"}
+        else:
+            dashboard_config = getattr(dashboard_instance, "config", None) or {}
+        if dashboard_id in (url_path, dashboard_config.get("id")):
+            return dashboard_instance
+    return None
+
+
+async def _save_to_lovelace_dashboard(
+    hass: HomeAssistant, dashboard_id: str, config: dict
+) -> bool | None:
+    """Save the config through the dashboard object of a storage dashboard.
+
+    Lovelace writes the storage file and tells the clients showing this
+    dashboard to refresh it.
+    """
+    dashboard_instance = _lovelace_dashboard(hass, dashboard_id)
+    if dashboard_instance is None or getattr(dashboard_instance, "mode", None) != "storage":
+        return None
+    await dashboard_instance.async_save(config)
+    return True
+
+
+async def _save_with_lovelace_service(
+    hass: HomeAssistant, dashboard_id: str, config: dict
+) -> bool:
+    """Save the config using the lovelace service."""
+    await hass.services.async_call(
+        "lovelace",
+        "save_config",
+        {
+            "config": config,
+            "dashboard_id": dashboard_id
+        }
+    )
+    return True
+
+
+async def _save_with_lovelace_component(
+    hass: HomeAssistant, dashboard_id: str, config: dict
+) -> bool | None:
+    """Save the config through the lovelace component."""
+    if "lovelace" in hass.data and dashboard_id in hass.data["lovelace"]:
+        await hass.data["lovelace"][dashboard_id].async_save_config(config)
+        return True
+    return None
+
+
+async def _save_to_storage_file(
+    hass: HomeAssistant, dashboard_id: str, config: dict
+) -> bool | None:
+    """Save the config to the dashboard's file in the .storage directory."""
+    storage_path = _storage_path(hass, dashboard_id)
+    if not await async_path_exists(hass, storage_path):
+        return None
+
+    storage_data = await async_read_json(hass, storage_path)
+
+    # Keep a rotated copy of the original file
+    await async_preserve_file(
+        hass, storage_path, get_pre_restore_path(hass), PRE_RESTORE_KEEP
+    )
+
+    # Update the data
+    storage_data["data"] = config
+
+    # Atomically replace the storage file with the updated data
+    await async_write_json_atomic(hass, storage_path, storage_data)
+
+    # Try to reload the lovelace configuration
+    try:
+        await hass.services.async_call("lovelace", "reload_resources")
+    except Exception as ex:
+        _LOGGER.debug("Could not reload lovelace resources: %s", str(ex))
+        # Try alternative reload method
+        try:
+            await hass.services.async_call("frontend", "reload_themes")
+        except Exception:
+            pass
+    return True
+
+
+async def _save_to_yaml_file(
+    hass: HomeAssistant, dashboard_id: str, config: dict
+) -> bool | None:
+    """Save the config of the main dashboard to ui-lovelace.yaml."""
+    if dashboard_id != "lovelace":
+        return None
+
+    config_file = os.path.join(hass.config.config_dir, "ui-lovelace.yaml")
+    # Keep a rotated copy of the original file if it exists
+    await async_preserve_file(
+        hass, config_file, get_pre_restore_path(hass), PRE_RESTORE_KEEP
+    )
+
+    # Atomically replace the file with the updated config
+    await async_write_yaml_atomic(hass, config_file, config)
+    return True
+
+
+async def _save_with_frontend_api(
+    hass: HomeAssistant, dashboard_id: str, config: dict
+) -> bool:
+    """Save the config using the frontend API."""
+    await hass.components.frontend.async_set_user_data(
+        "lovelace",
+        {"config": config},
+        dashboard_id
+    )
+    return True
+
+
+# Ways to save a dashboard configuration, in the order they are probed
+SAVE_STRATEGIES = [
+    ("lovelace_dashboard", _save_to_lovelace_dashboard),
+    ("lovelace_service", _save_with_lovelace_service),
+    ("lovelace_component", _save_with_lovelace_component),
+    ("storage_file", _save_to_storage_file),
+    ("yaml_file", _save_to_yaml_file),
+    ("frontend_api", _save_with_frontend_api),
+]
+
+
 async def restore_dashboard_config(
     hass: HomeAssistant, dashboard_id: str, config: dict
 ) -> None:
     """Restore a dashboard configuration."""
-    success = False
-    
     try:
-        # Method 1: Try to use the lovelace service to save the config
-        try:
-            _LOGGER.debug("Trying to save config using lovelace service")
-            await hass.services.async_call(
-                "lovelace",
-                "save_config",
-                {
-                    "config": config,
-                    "dashboard_id": dashboard_id
-                }
-            )
-            _LOGGER.info("Saved config using lovelace service")
-            success = True
-        except Exception as ex:
-            _LOGGER.debug("Could not save config using lovelace service: %s", str(ex))
-        
-        # Method 2: Try to update the dashboard configuration through the lovelace component
-        if not success:
-            try:
-                _LOGGER.debug("Trying to save config through lovelace component")
-                if "lovelace" in hass.data and dashboard_id in hass.data["lovelace"]:
-                    await hass.data["lovelace"][dashboard_id].async_save_config(config)
-                    _LOGGER.info("Saved config through lovelace component")
-                    success = True
-            except Exception as ex:
-                _LOGGER.debug("Could not save config through lovelace component: %s", str(ex))
-        
-        # Method 3: Try to update it in the .storage directory
-        if not success:
-            try:
-                _LOGGER.debug("Trying to save config to storage file")
-                storage_file = f".storage/lovelace.{dashboard_id}"
-                if dashboard_id == "lovelace":
-                    storage_file = ".storage/lovelace"
-                
-                storage_path = os.path.join(hass.config.config_dir, storage_file)
-                
-                if os.path.exists(storage_path):
-                    with open(storage_path, "r") as f:
-                        storage_data = json.load(f)
-                    
-                    # Make a backup of the original file
-                    backup_path = f"{storage_path}.bak"
-                    with open(backup_path, "w") as f:
-                        json.dump(storage_data, f)
-                    
-                    # Update the data
-                    storage_data["data"] = config
-                    
-                    # Write the updated data
-                    with open(storage_path, "w") as f:
-                        json.dump(storage_data, f)
-                    
-                    _LOGGER.info("Saved config to storage file")
-                    success = True
-                    
-                    # Try to reload the lovelace configuration
-                    try:
-                        await hass.services.async_call("lovelace", "reload_resources")
-                    except Exception as ex:
-                        _LOGGER.debug("Could not reload lovelace resources: %s", str(ex))
-                        # Try alternative reload method
-                        try:
-                            await hass.services.async_call("frontend", "reload_themes")
-                        except Exception:
-                            pass
-            except Exception as ex:
-                _LOGGER.debug("Could not update storage file: %s", str(ex))
-        
-        # Method 4: Try to write to the YAML configuration file
-        if not success:
-            try:
-                _LOGGER.debug("Trying to save config to YAML file")
-                config_file = os.path.join(hass.config.config_dir, "ui-lovelace.yaml")
-                if dashboard_id == "lovelace":
-                    # Make a backup of the original file if it exists
-                    if os.path.exists(config_file):
-                        backup_path = f"{config_file}.bak"
-                        with open(config_file, "r") as src, open(backup_path, "w") as dst:
-                            dst.write(src.read())
-                    
-                    # Write the updated config
-                    with open(config_file, "w") as f:
-                        yaml.dump(config, f, default_flow_style=False)
-                    
-                    _LOGGER.info("Saved config to YAML file")
-                    success = True
-            except Exception as ex:
-                _LOGGER.debug("Could not write to YAML configuration file: %s", str(ex))
-        
-        # Method 5: Try to use the frontend API
-        if not success:
-            try:
-                _LOGGER.debug("Trying to save config using frontend API")
-                # This is a more direct approach that might work in some cases
-                await hass.components.frontend.async_set_user_data(
-                    "lovelace", 
-                    {"config": config},
-                    dashboard_id
-                )
-                _LOGGER.info("Saved config using frontend API")
-                success = True
-            except Exception as ex:
-                _LOGGER.debug("Could not save config using frontend API: %s", str(ex))
-        
+        found = await get_strategies(hass).async_run(
+            "save", dashboard_id, SAVE_STRATEGIES, hass, dashboard_id, config
+        )
+
         # If all methods failed, raise an error
-        if not success:
+        if not found:
             _LOGGER.error("All methods to restore dashboard %s failed", dashboard_id)
             raise HomeAssistantError(f"Could not restore dashboard {dashboard_id}")
-        
+        _LOGGER.info("Saved config of dashboard %s using %s", dashboard_id, found[0])
+
+        # The clients showing the dashboard were already told to refresh it
+        if found[0] == "lovelace_dashboard":
+            return
+
         # Try to reload the UI
         try:
             _LOGGER.debug("Reloading UI")
             await hass.services.async_call("lovelace", "reload")
         except Exception as ex:
             _LOGGER.debug("Could not reload UI: %s", str(ex))
-    
+
     except Exception as ex:
         _LOGGER.error("Error restoring dashboard configuration: %s", str(ex))
         raise
@@ -0,0 +1,238 @@
+"""Structural comparison of dashboard snapshots.
+
+Both sides of a comparison are split into the same tree of hashed subtrees
+the object store uses: one hash per card and one per view with its cards
+left out. Deduplicated backups already are such a tree, so their views and
+cards are only loaded when their hashes differ; other backups and the live
+dashboard are split in memory.
+
+Views are first matched by hash, which settles every unchanged view without
+looking inside it. The remaining views are matched by path (or title, or
+position) and compared card by card in the same way. Changes inside a view
+or card are reported as delta operations (see ``delta``). All functions here
+block and run in the executor.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+import os
+from typing import Any, Callable
+
+from .delta import diff
+from .object_store import (
+    MANIFEST_EXTENSION,
+    get_object,
+    hash_object,
+    read_manifest,
+    split_snapshot,
+)
+from .partial import load_backup_config
+from .pipeline import read_snapshot
+
+
+@dataclass
+class SnapshotTree:
+    """A dashboard split into hashed views and cards."""
+
+    config: Any
+    # Entries of the object store tree: {"view": hash, "cards": [hash, ...]}
+    views: list[dict]
+    load: Callable[[str], Any]
+
+
+def tree_from_storage(storage_data: dict) -> SnapshotTree:
+    """Split a parsed storage file in memory."""
+    objects: dict[str, Any] = {}
+
+    def put(obj: Any) -> str:
+        digest = hash_object(obj)
+        objects[digest] = obj
+        return digest
+
+    tree = split_snapshot(storage_data, put)
+    return SnapshotTree(tree["config"], tree["views"] or [], objects.__getitem__)
+
+
+def load_tree(
+    full_backup_path: str, backup_file: str, checksums: dict[str, dict] | None = None
+) -> SnapshotTree:
+    """Return the tree of a backup, reading blobs lazily for deduplicated ones."""
+    if backup_file.endswith(MANIFEST_EXTENSION):
+        manifest = read_manifest(
+            os.path.join(full_backup_path, backup_file), (checksums or {}).get(backup_file)
+        )
+        tree = get_object(full_backup_path, manifest["tree"])
+        return SnapshotTree(
+            tree["config"],
+            tree["views"] or [],
+            lambda digest: get_object(full_backup_path, digest),
+        )
+    return tree_from_storage(
+        {"data": load_backup_config(full_backup_path, backup_file, checksums)}
+    )
+
+
+def _fingerprint(entry: dict) -> tuple:
+    """Return what identifies a view and all of its cards."""
+    return entry["view"], tuple(entry.get("cards", ()))
+
+
+def _match_hashes(old: list, new: list) -> tuple[list[tuple[int, int]], list[int], list[int]]:
+    """Pair identical items, returning the pairs and the unpaired indexes."""
+    pool = defaultdict(list)
+    for index, item in enumerate(old):
+        pool[item].append(index)
+    pairs = []
+    unmatched_new = []
+    for index, item in enumerate(new):
+        if pool[item]:
+            pairs.append((pool[item].pop(0), index))
+        else:
+            unmatched_new.append(index)
+    paired_old = {old_index for old_index, _ in pairs}
+    unmatched_old = [index for index in range(len(old)) if index not in paired_old]
+    return pairs, unmatched_old, unmatched_new
+
+
+def _moved(pairs: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Return the pairs whose position relative to the other pairs changed."""
+    by_old = sorted(pairs)
+    by_new = sorted(pairs, key=lambda pair: pair[1])
+    return [pair for pair, other in zip(by_new, by_old) if pair != other]
+
+
+def _describe_view(view: Any, index: int) -> dict:
+    """Return what identifies a view to a person."""
+    if not isinstance(view, dict):
+        return {"index": index}
+    return {"index": index, "path": view.get("path"), "title": view.get("title")}
+
+
+def _describe_card(card: Any, index: int) -> dict:
+    """Return what identifies a card to a person."""
+    return {"index": index, "type": card.get("type") if isinstance(card, dict) else None}
+
+
+def _view_key(view: Any, index: int) -> Any:
+    """Return the key views are paired by when their content differs."""
+    if isinstance(view, dict):
+        if view.get("path"):
+            return "path", view["path"]
+        if view.get("title"):
+            return "title", view["title"]
+    return "index", index
+
+
+def _diff_cards(
+    old: SnapshotTree, new: SnapshotTree, old_cards: list, new_cards: list
+) -> list[dict]:
+    """Compare the card hashes of two views."""
+    pairs, unmatched_old, unmatched_new = _match_hashes(old_cards, new_cards)
+    changes = [
+        {
+            "change": "moved",
+            "from_index": old_index,
+            **_describe_card(new.load(new_cards[new_index]), new_index),
+        }
+        for old_index, new_index in _moved(pairs)
+    ]
+
+    # Cards that differ are paired in order, the rest were added or removed
+    for old_index, new_index in zip(unmatched_old, unmatched_new):
+        old_card = old.load(old_cards[old_index])
+        new_card = new.load(new_cards[new_index])
+        changes.append(
+            {
+                "change": "modified",
+                "from_index": old_index,
+                **_describe_card(new_card, new_index),
+                "ops": diff(old_card, new_card),
+            }
+        )
+    paired = min(len(unmatched_old), len(unmatched_new))
+    for old_index in unmatched_old[paired:]:
+        old_card = old.load(old_cards[old_index])
+        changes.append({"change": "removed", **_describe_card(old_card, old_index)})
+    for new_index in unmatched_new[paired:]:
+        new_card = new.load(new_cards[new_index])
+        changes.append({"change": "added", **_describe_card(new_card, new_index)})
+    return changes
+
+
+def diff_trees(old: SnapshotTree, new: SnapshotTree) -> dict:
+    """Return the structural differences between two dashboard trees."""
+    pairs, unmatched_old, unmatched_new = _match_hashes(
+        [_fingerprint(entry) for entry in old.views],
+        [_fingerprint(entry) for entry in new.views],
+    )
+    views = [
+        {
+            "change": "moved",
+            "from_index": old_index,
+            **_describe_view(new.load(new.views[new_index]["view"]), new_index),
+        }
+        for old_index, new_index in _moved(pairs)
+    ]
+
+    # Only views whose hashes differ are loaded
+    old_views = {index: old.load(old.views[index]["view"]) for index in unmatched_old}
+    new_views = {index: new.load(new.views[index]["view"]) for index in unmatched_new}
+    # Views sharing a key (the same title, no path) are paired in order
+    old_by_key = defaultdict(list)
+    for index, view in old_views.items():
+        old_by_key[_view_key(view, index)].append(index)
+
+    for new_index, new_view in new_views.items():
+        candidates = old_by_key.get(_view_key(new_view, new_index))
+        if not candidates:
+            views.append({"change": "added", **_describe_view(new_view, new_index)})
+            continue
+        old_index = candidates.pop(0)
+        old_view = old_views[old_index]
+        views.append(
+            {
+                "change": "modified",
+                "from_index": old_index,
+                **_describe_view(new_view, new_index),
+                # The cards are left out of both views, see object_store
+                "ops": diff(old_view, new_view),
+                "cards": _diff_cards(
+                    old,
+                    new,
+                    old.views[old_index].get("cards", []),
+                    new.views[new_index].get("cards", []),
+                ),
+            }
+        )
+    for old_index in sorted(index for indexes in old_by_key.values() for index in indexes):
+        views.append({"change": "removed", **_describe_view(old_views[old_index], old_index)})
+
+    config = diff(old.config, new.config)
+    return {
+        "changed": bool(config or views),
+        "config": config,
+        "views": views,
+        "unchanged_views": len(pairs),
+    }
+
+
+def diff_backups(
+    full_backup_path: str,
+    from_backup: str | None,
+    to_backup: str | None,
+    storage_file: str | None = None,
+    checksums: dict[str, dict] | None = None,
+) -> dict:
+    """Compare two backups, or a backup and the live storage file.
+
+    A side without a backup file is the dashboard's storage file. Runs in
+    the executor.
+    """
+
+    def side(backup_file: str | None) -> SnapshotTree:
+        if backup_file is None:
+            return tree_from_storage(read_snapshot(storage_file).storage_data)
+        return load_tree(full_backup_path, backup_file, checksums)
+
+    return diff_trees(side(from_backup), side(to_backup))
@@ -0,0 +1,76 @@
+"""Compression codecs for Dashboard Backup.
+
+JSON backups can be written through one of the standard library codecs.
+Restores detect the codec from the file's magic bytes rather than its name,
+and decompress while streaming so a backup is never held in memory twice.
+"""
+from __future__ import annotations
+
+import bz2
+from contextlib import nullcontext
+import gzip
+import lzma
+from typing import IO, Any, ContextManager
+
+from .const import COMPRESSION_BZ2, COMPRESSION_GZIP, COMPRESSION_LZMA
+
+# Codec name -> filename suffix
+COMPRESSION_EXTENSIONS = {
+    COMPRESSION_GZIP: ".gz",
+    COMPRESSION_BZ2: ".bz2",
+    COMPRESSION_LZMA: ".xz",
+}
+
+# Leading bytes identifying each codec
+_MAGIC = {
+    COMPRESSION_GZIP: b"\x1f\x8b",
+    COMPRESSION_BZ2: b"BZh",
+    COMPRESSION_LZMA: b"\xfd7zXZ\x00",
+}
+
+CHUNK_SIZE = 64 * 1024
+
+
+def compressed_name(filename: str, codec: str | None) -> str:
+    """Return the filename a backup gets when written with a codec."""
+    return f"{filename}{COMPRESSION_EXTENSIONS.get(codec, '')}"
+
+
+def strip_compression_extension(filename: str) -> str:
+    """Return a backup filename without its compression suffix."""
+    for extension in COMPRESSION_EXTENSIONS.values():
+        if filename.endswith(extension):
+            return filename[: -len(extension)]
+    return filename
+
+
+def compressing_writer(fileobj: Any, codec: str | None, level: int) -> ContextManager[IO[bytes]]:
+    """Wrap an open file so bytes written to it go through a codec."""
+    if codec == COMPRESSION_GZIP:
+        return gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=level)
+    if codec == COMPRESSION_BZ2:
+        return bz2.BZ2File(fileobj, "wb", compresslevel=level)
+    if codec == COMPRESSION_LZMA:
+        return lzma.LZMAFile(fileobj, "wb", preset=level)
+    return nullcontext(fileobj)
+
+
+def detect_compression(path: str) -> str | None:
+    """Return the codec a file was written with, or None if uncompressed."""
+    with open(path, "rb") as f:
+        header = f.read(6)
+    for codec, magic in _MAGIC.items():
+        if header.startswith(magic):
+            return codec
+    return None
+
+
+def decompressing_reader(fileobj: Any, codec: str | None) -> ContextManager[IO[bytes]]:
+    """Wrap an open file so reads from it are decompressed with a codec."""
+    if codec == COMPRESSION_GZIP:
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    if codec == COMPRESSION_BZ2:
+        return bz2.BZ2File(fileobj, "rb")
+    if codec == COMPRESSION_LZMA:
+        return lzma.LZMAFile(fileobj, "rb")
+    return nullcontext(fileobj)
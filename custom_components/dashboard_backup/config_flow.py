@@ -9,7 +9,39 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import DOMAIN, CONF_BACKUP_PATH, DEFAULT_BACKUP_PATH
+from .const import (
+    DOMAIN,
+    CONF_BACKUP_PATH,
+    CONF_BACKUP_MODE,
+    CONF_FULL_BACKUP_INTERVAL,
+    CONF_COMPRESSION,
+    CONF_COMPRESSION_LEVEL,
+    CONF_AUTO_BACKUP,
+    CONF_AUTO_BACKUP_DELAY,
+    CONF_SCHEDULE_INTERVAL,
+    CONF_SCHEDULE_JITTER,
+    CONF_RETENTION_KEEP_LAST,
+    CONF_RETENTION_DAILY,
+    CONF_RETENTION_WEEKLY,
+    CONF_RETENTION_MONTHLY,
+    CONF_RETENTION_MAX_SIZE,
+    DEFAULT_BACKUP_PATH,
+    DEFAULT_BACKUP_MODE,
+    DEFAULT_FULL_BACKUP_INTERVAL,
+    DEFAULT_COMPRESSION,
+    DEFAULT_COMPRESSION_LEVEL,
+    DEFAULT_AUTO_BACKUP,
+    DEFAULT_AUTO_BACKUP_DELAY,
+    DEFAULT_SCHEDULE_INTERVAL,
+    DEFAULT_SCHEDULE_JITTER,
+    DEFAULT_RETENTION_KEEP_LAST,
+    DEFAULT_RETENTION_DAILY,
+    DEFAULT_RETENTION_WEEKLY,
+    DEFAULT_RETENTION_MONTHLY,
+    DEFAULT_RETENTION_MAX_SIZE,
+    BACKUP_MODES,
+    COMPRESSIONS,
+)
 
 
 async def validate_input(hass: HomeAssistant, data: dict) -> dict:
@@ -83,11 +115,63 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             CONF_BACKUP_PATH,
             self.config_entry.data.get(CONF_BACKUP_PATH, DEFAULT_BACKUP_PATH),
         )
+        backup_mode = self.config_entry.options.get(CONF_BACKUP_MODE, DEFAULT_BACKUP_MODE)
+        full_backup_interval = self.config_entry.options.get(
+            CONF_FULL_BACKUP_INTERVAL, DEFAULT_FULL_BACKUP_INTERVAL
+        )
+        compression = self.config_entry.options.get(CONF_COMPRESSION, DEFAULT_COMPRESSION)
+        compression_level = self.config_entry.options.get(
+            CONF_COMPRESSION_LEVEL, DEFAULT_COMPRESSION_LEVEL
+        )
+        auto_backup = self.config_entry.options.get(CONF_AUTO_BACKUP, DEFAULT_AUTO_BACKUP)
+        auto_backup_delay = self.config_entry.options.get(
+            CONF_AUTO_BACKUP_DELAY, DEFAULT_AUTO_BACKUP_DELAY
+        )
+        schedule_interval = self.config_entry.options.get(
+            CONF_SCHEDULE_INTERVAL, DEFAULT_SCHEDULE_INTERVAL
+        )
+        schedule_jitter = self.config_entry.options.get(
+            CONF_SCHEDULE_JITTER, DEFAULT_SCHEDULE_JITTER
+        )
+        retention = {
+            key: self.config_entry.options.get(key, default)
+            for key, default in (
+                (CONF_RETENTION_KEEP_LAST, DEFAULT_RETENTION_KEEP_LAST),
+                (CONF_RETENTION_DAILY, DEFAULT_RETENTION_DAILY),
+                (CONF_RETENTION_WEEKLY, DEFAULT_RETENTION_WEEKLY),
+                (CONF_RETENTION_MONTHLY, DEFAULT_RETENTION_MONTHLY),
+                (CONF_RETENTION_MAX_SIZE, DEFAULT_RETENTION_MAX_SIZE),
+            )
+        }
 
         # Provide default values
         data_schema = vol.Schema(
             {
                 vol.Optional(CONF_BACKUP_PATH, default=backup_path): cv.string,
+                vol.Optional(CONF_BACKUP_MODE, default=backup_mode): vol.In(BACKUP_MODES),
+                vol.Optional(
+                    CONF_FULL_BACKUP_INTERVAL, default=full_backup_interval
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(CONF_COMPRESSION, default=compression): vol.In(COMPRESSIONS),
+                vol.Optional(
+                    CONF_COMPRESSION_LEVEL, default=compression_level
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=9)),
+                vol.Optional(CONF_AUTO_BACKUP, default=auto_backup): bool,
+                vol.Optional(
+                    CONF_AUTO_BACKUP_DELAY, default=auto_backup_delay
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Optional(
+                    CONF_SCHEDULE_INTERVAL, default=schedule_interval
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SCHEDULE_JITTER, default=schedule_jitter
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                **{
+                    vol.Optional(key, default=default): vol.All(
+                        vol.Coerce(int), vol.Range(min=0)
+                    )
+                    for key, default in retention.items()
+                },
             }
         )
 
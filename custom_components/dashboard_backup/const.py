@@ -6,25 +6,155 @@ NAME = "Dashboard Backup"
 # Service names
 SERVICE_CREATE_BACKUP = "create_backup"
 SERVICE_RESTORE_BACKUP = "restore_backup"
+SERVICE_LIST_BACKUPS = "list_backups"
+SERVICE_BACKUP_ALL = "backup_all"
+SERVICE_DIFF_BACKUPS = "diff_backups"
+SERVICE_VERIFY_BACKUPS = "verify_backups"
+SERVICE_GET_JOB = "get_job"
+SERVICE_ADD_CARD_RESOURCE = "add_card_resource"
 
 # Config
 CONF_BACKUP_PATH = "backup_path"
 DEFAULT_BACKUP_PATH = "dashboard_backups"
 
+CONF_BACKUP_MODE = "backup_mode"
+CONF_FULL_BACKUP_INTERVAL = "full_backup_interval"
+DEFAULT_FULL_BACKUP_INTERVAL = 10
+
+CONF_COMPRESSION = "compression"
+CONF_COMPRESSION_LEVEL = "compression_level"
+
+# Automatic backups after dashboard changes, debounced by a delay in seconds
+CONF_AUTO_BACKUP = "auto_backup"
+CONF_AUTO_BACKUP_DELAY = "auto_backup_delay"
+DEFAULT_AUTO_BACKUP = False
+DEFAULT_AUTO_BACKUP_DELAY = 60
+
+# Built-in scheduler: interval in hours (0 disables it) and jitter in minutes
+CONF_SCHEDULE_INTERVAL = "schedule_interval"
+CONF_SCHEDULE_JITTER = "schedule_jitter"
+DEFAULT_SCHEDULE_INTERVAL = 0
+DEFAULT_SCHEDULE_JITTER = 10
+
+# Retention, 0 disables a rule
+CONF_RETENTION_KEEP_LAST = "retention_keep_last"
+CONF_RETENTION_DAILY = "retention_daily"
+CONF_RETENTION_WEEKLY = "retention_weekly"
+CONF_RETENTION_MONTHLY = "retention_monthly"
+CONF_RETENTION_MAX_SIZE = "retention_max_size_mb"
+DEFAULT_RETENTION_KEEP_LAST = 0
+DEFAULT_RETENTION_DAILY = 0
+DEFAULT_RETENTION_WEEKLY = 0
+DEFAULT_RETENTION_MONTHLY = 0
+DEFAULT_RETENTION_MAX_SIZE = 0
+
+# Compression codecs for JSON backups
+COMPRESSION_NONE = "none"
+COMPRESSION_GZIP = "gzip"
+COMPRESSION_BZ2 = "bz2"
+COMPRESSION_LZMA = "lzma"
+COMPRESSIONS = [COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_BZ2, COMPRESSION_LZMA]
+DEFAULT_COMPRESSION = COMPRESSION_NONE
+DEFAULT_COMPRESSION_LEVEL = 6
+
+# Backup modes
+BACKUP_MODE_FULL = "full"
+BACKUP_MODE_DEDUPLICATED = "deduplicated"
+BACKUP_MODE_INCREMENTAL = "incremental"
+BACKUP_MODES = [BACKUP_MODE_FULL, BACKUP_MODE_DEDUPLICATED, BACKUP_MODE_INCREMENTAL]
+DEFAULT_BACKUP_MODE = BACKUP_MODE_FULL
+
+# Backup output formats written by default
+DEFAULT_BACKUP_FORMATS = ["json", "yaml"]
+
+# Keys in hass.data[DOMAIN]
+DATA_INDEX = "index"
+DATA_RESOLVER = "resolver"
+DATA_PRUNE_TASK = "prune_task"
+DATA_WATCHER = "watcher"
+DATA_SCHEDULER = "scheduler"
+DATA_COORDINATOR = "coordinator"
+DATA_STATS = "stats"
+DATA_STRATEGIES = "strategies"
+DATA_VERIFY_TASK = "verify_task"
+DATA_JOBS = "jobs"
+DATA_SETUP_TIMER = "setup_timer"
+# Served card files, kept in hass.data itself for the whole Home Assistant run
+DATA_CARD_ASSETS = f"{DOMAIN}_card_assets"
+
+# Dispatcher signal sent when backups or their metrics change
+SIGNAL_BACKUPS_UPDATED = f"{DOMAIN}_backups_updated"
+
 # Attributes
 ATTR_DASHBOARD_ID = "dashboard_id"
 ATTR_BACKUP_FILE = "backup_file"
 ATTR_TIMESTAMP = "timestamp"
+ATTR_VIEW = "view"
+ATTR_CARD = "card"
+ATTR_FROM_BACKUP = "from_backup"
+ATTR_TO_BACKUP = "to_backup"
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_ORDER = "order"
+ATTR_OFFSET = "offset"
+ATTR_LIMIT = "limit"
+ATTR_MAX_WORKERS = "max_workers"
+ATTR_MAX_RATE = "max_rate"
+ATTR_BACKGROUND = "background"
+ATTR_JOB_ID = "job_id"
+
+# Concurrent dashboard backups in a batch
+DEFAULT_MAX_WORKERS = 4
+MAX_WORKERS = 16
+
+# Workers running jobs of services called in the background, and the number
+# of finished jobs remembered for get_job
+JOB_WORKERS = 2
+JOB_HISTORY = 50
+
+# Read rate limits of a backup verification (MB/s)
+DEFAULT_VERIFY_RATE = 5
+MAX_VERIFY_RATE = 1000
+
+# Sort orders for listing backups
+ORDER_NEWEST = "newest"
+ORDER_OLDEST = "oldest"
+
+# Page size limits for listing backups
+DEFAULT_LIST_LIMIT = 50
+MAX_LIST_LIMIT = 500
+
+# Rotated copies of files replaced by a restore, kept in the backup directory
+PRE_RESTORE_DIR = "pre_restore"
+PRE_RESTORE_KEEP = 5
+
+# Pruning runs in the background after backups and on this interval (hours)
+PRUNE_INTERVAL_HOURS = 6
+# Backups deleted per executor job while pruning
+PRUNE_BATCH_SIZE = 50
+
+# Timestamp format used in backup filenames
+TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
 
 # Events
 EVENT_BACKUP_CREATED = f"{DOMAIN}_backup_created"
 EVENT_BACKUP_RESTORED = f"{DOMAIN}_backup_restored"
 EVENT_BACKUP_FAILED = f"{DOMAIN}_backup_failed"
 EVENT_RESTORE_FAILED = f"{DOMAIN}_restore_failed"
+EVENT_BATCH_BACKUP_COMPLETED = f"{DOMAIN}_batch_backup_completed"
+EVENT_VERIFY_COMPLETED = f"{DOMAIN}_verify_completed"
+EVENT_JOB_PROGRESS = f"{DOMAIN}_job_progress"
+EVENT_JOB_COMPLETED = f"{DOMAIN}_job_completed"
+
+# Fired by Lovelace when a dashboard configuration is saved
+EVENT_LOVELACE_UPDATED = "lovelace_updated"
 
 # Error messages
 ERROR_DASHBOARD_NOT_FOUND = "Dashboard not found"
 ERROR_BACKUP_FAILED = "Failed to create backup"
 ERROR_RESTORE_FAILED = "Failed to restore backup"
 ERROR_BACKUP_NOT_FOUND = "Backup file not found"
+ERROR_INVALID_BACKUP_FILE = "Invalid backup file name"
 ERROR_INVALID_YAML = "Invalid YAML in backup file"
+ERROR_VERIFY_RUNNING = "A backup verification is already running"
+ERROR_JOB_NOT_FOUND = "Job not found"
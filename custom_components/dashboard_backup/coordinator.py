@@ -0,0 +1,83 @@
+"""Coordination of concurrent backups and restores for Dashboard Backup.
+
+Backup requests for a dashboard that already has a backup in flight join it
+instead of starting another: every caller awaits the same execution and gets
+the same index entry. Each dashboard also has a lock, held by a backup while
+it runs and taken by restores, so a restore queues behind running backups
+and a backup requested during a restore waits for it to finish.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from typing import Awaitable, Callable, KeysView
+
+from homeassistant.core import HomeAssistant
+
+from .const import TIMESTAMP_FORMAT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def next_timestamp(timestamp: str, after: str | None) -> str:
+    """Return a timestamp, moved to one second after ``after`` if not later.
+
+    Backup filenames have second resolution, so this keeps them unique and
+    keeps a dashboard's backups in the order they were made.
+    """
+    if after is None or timestamp > after:
+        return timestamp
+    moved = datetime.strptime(after, TIMESTAMP_FORMAT) + timedelta(seconds=1)
+    return moved.strftime(TIMESTAMP_FORMAT)
+
+
+class JobCoordinator:
+    """Single-flight backups and per-dashboard locks."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coordinator."""
+        self.hass = hass
+        self._backups: dict[str, asyncio.Future] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        # Timestamp of the latest batch, which names its manifest file
+        self.last_batch: str | None = None
+
+    @property
+    def in_flight(self) -> KeysView[str]:
+        """Return a live view of the dashboards with a backup in flight."""
+        return self._backups.keys()
+
+    def lock(self, dashboard_id: str) -> asyncio.Lock:
+        """Return the lock of a dashboard."""
+        return self._locks.setdefault(dashboard_id, asyncio.Lock())
+
+    async def async_backup(
+        self, dashboard_id: str, run: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """Back up a dashboard, or join the backup of it already in flight.
+
+        ``run`` is only called when no backup is in flight. A caller that is
+        cancelled stops waiting without cancelling the backup for the others.
+        """
+        task = self._backups.get(dashboard_id)
+        if task is None:
+            task = self.hass.async_create_task(self._async_run(dashboard_id, run))
+            self._backups[dashboard_id] = task
+            task.add_done_callback(lambda done: self._finished(dashboard_id, done))
+        else:
+            _LOGGER.debug("Joining the backup of dashboard %s already in flight", dashboard_id)
+        return await asyncio.shield(task)
+
+    async def _async_run(self, dashboard_id: str, run: Callable[[], Awaitable[dict]]) -> dict:
+        """Run a backup while holding the dashboard's lock."""
+        async with self.lock(dashboard_id):
+            return await run()
+
+    def _finished(self, dashboard_id: str, task: asyncio.Future) -> None:
+        """Forget a finished backup."""
+        if self._backups.get(dashboard_id) is task:
+            del self._backups[dashboard_id]
+        if not task.cancelled():
+            # Every caller that still waits has been given the error
+            task.exception()
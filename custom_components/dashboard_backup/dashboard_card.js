@@ -70,7 +70,12 @@ class DashboardBackupCard extends LitElement {
   static get properties() {
     return {
       hass: { type: Object },
-      config: { type: Object }
+      config: { type: Object },
+      _job: { type: Object },
+      _backups: { type: Array },
+      _cursor: { type: String },
+      _browsing: { type: Boolean },
+      _preview: { type: Object }
     };
   }
 
@@ -84,12 +89,40 @@ class DashboardBackupCard extends LitElement {
         justify-content: space-around;
         padding: 8px;
       }
+      .status {
+        margin-top: 8px;
+        color: var(--secondary-text-color);
+      }
+      .status.failed {
+        color: var(--error-color);
+      }
+      .backup {
+        display: flex;
+        align-items: center;
+        justify-content: space-between;
+        border-top: 1px solid var(--divider-color);
+        padding: 4px 0;
+      }
+      .backup .meta {
+        font-size: 0.9em;
+        color: var(--secondary-text-color);
+      }
+      .preview {
+        font-size: 0.9em;
+        padding: 4px 0 8px;
+      }
     `;
   }
 
   constructor() {
     super();
     this.config = {};
+    this._job = null;
+    this._backups = [];
+    this._cursor = null;
+    this._browsing = false;
+    this._preview = null;
+    this._unsubscribe = null;
   }
 
   setConfig(config) {
@@ -99,6 +132,43 @@ class DashboardBackupCard extends LitElement {
     this.config = config;
   }
 
+  get _dashboardId() {
+    return this.config.dashboard_id || 'lovelace';
+  }
+
+  connectedCallback() {
+    super.connectedCallback();
+    this._subscribe();
+  }
+
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    if (this._unsubscribe) {
+      this._unsubscribe.then((unsubscribe) => unsubscribe()).catch(() => {});
+      this._unsubscribe = null;
+    }
+  }
+
+  _subscribe() {
+    if (this._unsubscribe || !this._hass || !this.isConnected) return;
+    // Job progress is pushed over the websocket, nothing is polled
+    this._unsubscribe = this._hass.connection.subscribeMessage(
+      (job) => this._jobUpdated(job),
+      { type: 'dashboard_backup/jobs/subscribe', dashboard_id: this._dashboardId }
+    );
+    this._unsubscribe.catch((err) => {
+      console.warn("Dashboard Backup Card: Could not subscribe to jobs:", err);
+      this._unsubscribe = null;
+    });
+  }
+
+  _jobUpdated(job) {
+    this._job = job;
+    if (job.status === 'completed' && this._browsing) {
+      this._loadBackups(true);
+    }
+  }
+
   render() {
     if (!this.config) return html``;
 
@@ -109,35 +179,128 @@ class DashboardBackupCard extends LitElement {
             <ha-icon icon="mdi:backup-restore" style="width: 40px; height: 40px; margin-right: 16px;"></ha-icon>
             <p>${this.config.description || 'Backup and restore your dashboard configuration.'}</p>
           </div>
+          ${this._renderStatus()}
+          ${this._browsing ? this._renderBrowser() : ''}
         </div>
         <div class="card-actions">
           <mwc-button @click="${this._createBackup}">
             <ha-icon icon="mdi:content-save"></ha-icon>
             Backup Dashboard
           </mwc-button>
-          <mwc-button @click="${this._restoreBackup}">
+          <mwc-button @click="${() => this._restoreBackup()}">
             <ha-icon icon="mdi:backup-restore"></ha-icon>
             Restore Dashboard
           </mwc-button>
+          <mwc-button @click="${this._toggleBrowser}">
+            <ha-icon icon="mdi:format-list-bulleted"></ha-icon>
+            ${this._browsing ? 'Hide Backups' : 'Backups'}
+          </mwc-button>
         </div>
       </ha-card>
     `;
   }
 
+  _renderStatus() {
+    const job = this._job;
+    if (!job) return '';
+    const action = job.type === 'restore' ? 'Restore' : 'Backup';
+    let text;
+    if (job.status === 'queued') {
+      text = `${action} queued`;
+    } else if (job.status === 'running') {
+      text = `${action} running (${Math.round(job.progress * 100)}%)`;
+    } else if (job.status === 'completed') {
+      const file = job.summary && job.summary.backup_file;
+      text = `${action} completed${file ? `: ${file}` : ''}`;
+    } else {
+      text = `${action} failed: ${job.error}`;
+    }
+    return html`<div class="status ${job.status}">${text}</div>`;
+  }
+
+  _renderBrowser() {
+    return html`
+      ${this._backups.map((backup) => html`
+        <div class="backup">
+          <div>
+            <div>${new Date(backup.created).toLocaleString()}</div>
+            <div class="meta">${backup.format}, ${this._formatSize(backup.size)}</div>
+          </div>
+          <div>
+            <mwc-button @click="${() => this._previewRestore(backup.backup_file)}">Preview</mwc-button>
+            <mwc-button @click="${() => this._restoreBackup(backup.backup_file)}">Restore</mwc-button>
+          </div>
+        </div>
+        ${this._preview && this._preview.file === backup.backup_file
+          ? html`<div class="preview">${this._preview.text}</div>`
+          : ''}
+      `)}
+      ${this._backups.length === 0 ? html`<div class="status">No backups yet.</div>` : ''}
+      ${this._cursor
+        ? html`<mwc-button @click="${() => this._loadBackups(false)}">Load More</mwc-button>`
+        : ''}
+    `;
+  }
+
+  _formatSize(size) {
+    if (size == null) return 'unknown size';
+    return size < 1024 ? `${size} B` : `${(size / 1024).toFixed(1)} KB`;
+  }
+
+  _toggleBrowser() {
+    this._browsing = !this._browsing;
+    if (this._browsing) {
+      this._loadBackups(true);
+    }
+  }
+
+  async _loadBackups(reset) {
+    const request = { type: 'dashboard_backup/backups/list', dashboard_id: this._dashboardId, limit: 10 };
+    if (!reset && this._cursor) {
+      request.cursor = this._cursor;
+    }
+    try {
+      const page = await this._hass.callWS(request);
+      this._backups = reset ? page.backups : [...this._backups, ...page.backups];
+      this._cursor = page.cursor;
+    } catch (err) {
+      this._showToast(`Could not list backups: ${err.message}`);
+    }
+  }
+
+  async _previewRestore(backupFile) {
+    try {
+      const diff = await this._hass.callWS({
+        type: 'dashboard_backup/diff',
+        dashboard_id: this._dashboardId,
+        to_backup: backupFile
+      });
+      const counts = {};
+      diff.views.forEach((view) => { counts[view.change] = (counts[view.change] || 0) + 1; });
+      const parts = Object.entries(counts).map(([change, number]) => `${number} view(s) ${change}`);
+      if (diff.config.length) parts.push('dashboard settings changed');
+      this._preview = {
+        file: backupFile,
+        text: diff.changed ? `Restoring would change: ${parts.join(', ')}.` : 'Identical to the current dashboard.'
+      };
+    } catch (err) {
+      this._showToast(`Could not compare backup: ${err.message}`);
+    }
+  }
+
   _createBackup(e) {
-    const dashboardId = this.config.dashboard_id || 'lovelace';
     this._hass.callService('dashboard_backup', 'create_backup', {
-      dashboard_id: dashboardId
+      dashboard_id: this._dashboardId,
+      background: true
     });
-    this._showToast('Creating dashboard backup...');
   }
 
-  _restoreBackup(e) {
-    const dashboardId = this.config.dashboard_id || 'lovelace';
-    this._hass.callService('dashboard_backup', 'restore_backup', {
-      dashboard_id: dashboardId
-    });
-    this._showToast('Restoring dashboard from backup...');
+  _restoreBackup(backupFile) {
+    const data = { dashboard_id: this._dashboardId, background: true };
+    if (backupFile) {
+      data.backup_file = backupFile;
+    }
+    this._hass.callService('dashboard_backup', 'restore_backup', data);
   }
 
   _showToast(message) {
@@ -153,6 +316,7 @@ class DashboardBackupCard extends LitElement {
 
   set hass(hass) {
     this._hass = hass;
+    this._subscribe();
     if (this.shadowRoot) {
       this.requestUpdate();
     }
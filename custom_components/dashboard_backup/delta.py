@@ -0,0 +1,127 @@
+"""Structural deltas between dashboard snapshots.
+
+Incremental backups store only the operations needed to turn the previous
+backup of a dashboard into the current one. Operations address values by a
+path of dict keys and list indexes:
+
+* ``set`` replaces (or adds) the value at a path,
+* ``remove`` deletes a dict key,
+* ``splice`` replaces a slice of a list with new items.
+
+Lists are compared by trimming their common prefix and suffix, so inserting,
+removing or editing a single view or card yields a single small operation.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from .serialization import dumps_json, loads_json
+
+DELTA_FORMAT = "dashboard_backup.delta"
+DELTA_VERSION = 1
+DELTA_EXTENSION = ".delta.json"
+
+
+def diff(old: Any, new: Any, path: list | None = None) -> list[dict]:
+    """Return the operations that turn ``old`` into ``new``."""
+    path = path or []
+    if old == new:
+        return []
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": path + [key]})
+        for key, value in new.items():
+            if key in old:
+                ops.extend(diff(old[key], value, path + [key]))
+            else:
+                ops.append({"op": "set", "path": path + [key], "value": value})
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list):
+        # Trim the common prefix and suffix
+        start = 0
+        limit = min(len(old), len(new))
+        while start < limit and old[start] == new[start]:
+            start += 1
+        end = 0
+        while (
+            end < limit - start
+            and old[len(old) - 1 - end] == new[len(new) - 1 - end]
+        ):
+            end += 1
+        old_middle = old[start:len(old) - end]
+        new_middle = new[start:len(new) - end]
+
+        # Items edited in place are diffed individually
+        if len(old_middle) == len(new_middle):
+            ops = []
+            for offset, (old_item, new_item) in enumerate(zip(old_middle, new_middle)):
+                ops.extend(diff(old_item, new_item, path + [start + offset]))
+            return ops
+
+        return [
+            {
+                "op": "splice",
+                "path": path,
+                "index": start,
+                "delete": len(old_middle),
+                "insert": new_middle,
+            }
+        ]
+
+    return [{"op": "set", "path": path, "value": new}]
+
+
+def apply(data: Any, ops: list[dict]) -> Any:
+    """Apply operations produced by ``diff`` to ``data`` in place."""
+    for op in ops:
+        path = op["path"]
+        if op["op"] == "splice":
+            target = _resolve(data, path)
+            index = op["index"]
+            target[index:index + op["delete"]] = op["insert"]
+            continue
+
+        if not path:
+            # Only a "set" can address the root
+            data = op["value"]
+            continue
+
+        parent = _resolve(data, path[:-1])
+        if op["op"] == "set":
+            parent[path[-1]] = op["value"]
+        elif op["op"] == "remove":
+            del parent[path[-1]]
+        else:
+            raise ValueError(f"Unknown delta operation: {op['op']}")
+
+    return data
+
+
+def _resolve(data: Any, path: list) -> Any:
+    """Walk a path of keys and indexes."""
+    for key in path:
+        data = data[key]
+    return data
+
+
+def build_delta(base_file: str, ops: list[dict]) -> bytes:
+    """Return the content of a delta backup file."""
+    delta = {
+        "format": DELTA_FORMAT,
+        "version": DELTA_VERSION,
+        "base": base_file,
+        "ops": ops,
+    }
+    return dumps_json(delta)
+
+
+def parse_delta(content: bytes) -> dict:
+    """Parse and validate a delta backup file."""
+    delta = loads_json(content)
+    if delta.get("format") != DELTA_FORMAT:
+        raise ValueError("Not a dashboard backup delta")
+    return delta
@@ -0,0 +1,20 @@
+"""Diagnostics for Dashboard Backup."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DATA_SETUP_TIMER, DATA_STRATEGIES, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    return {
+        "options": dict(entry.options),
+        "strategies": hass.data[DOMAIN][DATA_STRATEGIES].diagnostics(),
+        "setup": hass.data[DOMAIN][DATA_SETUP_TIMER].as_dict(),
+    }
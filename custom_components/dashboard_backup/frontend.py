@@ -1,115 +1,170 @@
-"""Frontend for Dashboard Backup."""
+"""Frontend for Dashboard Backup.
+
+The card files are served by the integration itself from ``/dashboard_backup_static/``,
+straight out of the integration's directory. They are read and gzipped once,
+on the first request, and their URLs carry a hash of their content, so
+browsers can cache a version for good and only fetch the files again when
+they change. The card is registered with the frontend once per Home
+Assistant run, after Home Assistant has started, so it does not delay
+booting.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import gzip
+import hashlib
+import mimetypes
 import os
 import logging
-from typing import List
+import time
+
+from aiohttp import hdrs, web
 
-from homeassistant.core import HomeAssistant
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.service import async_register_admin_service
 from homeassistant.components.lovelace.resources import ResourceStorageCollection
 
-from .const import DOMAIN
+from .const import DATA_CARD_ASSETS, DOMAIN, SERVICE_ADD_CARD_RESOURCE
+from .stats import SetupTimer
+from .storage_io import async_run
 
 _LOGGER = logging.getLogger(__name__)
 
 CARD_FILENAME = "dashboard_card.js"
 CARD_DIRECT_FILENAME = "dashboard_card_direct.js"
+CARD_FILES = [CARD_FILENAME, CARD_DIRECT_FILENAME, "dashboard_backup.png"]
 
+# The card files are served by the integration under this path
+ROOT_PATH = f"/{DOMAIN}_static/"
+# Where the card files used to be copied to, served via /local/
+LEGACY_ROOT_PATH = f"/local/{DOMAIN}/"
 
-async def async_setup_frontend(hass: HomeAssistant) -> bool:
-    """Set up the Dashboard Backup frontend."""
-    # Get the URL for the dashboard cards
-    # Files in the www directory are accessible via /local/
-    root_path = f"/local/dashboard_backup/"
-    # Use only the direct import version which is more reliable
-    card_url = f"{root_path}{CARD_DIRECT_FILENAME}"
-    card_direct_url = f"{root_path}{CARD_DIRECT_FILENAME}"
+# Versioned URLs never change content, other requests check for a newer version
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
 
-    # Try multiple methods to register the cards
-    success = False
-    
-    # Method 1: Try to add the card to the frontend using add_extra_js_url
-    try:
-        from homeassistant.components.frontend import add_extra_js_url
-        
-        add_extra_js_url(hass, card_url)
-        _LOGGER.info("Added dashboard card to frontend: %s", card_url)
-        success = True
-    except ImportError:
-        _LOGGER.debug("Could not import add_extra_js_url")
-    
-    # Method 2: Try to register the card as a built-in panel
-    if not success:
-        try:
-            from homeassistant.components.frontend import async_register_built_in_panel
-            
-            await async_register_built_in_panel(
-                hass,
-                "custom",
-                "dashboard_backup",
-                "mdi:backup-restore",  # Use Material Design Icon
-                "Dashboard Backup",
-                js_url=card_url,
-            )
-            _LOGGER.info("Registered dashboard card as built-in panel: %s", card_url)
-            success = True
-        except ImportError:
-            _LOGGER.debug("Could not import async_register_built_in_panel")
-    
-    # Method 3: Try to add the card as a Lovelace resource
-    if not success:
+# Only text compresses well enough to be worth serving gzipped
+COMPRESSIBLE_TYPES = ("text/", "application/javascript")
+
+
+@dataclass
+class CardAsset:
+    """A card file held in memory, ready to be served."""
+
+    body: bytes
+    content_type: str
+    # Short hash of the content, used as the version and the ETag
+    version: str
+    gzipped: bytes | None = None
+
+
+def load_card_assets() -> dict[str, CardAsset]:
+    """Read, hash and compress the card files.
+
+    This touches the filesystem and must be run in the executor.
+    """
+    component_dir = os.path.dirname(os.path.abspath(__file__))
+    assets = {}
+    for filename in CARD_FILES:
+        path = os.path.join(component_dir, filename)
         try:
-            # Try to add the standard card as a Lovelace resource
-            resource_url = f"{root_path}{CARD_FILENAME}"
-            direct_resource_url = f"{root_path}{CARD_DIRECT_FILENAME}"
-            
-            # Check if the resource already exists
-            if hasattr(hass.data, "lovelace") and "resources" in hass.data["lovelace"]:
-                resources = hass.data["lovelace"]["resources"]
-                if isinstance(resources, ResourceStorageCollection):
-                    # Check if the standard resource already exists
-                    for resource in resources.async_items():
-                        if resource["url"] == resource_url:
-                            _LOGGER.info("Resource already exists: %s", resource_url)
-                            success = True
-                            break
-                    
-                    # Add the standard resource if it doesn't exist
-                    if not success:
-                        try:
-                            await resources.async_create_item({
-                                "url": resource_url,
-                                "type": "module",
-                                "res_type": "module",
-                            })
-                            _LOGGER.info("Added card as Lovelace resource: %s", resource_url)
-                            success = True
-                        except Exception as ex:
-                            _LOGGER.debug("Could not add resource: %s", str(ex))
-                    
-                    # Also try to add the direct import version
-                    direct_exists = False
-                    for resource in resources.async_items():
-                        if resource["url"] == direct_resource_url:
-                            _LOGGER.info("Direct import resource already exists: %s", direct_resource_url)
-                            direct_exists = True
-                            break
-                    
-                    if not direct_exists:
-                        try:
-                            await resources.async_create_item({
-                                "url": direct_resource_url,
-                                "type": "module",
-                                "res_type": "module",
-                            })
-                            _LOGGER.info("Added direct import card as Lovelace resource: %s", direct_resource_url)
-                        except Exception as ex:
-                            _LOGGER.debug("Could not add direct import resource: %s", str(ex))
-        except Exception as ex:
-            _LOGGER.debug("Could not add card as Lovelace resource: %s", str(ex))
-    
-    # Method 4: Always register a service to manually add the card as a resource
+            with open(path, "rb") as f:
+                body = f.read()
+        except OSError as ex:
+            _LOGGER.warning("Could not read card file %s: %s", path, str(ex))
+            continue
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        if content_type == "text/javascript":
+            content_type = "application/javascript"
+        gzipped = None
+        if content_type.startswith(COMPRESSIBLE_TYPES):
+            # A fixed mtime keeps the compressed bytes stable across restarts
+            gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+            if len(gzipped) >= len(body):
+                gzipped = None
+        assets[filename] = CardAsset(
+            body, content_type, hashlib.sha256(body).hexdigest()[:16], gzipped
+        )
+    return assets
+
+
+class CardAssetView(HomeAssistantView):
+    """Serve the card files with long-lived caching."""
+
+    url = ROOT_PATH + "{filename}"
+    name = f"{DOMAIN}:card"
+    # Lovelace resources are loaded without authentication
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+        self._assets: dict[str, CardAsset] | None = None
+        self._lock = asyncio.Lock()
+
+    async def async_assets(self) -> dict[str, CardAsset]:
+        """Return the card files, loading them on first use."""
+        async with self._lock:
+            if self._assets is None:
+                self._assets = await async_run(self.hass, load_card_assets)
+        return self._assets
+
+    async def async_url(self, filename: str) -> str:
+        """Return the versioned URL of a card file."""
+        asset = (await self.async_assets()).get(filename)
+        if asset is None:
+            return f"{ROOT_PATH}{filename}"
+        return f"{ROOT_PATH}{filename}?v={asset.version}"
+
+    async def get(self, request: web.Request, filename: str) -> web.StreamResponse:
+        """Return a card file, gzipped if the browser accepts it."""
+        asset = (await self.async_assets()).get(filename)
+        if asset is None:
+            raise web.HTTPNotFound()
+
+        etag = f'"{asset.version}"'
+        headers = {
+            hdrs.ETAG: etag,
+            hdrs.CACHE_CONTROL: (
+                CACHE_IMMUTABLE if request.query.get("v") == asset.version else CACHE_REVALIDATE
+            ),
+        }
+        if asset.gzipped is not None:
+            headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+        if etag in request.headers.get(hdrs.IF_NONE_MATCH, ""):
+            return web.Response(status=304, headers=headers)
+
+        body = asset.body
+        if asset.gzipped is not None and "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            body = asset.gzipped
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+        return web.Response(body=body, content_type=asset.content_type, headers=headers)
+
+
+@callback
+def async_setup_frontend(hass: HomeAssistant, timer: SetupTimer) -> None:
+    """Set up the Dashboard Backup frontend.
+
+    The card files are served from the first setup of each Home Assistant
+    run on, since views cannot be removed. The card is registered in the
+    background once Home Assistant has started, and the time it takes is
+    recorded as a deferred phase.
+    """
+    # Kept outside the integration's data, which is dropped when it is unloaded
+    view = hass.data.get(DATA_CARD_ASSETS)
+    first_setup = view is None
+    if first_setup:
+        view = hass.data[DATA_CARD_ASSETS] = CardAssetView(hass)
+        hass.http.register_view(view)
+
+    # Always register a service to manually add the card as a resource
     async def add_card_resource(call):
         """Add the dashboard card as a Lovelace resource."""
+        card_url = await view.async_url(CARD_DIRECT_FILENAME)
+        card_direct_url = card_url
         try:
             # Try to add the standard card first
             await hass.services.async_call(
@@ -159,13 +214,138 @@ async def async_setup_frontend(hass: HomeAssistant) -> bool:
     async_register_admin_service(
         hass,
         DOMAIN,
-        "add_card_resource",
+        SERVICE_ADD_CARD_RESOURCE,
         add_card_resource,
     )
     _LOGGER.info(
         "Registered service dashboard_backup.add_card_resource to manually add the card as a resource"
     )
     
+    if not first_setup:
+        # Reloading the entry must not register the card again
+        return
+
+    async def _async_register(_event=None) -> None:
+        """Load the card files and register the card."""
+        started = time.monotonic()
+        await _async_register_card(hass, view)
+        timer.deferred["frontend"] = round(time.monotonic() - started, 3)
+
+    if hass.is_running:
+        hass.async_create_task(_async_register())
+    else:
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _async_register)
+
+
+async def _async_lovelace_resources(hass: HomeAssistant) -> ResourceStorageCollection | None:
+    """Return the Lovelace resources, if they are stored by Home Assistant."""
+    # Lovelace keeps its data in a dict in older versions
+    lovelace = hass.data.get("lovelace")
+    resources = getattr(lovelace, "resources", None)
+    if resources is None and isinstance(lovelace, dict):
+        resources = lovelace.get("resources")
+    if not isinstance(resources, ResourceStorageCollection):
+        return None
+    if not getattr(resources, "loaded", True):
+        await resources.async_load()
+        resources.loaded = True
+    return resources
+
+
+async def _async_update_resources(hass: HomeAssistant, urls: dict[str, str]) -> None:
+    """Point resources at older versions or copies of the card files to the current ones.
+
+    ``urls`` maps each card file to its versioned URL.
+    """
+    try:
+        resources = await _async_lovelace_resources(hass)
+        if resources is None:
+            return
+        for resource in list(resources.async_items()):
+            path = resource["url"].partition("?")[0]
+            for root in (ROOT_PATH, LEGACY_ROOT_PATH):
+                if path.startswith(root):
+                    url = urls.get(path[len(root):])
+                    if url is not None and resource["url"] != url:
+                        await resources.async_update_item(
+                            resource["id"], {"url": url, "res_type": "module"}
+                        )
+                        _LOGGER.info("Updated Lovelace resource %s to %s", resource["url"], url)
+    except Exception as ex:
+        _LOGGER.debug("Could not update the card's Lovelace resources: %s", str(ex))
+
+
+async def _async_register_card(hass: HomeAssistant, view: CardAssetView) -> bool:
+    """Register the card with the frontend, trying several methods."""
+    urls = {filename: await view.async_url(filename) for filename in CARD_FILES}
+    # Use only the direct import version which is more reliable
+    card_url = urls[CARD_DIRECT_FILENAME]
+    card_direct_url = card_url
+
+    # Resources added before keep working, and are not loaded next to the new version
+    await _async_update_resources(hass, urls)
+
+    # Try multiple methods to register the cards
+    success = False
+    
+    # Method 1: Try to add the card to the frontend using add_extra_js_url
+    try:
+        from homeassistant.components.frontend import add_extra_js_url
+        
+        add_extra_js_url(hass, card_url)
+        _LOGGER.info("Added dashboard card to frontend: %s", card_url)
+        success = True
+    except ImportError:
+        _LOGGER.debug("Could not import add_extra_js_url")
+    
+    # Method 2: Try to register the card as a built-in panel
+    if not success:
+        try:
+            from homeassistant.components.frontend import async_register_built_in_panel
+            
+            await async_register_built_in_panel(
+                hass,
+                "custom",
+                "dashboard_backup",
+                "mdi:backup-restore",  # Use Material Design Icon
+                "Dashboard Backup",
+                js_url=card_url,
+            )
+            _LOGGER.info("Registered dashboard card as built-in panel: %s", card_url)
+            success = True
+        except ImportError:
+            _LOGGER.debug("Could not import async_register_built_in_panel")
+    
+    # Method 3: Try to add the card as a Lovelace resource
+    if not success:
+        try:
+            # Try to add the standard card as a Lovelace resource
+            resource_url = urls[CARD_FILENAME]
+            direct_resource_url = urls[CARD_DIRECT_FILENAME]
+
+            resources = await _async_lovelace_resources(hass)
+            if resources is not None:
+                # Look the existing resources up once, by URL
+                existing = {resource["url"] for resource in resources.async_items()}
+                for url in (resource_url, direct_resource_url):
+                    if url in existing:
+                        _LOGGER.info("Resource already exists: %s", url)
+                    else:
+                        try:
+                            await resources.async_create_item({
+                                "url": url,
+                                "res_type": "module",
+                            })
+                            _LOGGER.info("Added card as Lovelace resource: %s", url)
+                        except Exception as ex:
+                            _LOGGER.debug("Could not add resource %s: %s", url, str(ex))
+                            continue
+                    # The standard card is the one that counts
+                    if url == resource_url:
+                        success = True
+        except Exception as ex:
+            _LOGGER.debug("Could not add card as Lovelace resource: %s", str(ex))
+    
     # If all methods failed, log a warning
     if not success:
         _LOGGER.warning(
@@ -0,0 +1,389 @@
+"""Persistent backup index for Dashboard Backup.
+
+The index is an ``index.json`` file in the backup directory listing every
+backup by dashboard id, sorted by timestamp. It is loaded once, kept in
+memory and rewritten atomically after each change, so finding the latest
+backup of a dashboard no longer lists the backup directory. If the file is
+missing, unreadable or points at files that were deleted by hand, it is
+rebuilt from the directory contents.
+
+Loading, rebuilding and changing the index block and run in the executor.
+They are serialized by a write lock held across their disk I/O, while the
+in-memory state has its own lock that is only held to read or swap it, so
+lookups (``latest``, ``find``, ``query``, ...) never wait on the disk and
+can be called on the event loop.
+"""
+from __future__ import annotations
+
+import bisect
+import heapq
+from itertools import islice
+import logging
+import os
+import re
+import threading
+from typing import Iterable, Iterator
+
+from .compression import detect_compression, strip_compression_extension
+from .delta import DELTA_EXTENSION, parse_delta
+from .integrity import open_verified
+from .object_store import MANIFEST_EXTENSION, read_manifest
+from .serialization import dumps_json, loads_json
+from .storage_io import atomic_writer, list_dir, path_exists, read_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 1
+
+_BACKUP_FILE_RE = re.compile(
+    r"^dashboard_(?P<dashboard_id>.+)_(?P<timestamp>\d{8}_\d{6})(?P<extension>\..+)$"
+)
+
+# Filename suffix -> backup format, most specific first
+_FORMAT_EXTENSIONS = [
+    (MANIFEST_EXTENSION, "manifest"),
+    (DELTA_EXTENSION, "delta"),
+    (".json", "json"),
+    (".yaml", "yaml"),
+]
+
+# Preferred file of a backup when it was written in several formats
+_FORMAT_PRIORITY = ["json", "manifest", "delta", "yaml"]
+
+
+def is_bare_filename(filename: str) -> bool:
+    """Return True if a name cannot point outside the backup directory."""
+    return not (
+        os.sep in filename or (os.altsep and os.altsep in filename) or ".." in filename
+    )
+
+
+def backup_format_of(filename: str) -> str | None:
+    """Return the backup format of a filename, or None if not a backup."""
+    name = strip_compression_extension(filename)
+    for extension, backup_format in _FORMAT_EXTENSIONS:
+        if name.endswith(extension):
+            return backup_format
+    return None
+
+
+def backup_references(full_backup_path: str, backup_format: str, filename: str) -> dict:
+    """Return what a backup depends on: a delta's base or a manifest's tree."""
+    path = os.path.join(full_backup_path, filename)
+    if backup_format == "delta":
+        with open_verified(path) as f:
+            return {"base": parse_delta(f.read())["base"]}
+    if backup_format == "manifest":
+        return {"tree": read_manifest(path)["tree"]}
+    return {}
+
+
+def _with_dashboard_id(entries: Iterable[dict], dashboard_id: str) -> Iterator[dict]:
+    """Yield copies of index entries that include their dashboard id."""
+    for entry in entries:
+        yield {**entry, "dashboard_id": dashboard_id}
+
+
+class BackupIndex:
+    """In-memory view of the backups in a backup directory."""
+
+    def __init__(self, full_backup_path: str) -> None:
+        """Initialize the index."""
+        self.full_backup_path = full_backup_path
+        self.path = os.path.join(full_backup_path, INDEX_FILENAME)
+        self._backups: dict[str, list[dict]] = {}
+        # Sorted timestamps of each dashboard, kept alongside for bisection
+        self._timestamps: dict[str, list[str]] = {}
+        # Guards the in-memory state, never held during I/O
+        self._lock = threading.RLock()
+        # Serializes loads, rebuilds and changes, which write the index file
+        self._write_lock = threading.RLock()
+
+    def _set_backups(self, backups: dict[str, list[dict]]) -> None:
+        """Replace the in-memory index."""
+        timestamps = {
+            dashboard_id: [entry["timestamp"] for entry in entries]
+            for dashboard_id, entries in backups.items()
+        }
+        with self._lock:
+            self._backups = backups
+            self._timestamps = timestamps
+
+    def load(self) -> None:
+        """Load the index file, rebuilding it from disk if needed."""
+        with self._write_lock:
+            try:
+                index = loads_json(read_bytes(self.path))
+                if index.get("version") != INDEX_VERSION:
+                    raise ValueError(f"unsupported index version {index.get('version')}")
+                self._set_backups(index["backups"])
+            except FileNotFoundError:
+                self.rebuild()
+            except (ValueError, KeyError, TypeError) as ex:
+                _LOGGER.warning("Backup index %s is invalid (%s), rebuilding it", self.path, ex)
+                self.rebuild()
+
+    def rebuild(self) -> None:
+        """Rebuild the index from the backup directory contents."""
+        with self._write_lock:
+            grouped: dict[tuple[str, str], dict[str, str]] = {}
+            for filename in list_dir(self.full_backup_path):
+                match = _BACKUP_FILE_RE.match(filename)
+                backup_format = backup_format_of(filename)
+                if not match or not backup_format:
+                    continue
+                key = (match["dashboard_id"], match["timestamp"])
+                grouped.setdefault(key, {})[backup_format] = filename
+
+            backups: dict[str, list[dict]] = {}
+            for (dashboard_id, timestamp), files in grouped.items():
+                backup_format = next(f for f in _FORMAT_PRIORITY if f in files)
+                primary = files[backup_format]
+                paths = [os.path.join(self.full_backup_path, f) for f in files.values()]
+                try:
+                    entry = {
+                        "file": primary,
+                        "files": sorted(files.values()),
+                        "timestamp": timestamp,
+                        "format": backup_format,
+                        "compression": detect_compression(
+                            os.path.join(self.full_backup_path, primary)
+                        ),
+                        "size": sum(os.path.getsize(path) for path in paths),
+                        "hash": None,
+                        **backup_references(self.full_backup_path, backup_format, primary),
+                    }
+                except Exception as ex:  # pylint: disable=broad-except
+                    # One unreadable backup must not keep the others out of the index
+                    _LOGGER.warning("Skipping unreadable backup %s: %s", primary, str(ex))
+                    continue
+                backups.setdefault(dashboard_id, []).append(entry)
+
+            for entries in backups.values():
+                entries.sort(key=lambda entry: entry["timestamp"])
+
+            self._set_backups(backups)
+            self._save()
+            _LOGGER.info(
+                "Rebuilt backup index with %d backups",
+                sum(len(entries) for entries in backups.values()),
+            )
+
+    def _save(self) -> None:
+        """Write the index atomically. Called with the write lock held."""
+        with self._lock:
+            backups = {
+                dashboard_id: list(entries) for dashboard_id, entries in self._backups.items()
+            }
+        data = dumps_json({"version": INDEX_VERSION, "backups": backups})
+        with atomic_writer(self.path) as f:
+            f.write(data)
+
+    def add(self, dashboard_id: str, entry: dict) -> None:
+        """Record a new backup and persist the index."""
+        with self._write_lock:
+            with self._lock:
+                entries = self._backups.setdefault(dashboard_id, [])
+                timestamps = self._timestamps.setdefault(dashboard_id, [])
+                position = bisect.bisect_right(timestamps, entry["timestamp"])
+                entries.insert(position, entry)
+                timestamps.insert(position, entry["timestamp"])
+            self._save()
+
+    def latest(self, dashboard_id: str) -> dict | None:
+        """Return the newest backup of a dashboard, if any."""
+        with self._lock:
+            entries = self._backups.get(dashboard_id)
+            return entries[-1] if entries else None
+
+    def find_latest(self, dashboard_id: str) -> dict | None:
+        """Return the newest backup of a dashboard whose file still exists.
+
+        The index is rebuilt once if it points at a file that is gone.
+        """
+        entry = self.latest(dashboard_id)
+        if entry and not path_exists(os.path.join(self.full_backup_path, entry["file"])):
+            _LOGGER.warning("Backup %s is missing, rebuilding the backup index", entry["file"])
+            self.rebuild()
+            entry = self.latest(dashboard_id)
+        return entry
+
+    def dashboards(self) -> list[str]:
+        """Return the ids of all dashboards with backups."""
+        with self._lock:
+            return [dashboard_id for dashboard_id, entries in self._backups.items() if entries]
+
+    def entries(self, dashboard_id: str) -> list[dict]:
+        """Return the backups of a dashboard, oldest first."""
+        with self._lock:
+            return list(self._backups.get(dashboard_id, []))
+
+    def query(
+        self,
+        dashboard_id: str | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        newest_first: bool = True,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> tuple[int, list[dict]]:
+        """Return one page of backups and the total number matching.
+
+        ``start`` and ``end`` are inclusive timestamps in the backup filename
+        format. Each returned entry includes its dashboard id.
+        """
+        with self._lock:
+            dashboard_ids = [dashboard_id] if dashboard_id else list(self._backups)
+            ranges = []
+            for current_id in dashboard_ids:
+                timestamps = self._timestamps.get(current_id, [])
+                low = bisect.bisect_left(timestamps, start) if start else 0
+                high = bisect.bisect_right(timestamps, end) if end else len(timestamps)
+                if low < high:
+                    ranges.append((current_id, low, high))
+
+            total = sum(high - low for _, low, high in ranges)
+            stop = total if limit is None else min(total, offset + limit)
+
+            if len(ranges) == 1:
+                # A single dashboard is sliced directly
+                current_id, low, high = ranges[0]
+                if newest_first:
+                    selected = range(high - 1 - offset, high - 1 - stop, -1)
+                else:
+                    selected = range(low + offset, low + stop)
+                entries = self._backups[current_id]
+                page = [{**entries[i], "dashboard_id": current_id} for i in selected]
+                return total, page
+
+            # Several dashboards are merged by timestamp
+            streams = [
+                _with_dashboard_id(
+                    reversed(self._backups[current_id][low:high])
+                    if newest_first
+                    else self._backups[current_id][low:high],
+                    current_id,
+                )
+                for current_id, low, high in ranges
+            ]
+            merged = heapq.merge(
+                *streams, key=lambda entry: entry["timestamp"], reverse=newest_first
+            )
+            return total, list(islice(merged, offset, stop))
+
+    def page(
+        self,
+        dashboard_id: str | None = None,
+        after: tuple[str, str] | None = None,
+        newest_first: bool = True,
+        limit: int = 50,
+    ) -> list[dict]:
+        """Return the backups that follow a position in the listing.
+
+        Backups are ordered by timestamp and then dashboard id, which is
+        unique per backup. ``after`` is the (timestamp, dashboard id) of the
+        last backup of the previous page. Unlike an offset, it still points at
+        the same place after backups are added or pruned. Each returned entry
+        includes its dashboard id.
+        """
+        with self._lock:
+            dashboard_ids = [dashboard_id] if dashboard_id else list(self._backups)
+            streams = []
+            for current_id in dashboard_ids:
+                timestamps = self._timestamps.get(current_id, [])
+                low, high = 0, len(timestamps)
+                if after is not None:
+                    timestamp, last_id = after
+                    # Backups of the last dashboard, or of one sorted after it,
+                    # with the cursor's timestamp were already listed
+                    if newest_first:
+                        search = bisect.bisect_left if current_id >= last_id else bisect.bisect_right
+                        high = search(timestamps, timestamp)
+                    else:
+                        search = bisect.bisect_right if current_id <= last_id else bisect.bisect_left
+                        low = search(timestamps, timestamp)
+                if low >= high:
+                    continue
+                positions = range(high - 1, low - 1, -1) if newest_first else range(low, high)
+                streams.append(
+                    _with_dashboard_id(
+                        map(self._backups[current_id].__getitem__, positions), current_id
+                    )
+                )
+            merged = heapq.merge(
+                *streams,
+                key=lambda entry: (entry["timestamp"], entry["dashboard_id"]),
+                reverse=newest_first,
+            )
+            return list(islice(merged, limit))
+
+    def find(self, filename: str) -> dict | None:
+        """Return the backup a file belongs to, with its dashboard id."""
+        match = _BACKUP_FILE_RE.match(filename)
+        if match is None:
+            return None
+        dashboard_id = match["dashboard_id"]
+        with self._lock:
+            timestamps = self._timestamps.get(dashboard_id, [])
+            position = bisect.bisect_left(timestamps, match["timestamp"])
+            if position == len(timestamps) or timestamps[position] != match["timestamp"]:
+                return None
+            entry = self._backups[dashboard_id][position]
+            if filename not in (entry.get("files") or [entry["file"]]):
+                return None
+            return {**entry, "dashboard_id": dashboard_id}
+
+    def remove(self, dashboard_id: str, timestamps: set[str]) -> None:
+        """Forget backups of a dashboard and persist the index."""
+        with self._write_lock:
+            with self._lock:
+                entries = [
+                    entry
+                    for entry in self._backups.get(dashboard_id, [])
+                    if entry["timestamp"] not in timestamps
+                ]
+                if entries:
+                    self._backups[dashboard_id] = entries
+                    self._timestamps[dashboard_id] = [entry["timestamp"] for entry in entries]
+                else:
+                    self._backups.pop(dashboard_id, None)
+                    self._timestamps.pop(dashboard_id, None)
+            self._save()
+
+    def summary(self, dashboard_id: str) -> tuple[int, int]:
+        """Return the number and total size in bytes of a dashboard's backups."""
+        with self._lock:
+            entries = self._backups.get(dashboard_id, [])
+            return len(entries), sum(entry.get("size") or 0 for entry in entries)
+
+    def chain_checksums(self, filenames: Iterable[str | None]) -> dict[str, dict]:
+        """Return the recorded checksums of backup files and of the files they build on.
+
+        Reading a delta reads every delta back to its full snapshot, so the
+        chain is followed through the bases recorded in the index, each step
+        a lookup by filename. Backups found by a rebuild have no checksums,
+        since the files on disk cannot vouch for themselves.
+        """
+        checksums: dict[str, dict] = {}
+        seen: set[str] = set()
+        for filename in filenames:
+            while filename is not None and filename not in seen:
+                seen.add(filename)
+                entry = self.find(filename)
+                if entry is None:
+                    break
+                record = (entry.get("checksums") or {}).get(filename)
+                if record is not None:
+                    checksums[filename] = record
+                filename = entry.get("base")
+        return checksums
+
+    def snapshot(self) -> dict[str, list[dict]]:
+        """Return a copy of all backups by dashboard, oldest first."""
+        with self._lock:
+            return {
+                dashboard_id: list(entries)
+                for dashboard_id, entries in self._backups.items()
+                if entries
+            }
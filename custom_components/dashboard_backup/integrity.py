@@ -0,0 +1,112 @@
+"""Backup integrity checks for Dashboard Backup.
+
+Every file a backup writes is recorded in the backup index with the SHA-256
+and length of its bytes on disk. Reads that feed a restore are hashed as
+they stream, and a mismatch raises ``CorruptBackupError`` before the
+restored data is put in place. Blobs of the object store are named by their
+hash and are checked against it whenever they are read.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import hashlib
+import os
+from typing import IO, Iterator
+
+from .compression import (
+    CHUNK_SIZE,
+    compressing_writer,
+    decompressing_reader,
+    detect_compression,
+)
+from .storage_io import atomic_writer
+
+
+class CorruptBackupError(ValueError):
+    """A backup file does not match its recorded checksum."""
+
+
+def checksum(data: bytes) -> dict:
+    """Return the checksum record of a file's content."""
+    return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+def verify_bytes(data: bytes, expected: dict | None, name: str) -> None:
+    """Check a file's content against its checksum record, if there is one."""
+    if expected is not None and checksum(data) != expected:
+        raise CorruptBackupError(f"Backup file {name} is corrupt (checksum mismatch)")
+
+
+class HashingWriter:
+    """File wrapper hashing the bytes written through it."""
+
+    def __init__(self, raw: IO[bytes]) -> None:
+        """Wrap a file opened for writing."""
+        self.raw = raw
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        """Write and hash bytes."""
+        self._hash.update(data)
+        self.size += len(data)
+        return self.raw.write(data)
+
+    def flush(self) -> None:
+        """Flush the wrapped file."""
+        self.raw.flush()
+
+    def checksum(self) -> dict:
+        """Return the checksum record of everything written."""
+        return {"sha256": self._hash.hexdigest(), "size": self.size}
+
+
+class HashingReader:
+    """File wrapper hashing the bytes read through it."""
+
+    def __init__(self, raw: IO[bytes]) -> None:
+        """Wrap a file opened for reading."""
+        self.raw = raw
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        """Read and hash bytes."""
+        data = self.raw.read(size)
+        self._hash.update(data)
+        self.size += len(data)
+        return data
+
+    def checksum(self) -> dict:
+        """Read to the end and return the checksum record of the whole file."""
+        while self.read(CHUNK_SIZE):
+            pass
+        return {"sha256": self._hash.hexdigest(), "size": self.size}
+
+
+def write_with_checksum(path: str, data: bytes, codec: str | None, level: int) -> dict:
+    """Atomically write bytes through a codec and return the checksum of the file written."""
+    with atomic_writer(path) as raw:
+        writer = HashingWriter(raw)
+        with compressing_writer(writer, codec, level) as f:
+            f.write(data)
+    return writer.checksum()
+
+
+@contextmanager
+def open_verified(path: str, expected: dict | None = None) -> Iterator[IO[bytes]]:
+    """Open a backup for reading, decompressing and hashing as it streams.
+
+    When the block ends without an error, the file is checked against the
+    expected checksum record, so a caller writing the content elsewhere can
+    still discard it. Without a record, only the codec's own checks apply.
+    """
+    codec = detect_compression(path)
+    with open(path, "rb") as raw:
+        reader = HashingReader(raw)
+        with decompressing_reader(reader, codec) as stream:
+            yield stream
+        if expected is not None and reader.checksum() != expected:
+            raise CorruptBackupError(
+                f"Backup file {os.path.basename(path)} is corrupt (checksum mismatch)"
+            )
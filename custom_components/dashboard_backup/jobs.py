@@ -0,0 +1,214 @@
+"""Background job queue for Dashboard Backup.
+
+Services called in job mode return a job id straight away and their work is
+queued here. A small pool of workers takes jobs in priority order, restores
+before backups and backups before batches, and in submission order within a
+priority. Every change of a job's status or progress fires a progress event
+and a finished job fires a completion event. Events end up in the recorder,
+so they carry a short summary of the job, with result lists reduced to
+their lengths; the ``get_job`` service returns the full description. Finished
+jobs are remembered until newer ones push them out of the history.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import count
+import logging
+from typing import Awaitable, Callable
+import uuid
+
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_DASHBOARD_ID,
+    ATTR_JOB_ID,
+    DOMAIN,
+    EVENT_JOB_COMPLETED,
+    EVENT_JOB_PROGRESS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+JOB_BACKUP = "backup"
+JOB_RESTORE = "restore"
+JOB_BACKUP_ALL = "backup_all"
+
+# Lower runs first
+JOB_PRIORITIES = {JOB_RESTORE: 0, JOB_BACKUP: 1, JOB_BACKUP_ALL: 2}
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+# Work of a job: called with a progress callback taking a fraction from 0 to 1
+JobWork = Callable[[Callable[[float], None]], Awaitable[dict]]
+
+
+@dataclass
+class Job:
+    """A queued, running or finished job."""
+
+    job_id: str
+    job_type: str
+    dashboard_id: str | None
+    status: str = STATUS_QUEUED
+    progress: float = 0.0
+    created: datetime = field(default_factory=dt_util.utcnow)
+    started: datetime | None = None
+    finished: datetime | None = None
+    result: dict | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        """Return the public description of the job."""
+        return {
+            ATTR_JOB_ID: self.job_id,
+            "type": self.job_type,
+            ATTR_DASHBOARD_ID: self.dashboard_id,
+            "status": self.status,
+            "progress": self.progress,
+            "created": self.created.isoformat(),
+            "started": self.started.isoformat() if self.started else None,
+            "finished": self.finished.isoformat() if self.finished else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+    def summary(self) -> dict:
+        """Return the short description carried by job events."""
+        summary = None
+        if self.result is not None:
+            summary = {
+                key: len(value) if isinstance(value, (list, dict)) else value
+                for key, value in self.result.items()
+            }
+        return {
+            ATTR_JOB_ID: self.job_id,
+            "type": self.job_type,
+            ATTR_DASHBOARD_ID: self.dashboard_id,
+            "status": self.status,
+            "progress": self.progress,
+            "summary": summary,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Priority queue of jobs run by a pool of workers."""
+
+    def __init__(self, hass: HomeAssistant, workers: int, history: int) -> None:
+        """Initialize the queue.
+
+        ``history`` is the number of finished jobs remembered.
+        """
+        self.hass = hass
+        self.workers = workers
+        self.history = history
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        # Breaks priority ties in submission order
+        self._sequence = count()
+        self._work: dict[str, JobWork] = {}
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._finished = 0
+        self._tasks: list[asyncio.Task] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start the workers."""
+        for number in range(self.workers):
+            # Background tasks were added in Home Assistant 2023.4 and do not delay startup
+            if hasattr(self.hass, "async_create_background_task"):
+                task = self.hass.async_create_background_task(
+                    self._async_worker(), f"{DOMAIN}_job_worker_{number}"
+                )
+            else:
+                task = self.hass.async_create_task(self._async_worker())
+            self._tasks.append(task)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the workers, abandoning queued jobs."""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    @callback
+    def async_submit(self, job_type: str, dashboard_id: str | None, work: JobWork) -> Job:
+        """Queue a job and return it."""
+        job = Job(uuid.uuid4().hex, job_type, dashboard_id)
+        self._jobs[job.job_id] = job
+        self._work[job.job_id] = work
+        self._queue.put_nowait((JOB_PRIORITIES[job_type], next(self._sequence), job.job_id))
+        self._async_fire_progress(job)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Return a job by id, if it is still remembered."""
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        """Return every remembered job, newest first."""
+        return list(reversed(self._jobs.values()))
+
+    @callback
+    def _async_fire_progress(self, job: Job) -> None:
+        """Announce a job's status and progress."""
+        self.hass.bus.async_fire(EVENT_JOB_PROGRESS, job.summary())
+
+    async def _async_worker(self) -> None:
+        """Run queued jobs one at a time."""
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await self._async_run(self._jobs[job_id], self._work.pop(job_id))
+            finally:
+                self._queue.task_done()
+
+    async def _async_run(self, job: Job, work: JobWork) -> None:
+        """Run a job and record its outcome."""
+        job.status = STATUS_RUNNING
+        job.started = dt_util.utcnow()
+        self._async_fire_progress(job)
+
+        @callback
+        def report(progress: float) -> None:
+            job.progress = round(min(max(progress, 0.0), 1.0), 3)
+            self._async_fire_progress(job)
+
+        try:
+            job.result = await work(report)
+        except asyncio.CancelledError:
+            job.status = STATUS_FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as ex:  # pylint: disable=broad-except
+            # The work has already logged and announced its own failure
+            job.status = STATUS_FAILED
+            job.error = str(ex)
+        else:
+            job.status = STATUS_COMPLETED
+            job.progress = 1.0
+        finally:
+            job.finished = dt_util.utcnow()
+            self._async_finished()
+
+        self._async_fire_progress(job)
+        self.hass.bus.async_fire(EVENT_JOB_COMPLETED, job.summary())
+
+    @callback
+    def _async_finished(self) -> None:
+        """Forget the oldest finished jobs beyond the history size."""
+        self._finished += 1
+        if self._finished <= self.history:
+            return
+        for job_id, job in list(self._jobs.items()):
+            if job.finished is not None:
+                del self._jobs[job_id]
+                self._finished -= 1
+                if self._finished <= self.history:
+                    return
@@ -0,0 +1,189 @@
+"""Content-addressed object store for Dashboard Backup.
+
+Deduplicated backups split a dashboard into blobs named by the SHA-256 of
+their content and kept under ``objects/`` in the backup directory:
+
+* one blob per card,
+* one blob per view, with its cards replaced by their hashes,
+* one tree blob holding the storage envelope, the top level config and the
+  list of view hashes.
+
+A backup is then a tiny manifest that points at a tree. Unchanged views and
+cards are shared between snapshots, and an unchanged dashboard only costs a
+new manifest. All functions here block and run in the executor.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import Any, Callable
+
+from .integrity import CorruptBackupError, verify_bytes
+from .serialization import dumps_json, loads_json
+from .storage_io import atomic_writer, list_dir, make_dirs, read_bytes
+
+OBJECTS_DIR = "objects"
+MANIFEST_FORMAT = "dashboard_backup.manifest"
+MANIFEST_VERSION = 1
+MANIFEST_EXTENSION = ".manifest.json"
+
+
+def encode_object(obj: Any) -> bytes:
+    """Serialise an object compactly, keeping its key order."""
+    return dumps_json(obj)
+
+
+def hash_object(obj: Any) -> str:
+    """Return the hash an object is stored under."""
+    return hashlib.sha256(encode_object(obj)).hexdigest()
+
+
+def object_path(full_backup_path: str, digest: str) -> str:
+    """Return the path of a blob, fanned out by the first two hex digits."""
+    return os.path.join(full_backup_path, OBJECTS_DIR, digest[:2], digest[2:])
+
+
+def put_object(full_backup_path: str, obj: Any) -> str:
+    """Store an object if it is not already present and return its hash."""
+    data = encode_object(obj)
+    digest = hashlib.sha256(data).hexdigest()
+    path = object_path(full_backup_path, digest)
+    try:
+        # Mark the blob as in use so a concurrent garbage collection keeps it
+        os.utime(path)
+        return digest
+    except FileNotFoundError:
+        pass
+    make_dirs(os.path.dirname(path))
+    # Each writer has its own temporary file, so backups storing the same
+    # blob at once never share one; blobs are named by their content, so
+    # whichever replaces the other writes the same bytes
+    with atomic_writer(path) as f:
+        f.write(data)
+    return digest
+
+
+def verify_object(full_backup_path: str, digest: str) -> bytes:
+    """Read a blob and check it against the hash it is named by."""
+    data = read_bytes(object_path(full_backup_path, digest))
+    if hashlib.sha256(data).hexdigest() != digest:
+        raise CorruptBackupError(f"Backup object {digest} is corrupt (checksum mismatch)")
+    return data
+
+
+def get_object(full_backup_path: str, digest: str) -> Any:
+    """Load an object by hash, verifying its content."""
+    return loads_json(verify_object(full_backup_path, digest))
+
+
+def split_snapshot(storage_data: dict, put: Callable[[Any], str]) -> dict:
+    """Split a parsed storage file into blobs and return its tree.
+
+    ``put`` stores a blob and returns its hash.
+    """
+    envelope = {key: value for key, value in storage_data.items() if key != "data"}
+    config = storage_data.get("data", {})
+
+    # Lists that are split out are left as None placeholders so the
+    # original key order survives the round trip
+    views = None
+    if isinstance(config, dict) and isinstance(config.get("views"), list):
+        config = dict(config)
+        views = []
+        for view in config["views"]:
+            entry = {}
+            if isinstance(view, dict) and isinstance(view.get("cards"), list):
+                view = dict(view)
+                entry["cards"] = [put(card) for card in view["cards"]]
+                view["cards"] = None
+            entry["view"] = put(view)
+            views.append(entry)
+        config["views"] = None
+
+    return {"storage": envelope, "config": config, "views": views}
+
+
+def put_snapshot(full_backup_path: str, storage_data: dict) -> str:
+    """Store a parsed storage file as a tree of blobs and return the tree hash."""
+    tree = split_snapshot(storage_data, lambda obj: put_object(full_backup_path, obj))
+    return put_object(full_backup_path, tree)
+
+
+def get_snapshot(full_backup_path: str, tree_hash: str) -> dict:
+    """Rebuild a parsed storage file from its tree hash."""
+    tree = get_object(full_backup_path, tree_hash)
+    config = tree["config"]
+
+    if tree["views"] is not None:
+        views = []
+        for entry in tree["views"]:
+            view = get_object(full_backup_path, entry["view"])
+            if "cards" in entry:
+                view["cards"] = [
+                    get_object(full_backup_path, digest) for digest in entry["cards"]
+                ]
+            views.append(view)
+        config["views"] = views
+
+    return {**tree["storage"], "data": config}
+
+
+def build_manifest(tree_hash: str) -> bytes:
+    """Return the manifest content for a stored snapshot."""
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "version": MANIFEST_VERSION,
+        "tree": tree_hash,
+    }
+    return dumps_json(manifest, indent=True)
+
+
+def read_manifest(path: str, expected: dict | None = None) -> dict:
+    """Load and validate a backup manifest, checking it against a checksum record."""
+    content = read_bytes(path)
+    verify_bytes(content, expected, os.path.basename(path))
+    manifest = loads_json(content)
+    if manifest.get("format") != MANIFEST_FORMAT:
+        raise ValueError(f"{path} is not a dashboard backup manifest")
+    return manifest
+
+
+def referenced_objects(full_backup_path: str, tree_hash: str) -> set[str]:
+    """Return every blob hash reachable from a tree."""
+    tree = get_object(full_backup_path, tree_hash)
+    digests = {tree_hash}
+    for entry in tree["views"] or []:
+        digests.add(entry["view"])
+        digests.update(entry.get("cards", []))
+    return digests
+
+
+def collect_garbage(full_backup_path: str, live_trees: set[str], started: float) -> int:
+    """Delete blobs not reachable from any live tree and return how many.
+
+    Blobs written or reused since ``started`` (a ``time.time()`` value) are
+    kept, so a backup running alongside never loses its objects.
+    """
+    live = set()
+    for tree_hash in live_trees:
+        try:
+            live |= referenced_objects(full_backup_path, tree_hash)
+        except FileNotFoundError:
+            continue
+
+    removed = 0
+    objects_dir = os.path.join(full_backup_path, OBJECTS_DIR)
+    for fan_out in list_dir(objects_dir):
+        fan_out_dir = os.path.join(objects_dir, fan_out)
+        for name in list_dir(fan_out_dir):
+            path = os.path.join(fan_out_dir, name)
+            if name.endswith(".tmp") or f"{fan_out}{name}" in live:
+                continue
+            try:
+                if os.path.getmtime(path) >= started:
+                    continue
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+    return removed
@@ -0,0 +1,141 @@
+"""Partial restores for Dashboard Backup.
+
+Instead of replacing a whole dashboard, one view, or one card inside a view,
+is copied from a backup into the current configuration; everything else is
+left as it is.
+
+A view is identified by its path or by its index. A card is identified by a
+dotted path of indexes: ``"2"`` is the third card of the view and ``"2.0"``
+the first card inside it (the cards of a stack). In a sections view the
+first index selects the section, so ``"1.3"`` is the fourth card of the
+second section.
+"""
+from __future__ import annotations
+
+import copy
+import os
+from typing import Any
+
+from .integrity import open_verified
+from .pipeline import is_json_backup, load_storage_data
+from .serialization import load_yaml, loads_json
+from .storage_io import read_bytes
+
+
+def find_view(views: list, view: str) -> int | None:
+    """Return the index of the view with the given path or index."""
+    if view.isdigit():
+        index = int(view)
+        return index if index < len(views) else None
+    for index, view_config in enumerate(views):
+        if isinstance(view_config, dict) and view_config.get("path") == view:
+            return index
+    return None
+
+
+def parse_card_path(card: str) -> list[int]:
+    """Turn a dotted card path such as ``"2.0"`` into indexes."""
+    segments = card.split(".")
+    if not all(segment.isdigit() for segment in segments):
+        raise ValueError(f"Invalid card path '{card}'")
+    return [int(segment) for segment in segments]
+
+
+def _locate(view_config: dict, path: list[int], card: str) -> tuple[list, int]:
+    """Return the list holding the card at path, and the card's index in it."""
+    node: Any = view_config
+    for depth, index in enumerate(path):
+        key = "sections" if depth == 0 and "sections" in view_config else "cards"
+        children = node.get(key) if isinstance(node, dict) else None
+        if not isinstance(children, list) or (
+            depth < len(path) - 1 and index >= len(children)
+        ):
+            break
+        if depth == len(path) - 1:
+            return children, index
+        node = children[index]
+    raise ValueError(f"Card '{card}' not found")
+
+
+def merge_subtree(current: dict, backup: dict, view: str, card: str | None = None) -> dict | None:
+    """Return the current configuration with one view or card taken from a backup.
+
+    Returns None if the current configuration already matches the backup.
+    The current configuration is not modified.
+    """
+    backup_views = backup.get("views") or []
+    backup_index = find_view(backup_views, view)
+    if backup_index is None:
+        raise ValueError(f"View '{view}' not found in the backup")
+    restored_view = backup_views[backup_index]
+
+    views = list(current.get("views") or [])
+    merged = {**current, "views": views}
+    index = find_view(views, view)
+
+    if card is None:
+        if index is None:
+            # The view was deleted, put it back where it was
+            views.insert(min(backup_index, len(views)), restored_view)
+        elif views[index] == restored_view:
+            return None
+        else:
+            views[index] = restored_view
+        return merged
+
+    if index is None:
+        raise ValueError(f"View '{view}' not found in the dashboard")
+    path = parse_card_path(card)
+    cards, card_index = _locate(restored_view, path, card)
+    if card_index >= len(cards):
+        raise ValueError(f"Card '{card}' not found in the backup")
+    restored_card = cards[card_index]
+
+    # Only the view that changes is copied
+    view_config = copy.deepcopy(views[index])
+    cards, card_index = _locate(view_config, path, card)
+    if card_index < len(cards):
+        if cards[card_index] == restored_card:
+            return None
+        cards[card_index] = restored_card
+    elif card_index == len(cards):
+        # The card was deleted from the end of its list
+        cards.append(restored_card)
+    else:
+        raise ValueError(f"Card '{card}' not found in the dashboard")
+    views[index] = view_config
+    return merged
+
+
+def load_backup_config(
+    full_backup_path: str, backup_file: str, checksums: dict[str, dict] | None = None
+) -> dict:
+    """Return the dashboard configuration held by a backup.
+
+    Files with a record in ``checksums`` are verified as they are read.
+    Runs in the executor.
+    """
+    if is_json_backup(backup_file):
+        return load_storage_data(full_backup_path, backup_file, checksums).get("data", {})
+    with open_verified(
+        os.path.join(full_backup_path, backup_file), (checksums or {}).get(backup_file)
+    ) as f:
+        return load_yaml(f.read()) or {}
+
+
+def merge_backup_subtree(
+    full_backup_path: str,
+    backup_file: str,
+    storage_file: str,
+    view: str,
+    card: str | None = None,
+    checksums: dict[str, dict] | None = None,
+) -> dict | None:
+    """Merge a view or card of a backup into a dashboard's storage file config.
+
+    Returns the merged configuration, or None if nothing differs. Runs in
+    the executor.
+    """
+    current = loads_json(read_bytes(storage_file)).get("data", {})
+    backup = load_backup_config(full_backup_path, backup_file, checksums)
+    return merge_subtree(current, backup, view, card)
@@ -0,0 +1,324 @@
+"""Backup pipeline for Dashboard Backup.
+
+A dashboard's storage file is read exactly once into a snapshot. Each output
+format is a stage that turns that snapshot into file content, so adding a
+format never adds another read or parse of the source. The backup mode
+decides which formats are written.
+
+Incremental mode is handled separately: it writes a delta against the
+previous backup of the dashboard, with a full snapshot every few runs.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import hashlib
+import os
+import shutil
+from typing import Any, Callable
+
+from .compression import (
+    CHUNK_SIZE,
+    COMPRESSION_EXTENSIONS,
+    compressed_name,
+    strip_compression_extension,
+)
+from .const import (
+    BACKUP_MODE_DEDUPLICATED,
+    BACKUP_MODE_FULL,
+    DEFAULT_BACKUP_FORMATS,
+    DEFAULT_COMPRESSION_LEVEL,
+)
+from .delta import DELTA_EXTENSION, apply, build_delta, diff, parse_delta
+from .index import backup_references
+from .integrity import open_verified, write_with_checksum
+from .object_store import (
+    MANIFEST_EXTENSION,
+    build_manifest,
+    get_snapshot,
+    put_snapshot,
+    read_manifest,
+)
+from .serialization import dump_yaml, dumps_json, loads_json
+from .storage_io import atomic_writer, read_bytes, write_bytes_atomic
+
+# A stage receives the snapshot and the backup directory it is written to
+FormatStage = Callable[["Snapshot", str], bytes]
+
+# Registered output formats: name -> (file extension, stage)
+BACKUP_FORMATS: dict[str, tuple[str, FormatStage]] = {}
+
+# Formats that are written through the configured compression codec
+COMPRESSIBLE_FORMATS = {"json", "delta"}
+
+# Formats written for each backup mode
+MODE_FORMATS = {
+    BACKUP_MODE_FULL: DEFAULT_BACKUP_FORMATS,
+    BACKUP_MODE_DEDUPLICATED: ["manifest"],
+}
+
+
+@dataclass
+class Snapshot:
+    """A single read of a dashboard storage file."""
+
+    raw: bytes
+    storage_data: dict = field(init=False)
+
+    def __post_init__(self) -> None:
+        """Parse the raw buffer once."""
+        self.storage_data = loads_json(self.raw)
+
+    @property
+    def config(self) -> Any:
+        """Return the Lovelace configuration held in the storage file."""
+        return self.storage_data.get("data", {})
+
+    @property
+    def digest(self) -> str:
+        """Return the SHA-256 of the storage file content."""
+        return hashlib.sha256(self.raw).hexdigest()
+
+
+def backup_format(name: str, extension: str) -> Callable[[FormatStage], FormatStage]:
+    """Register a stage that renders a snapshot in an output format."""
+
+    def decorator(stage: FormatStage) -> FormatStage:
+        BACKUP_FORMATS[name] = (extension, stage)
+        return stage
+
+    return decorator
+
+
+@backup_format("json", ".json")
+def _json_stage(snapshot: Snapshot, full_backup_path: str) -> bytes:
+    """Return the storage file exactly as it was read."""
+    return snapshot.raw
+
+
+@backup_format("yaml", ".yaml")
+def _yaml_stage(snapshot: Snapshot, full_backup_path: str) -> bytes:
+    """Render the dashboard configuration as human readable YAML."""
+    return dump_yaml(snapshot.config).encode("utf-8")
+
+
+@backup_format("manifest", MANIFEST_EXTENSION)
+def _manifest_stage(snapshot: Snapshot, full_backup_path: str) -> bytes:
+    """Store the snapshot in the object store and point a manifest at it."""
+    return build_manifest(put_snapshot(full_backup_path, snapshot.storage_data))
+
+
+def read_snapshot(storage_file: str) -> Snapshot:
+    """Read and parse a storage file. Runs in the executor."""
+    return Snapshot(read_bytes(storage_file))
+
+
+def write_backup(
+    snapshot: Snapshot,
+    full_backup_path: str,
+    base_name: str,
+    formats: list[str] | None = None,
+    compression: str | None = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> tuple[dict[str, str], dict[str, dict]]:
+    """Write a snapshot in each requested format. Runs in the executor.
+
+    Returns a mapping of format name to the filename that was written, and
+    the checksum of each file written.
+    """
+    written = {}
+    checksums = {}
+    for name in formats or DEFAULT_BACKUP_FORMATS:
+        extension, stage = BACKUP_FORMATS[name]
+        codec = compression if name in COMPRESSIBLE_FORMATS else None
+        filename = compressed_name(f"{base_name}{extension}", codec)
+        checksums[filename] = write_with_checksum(
+            os.path.join(full_backup_path, filename),
+            stage(snapshot, full_backup_path),
+            codec,
+            compression_level,
+        )
+        written[name] = filename
+    return written, checksums
+
+
+def _index_entry(
+    snapshot: Snapshot,
+    full_backup_path: str,
+    written: dict[str, str],
+    checksums: dict[str, dict],
+    compression: str | None,
+) -> dict:
+    """Describe a written backup for the backup index."""
+    backup_format, filename = next(iter(written.items()))
+    if backup_format not in COMPRESSIBLE_FORMATS or compression not in COMPRESSION_EXTENSIONS:
+        compression = None
+    return {
+        "file": filename,
+        "files": sorted(written.values()),
+        "format": backup_format,
+        "compression": compression,
+        "size": sum(record["size"] for record in checksums.values()),
+        "checksums": checksums,
+        "hash": snapshot.digest,
+        "bytes_read": len(snapshot.raw),
+        **backup_references(full_backup_path, backup_format, filename),
+    }
+
+
+def create_backup_files(
+    storage_file: str,
+    full_backup_path: str,
+    base_name: str,
+    formats: list[str] | None = None,
+    compression: str | None = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> dict:
+    """Read a storage file once and write it in every requested format.
+
+    Returns the backup's index entry, without its timestamp.
+    """
+    snapshot = read_snapshot(storage_file)
+    written, checksums = write_backup(
+        snapshot,
+        full_backup_path,
+        base_name,
+        formats,
+        compression,
+        compression_level,
+    )
+    return _index_entry(snapshot, full_backup_path, written, checksums, compression)
+
+
+def is_json_backup(backup_file: str) -> bool:
+    """Return True for JSON, manifest and delta backups, compressed or not."""
+    return strip_compression_extension(backup_file).endswith(".json")
+
+
+def is_delta_backup(backup_file: str) -> bool:
+    """Return True for delta backups, compressed or not."""
+    return strip_compression_extension(backup_file).endswith(DELTA_EXTENSION)
+
+
+def backup_chain(
+    full_backup_path: str, backup_file: str, checksums: dict[str, dict] | None = None
+) -> tuple[str, list[dict]]:
+    """Follow delta backups back to their full snapshot.
+
+    Returns the full snapshot filename and the deltas to apply to it, oldest
+    first. Deltas with a record in ``checksums`` are verified.
+    """
+    checksums = checksums or {}
+    deltas = []
+    while is_delta_backup(backup_file):
+        with open_verified(
+            os.path.join(full_backup_path, backup_file), checksums.get(backup_file)
+        ) as f:
+            content = f.read()
+        delta = parse_delta(content)
+        deltas.append(delta)
+        backup_file = delta["base"]
+    deltas.reverse()
+    return backup_file, deltas
+
+
+def load_storage_data(
+    full_backup_path: str, backup_file: str, checksums: dict[str, dict] | None = None
+) -> dict:
+    """Return the parsed storage file held by a JSON, manifest or delta backup.
+
+    Files with a record in ``checksums`` are verified as they are read.
+    """
+    return _rebuild(
+        full_backup_path, *backup_chain(full_backup_path, backup_file, checksums), checksums
+    )
+
+
+def _rebuild(
+    full_backup_path: str,
+    base_file: str,
+    deltas: list[dict],
+    checksums: dict[str, dict] | None = None,
+) -> dict:
+    """Load a full snapshot and apply a delta chain to it."""
+    path = os.path.join(full_backup_path, base_file)
+    expected = (checksums or {}).get(base_file)
+    if base_file.endswith(MANIFEST_EXTENSION):
+        storage_data = get_snapshot(full_backup_path, read_manifest(path, expected)["tree"])
+    else:
+        with open_verified(path, expected) as f:
+            storage_data = loads_json(f.read())
+    for delta in deltas:
+        storage_data = apply(storage_data, delta["ops"])
+    return storage_data
+
+
+def restore_storage_file(
+    full_backup_path: str,
+    backup_file: str,
+    storage_file: str,
+    checksums: dict[str, dict] | None = None,
+) -> None:
+    """Write the storage file held by a JSON, manifest or delta backup.
+
+    The storage file is replaced atomically, and only once every file read
+    has matched its record in ``checksums``. Plain JSON backups are streamed
+    through their codec straight into the replacement file.
+    """
+    if backup_file.endswith(MANIFEST_EXTENSION) or is_delta_backup(backup_file):
+        storage_data = load_storage_data(full_backup_path, backup_file, checksums)
+        write_bytes_atomic(storage_file, dumps_json(storage_data, indent=True))
+        return
+
+    with atomic_writer(storage_file) as dst:
+        with open_verified(
+            os.path.join(full_backup_path, backup_file), (checksums or {}).get(backup_file)
+        ) as src:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def create_incremental_backup_files(
+    storage_file: str,
+    full_backup_path: str,
+    base_name: str,
+    previous_file: str | None,
+    full_backup_interval: int,
+    compression: str | None = None,
+    compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> dict:
+    """Write a delta against the previous backup, or a full snapshot.
+
+    A full snapshot is written when there is no usable previous backup or
+    when the previous chain already holds ``full_backup_interval`` backups.
+    Returns the backup's index entry, without its timestamp.
+    """
+    snapshot = read_snapshot(storage_file)
+
+    if previous_file and is_json_backup(previous_file):
+        base_file, deltas = backup_chain(full_backup_path, previous_file)
+        if len(deltas) + 1 < full_backup_interval:
+            previous_data = _rebuild(full_backup_path, base_file, deltas)
+            ops = diff(previous_data, snapshot.storage_data)
+            filename = compressed_name(f"{base_name}{DELTA_EXTENSION}", compression)
+            record = write_with_checksum(
+                os.path.join(full_backup_path, filename),
+                build_delta(previous_file, ops),
+                compression,
+                compression_level,
+            )
+            return _index_entry(
+                snapshot,
+                full_backup_path,
+                {"delta": filename},
+                {filename: record},
+                compression,
+            )
+
+    written, checksums = write_backup(
+        snapshot,
+        full_backup_path,
+        base_name,
+        DEFAULT_BACKUP_FORMATS,
+        compression,
+        compression_level,
+    )
+    return _index_entry(snapshot, full_backup_path, written, checksums, compression)
@@ -0,0 +1,114 @@
+"""Dashboard storage file resolver for Dashboard Backup.
+
+Maps dashboard ids to their ``.storage/lovelace*`` files. The map is built
+from a single scan of ``.storage`` plus the Lovelace dashboards registry and
+is cached until the directory's mtime changes (Home Assistant replaces
+storage files atomically, so any create, delete or save touches it) or the
+cache is invalidated explicitly, e.g. on a ``lovelace_updated`` event.
+
+Every dashboard is reachable by its storage id (``dashboard_kitchen``), the
+id without the ``dashboard_`` prefix (``kitchen``) and its URL path
+(``dashboard-kitchen``). Only exact matches resolve.
+
+Methods block and run in the executor.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+from .serialization import loads_json
+from .storage_io import list_dir, read_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+MAIN_DASHBOARD = "lovelace"
+DASHBOARDS_REGISTRY = "lovelace_dashboards"
+_STORAGE_PREFIX = "lovelace."
+
+
+class StoragePathResolver:
+    """Cached map of dashboard ids to storage files."""
+
+    def __init__(self, config_dir: str) -> None:
+        """Initialize the resolver."""
+        self.storage_dir = os.path.join(config_dir, ".storage")
+        self._dashboards: dict[str, str] = {}
+        self._aliases: dict[str, str] = {}
+        self._mtime: int | None = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """Force the next lookup to rescan .storage."""
+        with self._lock:
+            self._mtime = None
+
+    def _refresh(self) -> None:
+        """Rescan .storage if it changed since the last scan."""
+        try:
+            mtime = os.stat(self.storage_dir).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime == self._mtime:
+            return
+
+        dashboards = {}
+        for file in list_dir(self.storage_dir):
+            if file == MAIN_DASHBOARD:
+                dashboards[MAIN_DASHBOARD] = os.path.join(self.storage_dir, file)
+            elif file.startswith(_STORAGE_PREFIX):
+                dashboards[file[len(_STORAGE_PREFIX):]] = os.path.join(self.storage_dir, file)
+
+        aliases = {}
+        for dashboard_id in dashboards:
+            if dashboard_id.startswith("dashboard_"):
+                aliases.setdefault(dashboard_id[len("dashboard_"):], dashboard_id)
+        for dashboard_id, url_path in self._read_registry().items():
+            if dashboard_id in dashboards and url_path:
+                aliases[url_path] = dashboard_id
+        # Canonical ids always win over aliases
+        for dashboard_id in dashboards:
+            aliases.pop(dashboard_id, None)
+
+        self._dashboards = dashboards
+        self._aliases = aliases
+        self._mtime = mtime
+        _LOGGER.debug("Resolved %d dashboard storage files", len(dashboards))
+
+    def _read_registry(self) -> dict[str, str]:
+        """Return storage id -> URL path from the dashboards registry."""
+        try:
+            registry = loads_json(
+                read_bytes(os.path.join(self.storage_dir, DASHBOARDS_REGISTRY))
+            )
+            return {
+                item["id"]: item.get("url_path")
+                for item in registry.get("data", {}).get("items", [])
+                if "id" in item
+            }
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError, AttributeError) as ex:
+            _LOGGER.debug("Could not read the Lovelace dashboards registry: %s", str(ex))
+            return {}
+
+    def resolve(self, dashboard_id: str) -> str | None:
+        """Return the storage file of a dashboard, or None if unknown."""
+        with self._lock:
+            self._refresh()
+            dashboard_id = self._aliases.get(dashboard_id, dashboard_id)
+            return self._dashboards.get(dashboard_id)
+
+    def dashboard_id(self, dashboard_id: str) -> str | None:
+        """Return the storage id a dashboard id or alias refers to, or None."""
+        with self._lock:
+            self._refresh()
+            dashboard_id = self._aliases.get(dashboard_id, dashboard_id)
+            return dashboard_id if dashboard_id in self._dashboards else None
+
+    def dashboards(self) -> dict[str, str]:
+        """Return every dashboard's storage id and storage file."""
+        with self._lock:
+            self._refresh()
+            return dict(self._dashboards)
@@ -0,0 +1,323 @@
+"""Retention policies for Dashboard Backup.
+
+A policy decides which backups of each dashboard are kept:
+
+* ``keep_last`` keeps the newest N backups,
+* ``daily``, ``weekly`` and ``monthly`` keep the newest backup of each of the
+  last N days, ISO weeks and months that have backups
+  (grandfather-father-son),
+* ``max_bytes`` then deletes the oldest remaining backups, across all
+  dashboards, until the backup directory fits. Deduplicated backups count
+  their manifest plus the objects no remaining backup shares.
+
+A rule set to 0 is disabled, and without any count rule every backup is
+kept. The newest backup of a dashboard is never deleted, and an incremental
+delta always keeps the chain it was built on.
+
+Pruning runs as a background task: the plan is computed in the executor,
+files are deleted in small batches, and unreferenced deduplication objects
+are garbage collected afterwards.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+import logging
+import os
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .const import PRUNE_BATCH_SIZE, TIMESTAMP_FORMAT
+from .index import BackupIndex, backup_references
+from .object_store import collect_garbage, object_path, referenced_objects
+from .storage_io import async_run
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """How many backups to keep."""
+
+    keep_last: int = 0
+    daily: int = 0
+    weekly: int = 0
+    monthly: int = 0
+    max_bytes: int = 0
+
+    @property
+    def counts_enabled(self) -> bool:
+        """Return True if any count rule is set."""
+        return any((self.keep_last, self.daily, self.weekly, self.monthly))
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the policy can delete anything."""
+        return self.counts_enabled or self.max_bytes > 0
+
+
+def _day(timestamp: datetime) -> tuple:
+    return (timestamp.year, timestamp.month, timestamp.day)
+
+
+def _week(timestamp: datetime) -> tuple:
+    return tuple(timestamp.isocalendar()[:2])
+
+
+def _month(timestamp: datetime) -> tuple:
+    return (timestamp.year, timestamp.month)
+
+
+def _select(entries: list[dict], policy: RetentionPolicy) -> set[str]:
+    """Return the files kept by the count rules, given entries newest first."""
+    keep = {entries[0]["file"]}
+    keep.update(entry["file"] for entry in entries[: policy.keep_last])
+
+    parsed = [
+        (entry, datetime.strptime(entry["timestamp"], TIMESTAMP_FORMAT))
+        for entry in entries
+    ]
+    for count, bucket in (
+        (policy.daily, _day),
+        (policy.weekly, _week),
+        (policy.monthly, _month),
+    ):
+        if not count:
+            continue
+        seen = set()
+        for entry, timestamp in parsed:
+            key = bucket(timestamp)
+            if key in seen:
+                continue
+            if len(seen) == count:
+                break
+            seen.add(key)
+            keep.add(entry["file"])
+    return keep
+
+
+def _base_of(full_backup_path: str, entry: dict) -> str | None:
+    """Return the file a delta was built on, reading it for older indexes."""
+    if entry["format"] != "delta":
+        return None
+    if "base" not in entry:
+        try:
+            return backup_references(full_backup_path, "delta", entry["file"])["base"]
+        except (OSError, ValueError, KeyError):
+            return None
+    return entry["base"]
+
+
+def _tree_of(full_backup_path: str, entry: dict) -> str | None:
+    """Return the tree a manifest points at, reading it for older indexes."""
+    if entry["format"] != "manifest":
+        return None
+    if entry.get("tree") is None:
+        try:
+            return backup_references(full_backup_path, "manifest", entry["file"])["tree"]
+        except (OSError, ValueError, KeyError):
+            return None
+    return entry["tree"]
+
+
+class _ObjectUsage:
+    """Bytes of the object store still referenced by the kept manifests."""
+
+    def __init__(self, full_backup_path: str) -> None:
+        self.full_backup_path = full_backup_path
+        self.total = 0
+        self._trees: dict[str, int] = {}
+        self._objects: dict[str, int] = {}
+        self._contents: dict[str, set[str]] = {}
+        self._sizes: dict[str, int] = {}
+
+    def _tree_objects(self, tree: str) -> set[str]:
+        if tree not in self._contents:
+            try:
+                self._contents[tree] = referenced_objects(self.full_backup_path, tree)
+            except (OSError, ValueError, KeyError, TypeError):
+                self._contents[tree] = set()
+        return self._contents[tree]
+
+    def _size(self, digest: str) -> int:
+        if digest not in self._sizes:
+            try:
+                self._sizes[digest] = os.path.getsize(
+                    object_path(self.full_backup_path, digest)
+                )
+            except OSError:
+                self._sizes[digest] = 0
+        return self._sizes[digest]
+
+    def add(self, tree: str) -> None:
+        """Count a kept manifest pointing at a tree."""
+        self._trees[tree] = self._trees.get(tree, 0) + 1
+        if self._trees[tree] > 1:
+            return
+        for digest in self._tree_objects(tree):
+            self._objects[digest] = self._objects.get(digest, 0) + 1
+            if self._objects[digest] == 1:
+                self.total += self._size(digest)
+
+    def remove(self, tree: str) -> None:
+        """Stop counting a manifest, freeing the objects only it used."""
+        self._trees[tree] -= 1
+        if self._trees[tree]:
+            return
+        for digest in self._tree_objects(tree):
+            self._objects[digest] -= 1
+            if not self._objects[digest]:
+                self.total -= self._size(digest)
+
+
+def plan_pruning(
+    full_backup_path: str, backups: dict[str, list[dict]], policy: RetentionPolicy
+) -> dict[str, list[dict]]:
+    """Return the backups to delete by dashboard, newest first.
+
+    Runs in the executor.
+    """
+    doomed: dict[str, dict[str, dict]] = {}
+    bases: dict[str, dict[str, str | None]] = {}
+
+    for dashboard_id, entries in backups.items():
+        bases[dashboard_id] = {
+            entry["file"]: _base_of(full_backup_path, entry) for entry in entries
+        }
+        if not policy.counts_enabled or not entries:
+            doomed[dashboard_id] = {}
+            continue
+
+        keep = _select(entries[::-1], policy)
+        # A kept delta needs every backup it was built on
+        for file in list(keep):
+            base = bases[dashboard_id].get(file)
+            while base and base not in keep:
+                keep.add(base)
+                base = bases[dashboard_id].get(base)
+        doomed[dashboard_id] = {
+            entry["file"]: entry for entry in entries if entry["file"] not in keep
+        }
+
+    if policy.max_bytes > 0:
+        usage = _ObjectUsage(full_backup_path)
+        trees: dict[str, dict[str, str | None]] = {}
+        total = 0
+        for dashboard_id, entries in backups.items():
+            trees[dashboard_id] = {
+                entry["file"]: _tree_of(full_backup_path, entry) for entry in entries
+            }
+            for entry in entries:
+                if entry["file"] in doomed[dashboard_id]:
+                    continue
+                total += entry.get("size", 0)
+                tree = trees[dashboard_id][entry["file"]]
+                if tree:
+                    usage.add(tree)
+
+        by_file: dict[str, dict[str, dict]] = {}
+        dependents: dict[str, dict[str, list[str]]] = {}
+        pinned: dict[str, set[str]] = {}
+        for dashboard_id, entries in backups.items():
+            by_file[dashboard_id] = {entry["file"]: entry for entry in entries}
+            dependents[dashboard_id] = {}
+            for file, base in bases[dashboard_id].items():
+                if base:
+                    dependents[dashboard_id].setdefault(base, []).append(file)
+            # The newest backup and every backup it was built on stay
+            pinned[dashboard_id] = set()
+            file = entries[-1]["file"] if entries else None
+            while file and file not in pinned[dashboard_id]:
+                pinned[dashboard_id].add(file)
+                file = bases[dashboard_id].get(file)
+
+        candidates = sorted(
+            (
+                (entry["timestamp"], dashboard_id, entry)
+                for dashboard_id, entries in backups.items()
+                for entry in entries[:-1]
+            ),
+            key=lambda candidate: candidate[0],
+        )
+        for _, dashboard_id, entry in candidates:
+            if total + usage.total <= policy.max_bytes:
+                break
+            if entry["file"] in doomed[dashboard_id] or entry["file"] in pinned[dashboard_id]:
+                continue
+            # Deleting a backup deletes every delta built on it
+            pending = [entry["file"]]
+            while pending:
+                file = pending.pop()
+                if file in doomed[dashboard_id]:
+                    continue
+                doomed[dashboard_id][file] = by_file[dashboard_id][file]
+                total -= by_file[dashboard_id][file].get("size", 0)
+                if trees[dashboard_id][file]:
+                    usage.remove(trees[dashboard_id][file])
+                pending.extend(dependents[dashboard_id].get(file, []))
+
+    return {
+        dashboard_id: sorted(
+            entries.values(), key=lambda entry: entry["timestamp"], reverse=True
+        )
+        for dashboard_id, entries in doomed.items()
+        if entries
+    }
+
+
+def delete_backup_files(full_backup_path: str, entries: list[dict]) -> None:
+    """Delete every file of some backups. Runs in the executor."""
+    for entry in entries:
+        for filename in entry.get("files") or [entry["file"]]:
+            try:
+                os.remove(os.path.join(full_backup_path, filename))
+            except FileNotFoundError:
+                pass
+
+
+def live_trees(full_backup_path: str, backups: dict[str, list[dict]]) -> set[str]:
+    """Return the tree hash of every manifest backup. Runs in the executor."""
+    trees = set()
+    for entries in backups.values():
+        for entry in entries:
+            tree = _tree_of(full_backup_path, entry)
+            if tree:
+                trees.add(tree)
+    return trees
+
+
+async def async_prune_backups(
+    hass: HomeAssistant, index: BackupIndex, policy: RetentionPolicy
+) -> int:
+    """Apply a retention policy and return the number of backups deleted."""
+    if not policy.enabled:
+        return 0
+
+    started = time.time()
+    full_backup_path = index.full_backup_path
+    plan = await async_run(hass, plan_pruning, full_backup_path, index.snapshot(), policy)
+
+    deleted = 0
+    manifests_deleted = False
+    for dashboard_id, entries in plan.items():
+        for start in range(0, len(entries), PRUNE_BATCH_SIZE):
+            batch = entries[start:start + PRUNE_BATCH_SIZE]
+            await async_run(hass, delete_backup_files, full_backup_path, batch)
+            await async_run(
+                hass, index.remove, dashboard_id, {entry["timestamp"] for entry in batch}
+            )
+            deleted += len(batch)
+            manifests_deleted |= any(entry["format"] == "manifest" for entry in batch)
+            # Let other work run between batches
+            await asyncio.sleep(0)
+
+    if manifests_deleted:
+        trees = await async_run(hass, live_trees, full_backup_path, index.snapshot())
+        removed = await async_run(hass, collect_garbage, full_backup_path, trees, started)
+        _LOGGER.debug("Removed %d unreferenced backup objects", removed)
+
+    if deleted:
+        _LOGGER.info("Pruned %d old dashboard backups", deleted)
+    return deleted
@@ -0,0 +1,151 @@
+"""Built-in backup scheduler for Dashboard Backup.
+
+Every dashboard is backed up once per interval. Instead of a timer per
+dashboard, a single timer fires when the earliest dashboard is due, and all
+dashboards that are due by then (or within the jitter window) are backed up
+in one batch. Each run is delayed by a random jitter so several installs, or
+the scheduler and user automations, do not all hit the disk at the same
+moment. Dashboards that already have a backup in flight are skipped.
+
+The time of each dashboard's last scheduled backup is persisted with a
+Home Assistant ``Store``, so a restart neither triggers a burst of backups
+nor resets the schedule.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+import random
+from typing import Awaitable, Callable, Container
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import ATTR_DASHBOARD_ID, DOMAIN
+from .resolver import StoragePathResolver
+from .storage_io import async_run
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.scheduler"
+STORAGE_VERSION = 1
+
+# Dashboards whose scheduled backup failed are retried after this delay
+RETRY_DELAY = timedelta(minutes=15)
+
+
+class BackupScheduler:
+    """Back up every dashboard once per interval, in coalesced batches."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        resolver: StoragePathResolver,
+        interval: timedelta,
+        jitter: timedelta,
+        in_flight: Container[str],
+        run_batch: Callable[[list[str]], Awaitable[dict]],
+    ) -> None:
+        """Initialize the scheduler.
+
+        ``run_batch`` backs up a list of dashboard ids and returns the batch
+        result of ``async_create_all_backups``.
+        """
+        self.hass = hass
+        self.resolver = resolver
+        self.interval = interval
+        self.jitter = jitter
+        self._in_flight = in_flight
+        self._run_batch = run_batch
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._last_run: dict[str, datetime] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        self._stopped = False
+
+    async def async_start(self) -> None:
+        """Load the last run times and schedule the first batch."""
+        data = await self._store.async_load() or {}
+        for dashboard_id, value in data.get("last_run", {}).items():
+            if parsed := dt_util.parse_datetime(value):
+                self._last_run[dashboard_id] = parsed
+        await self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending batch."""
+        self._stopped = True
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    def _due_at(self, dashboard_id: str, now: datetime) -> datetime:
+        """Return when a dashboard is next due; never-run dashboards are due now."""
+        last_run = self._last_run.get(dashboard_id)
+        return last_run + self.interval if last_run else now
+
+    async def _async_schedule(self, not_before: datetime | None = None) -> None:
+        """Arm the timer for the earliest due dashboard."""
+        dashboards = await async_run(self.hass, self.resolver.dashboards)
+        if self._stopped:
+            return
+        now = dt_util.utcnow()
+        due = max(
+            not_before or now,
+            # Without dashboards, look again after one interval
+            min(
+                (self._due_at(dashboard_id, now) for dashboard_id in dashboards),
+                default=now + self.interval,
+            ),
+        )
+        run_at = due + timedelta(
+            seconds=random.uniform(0, self.jitter.total_seconds())
+        )
+        _LOGGER.debug("Next scheduled dashboard backup at %s", run_at)
+        self._unsub = async_track_point_in_utc_time(self.hass, self._fire, run_at)
+
+    @callback
+    def _fire(self, now: datetime) -> None:
+        """Start the scheduled batch."""
+        self._unsub = None
+        self.hass.async_create_task(self._async_run())
+
+    async def _async_run(self) -> None:
+        """Back up every due dashboard in one batch, then reschedule."""
+        try:
+            dashboards = await async_run(self.hass, self.resolver.dashboards)
+            now = dt_util.utcnow()
+            # Everything due before the next jittered run joins this batch
+            horizon = now + self.jitter
+            due = sorted(
+                dashboard_id
+                for dashboard_id in dashboards
+                if self._due_at(dashboard_id, now) <= horizon
+            )
+            busy = [dashboard_id for dashboard_id in due if dashboard_id in self._in_flight]
+            batch_ids = [dashboard_id for dashboard_id in due if dashboard_id not in busy]
+            if busy:
+                _LOGGER.debug("Skipping dashboards with a backup in flight: %s", busy)
+
+            succeeded = []
+            if batch_ids:
+                batch = await self._run_batch(batch_ids)
+                succeeded = [result[ATTR_DASHBOARD_ID] for result in batch["backups"]]
+
+            # A backup already in flight counts as this interval's backup
+            for dashboard_id in succeeded + busy:
+                self._last_run[dashboard_id] = now
+            await self._store.async_save(
+                {
+                    "last_run": {
+                        dashboard_id: value.isoformat()
+                        for dashboard_id, value in self._last_run.items()
+                        if dashboard_id in dashboards
+                    }
+                }
+            )
+        except Exception as ex:  # pylint: disable=broad-except
+            _LOGGER.error("Scheduled dashboard backup failed: %s", str(ex))
+        finally:
+            await self._async_schedule(dt_util.utcnow() + RETRY_DELAY)
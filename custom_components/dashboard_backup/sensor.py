@@ -0,0 +1,257 @@
+"""Sensors for Dashboard Backup.
+
+Integration-wide sensors report the figures of the latest backup and
+restore and the failure counters. Each dashboard with backups also gets a
+backup count and total size sensor, added as soon as its first backup
+appears. Sensors update from a dispatcher signal rather than polling.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Callable
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DATA_INDEX,
+    DATA_STATS,
+    DOMAIN,
+    NAME,
+    SIGNAL_BACKUPS_UPDATED,
+    TIMESTAMP_FORMAT,
+)
+from .index import BackupIndex
+from .stats import BackupStats
+
+
+def _last_backup_time(stats: BackupStats) -> datetime | None:
+    """Return when the latest backup was taken."""
+    if not stats.last_backup:
+        return None
+    created = datetime.strptime(stats.last_backup["timestamp"], TIMESTAMP_FORMAT)
+    # Backup timestamps are in local time
+    return created.replace(tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+def _last_backup_value(key: str) -> Callable[[BackupStats], Any]:
+    """Return a getter for a figure of the latest backup."""
+    return lambda stats: stats.last_backup.get(key) if stats.last_backup else None
+
+
+SENSORS: list[tuple[SensorEntityDescription, Callable[[BackupStats], Any]]] = [
+    (
+        SensorEntityDescription(
+            key="last_backup",
+            translation_key="last_backup",
+            device_class=SensorDeviceClass.TIMESTAMP,
+        ),
+        _last_backup_time,
+    ),
+    (
+        SensorEntityDescription(
+            key="last_backup_duration",
+            translation_key="last_backup_duration",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            suggested_display_precision=2,
+        ),
+        _last_backup_value("duration"),
+    ),
+    (
+        SensorEntityDescription(
+            key="last_backup_bytes_read",
+            translation_key="last_backup_bytes_read",
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+        ),
+        _last_backup_value("bytes_read"),
+    ),
+    (
+        SensorEntityDescription(
+            key="last_backup_bytes_written",
+            translation_key="last_backup_bytes_written",
+            device_class=SensorDeviceClass.DATA_SIZE,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+        ),
+        _last_backup_value("bytes_written"),
+    ),
+    (
+        SensorEntityDescription(
+            key="last_backup_compression_ratio",
+            translation_key="last_backup_compression_ratio",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        _last_backup_value("compression_ratio"),
+    ),
+    (
+        SensorEntityDescription(
+            key="last_restore_duration",
+            translation_key="last_restore_duration",
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            suggested_display_precision=2,
+        ),
+        lambda stats: stats.last_restore["duration"] if stats.last_restore else None,
+    ),
+    (
+        SensorEntityDescription(
+            key="backup_failures",
+            translation_key="backup_failures",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        lambda stats: stats.backup_failures,
+    ),
+    (
+        SensorEntityDescription(
+            key="restore_failures",
+            translation_key="restore_failures",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        lambda stats: stats.restore_failures,
+    ),
+]
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    """Set up Dashboard Backup sensors."""
+    stats: BackupStats = hass.data[DOMAIN][DATA_STATS]
+    index: BackupIndex = hass.data[DOMAIN][DATA_INDEX]
+
+    async_add_entities(
+        DashboardBackupSensor(entry, stats, description, value_fn)
+        for description, value_fn in SENSORS
+    )
+
+    known: set[str] = set()
+
+    @callback
+    def _add_dashboard_sensors() -> None:
+        """Add count and size sensors for dashboards that got their first backup."""
+        new = [dashboard_id for dashboard_id in index.dashboards() if dashboard_id not in known]
+        known.update(new)
+        async_add_entities(
+            sensor
+            for dashboard_id in new
+            for sensor in (
+                DashboardBackupCountSensor(entry, index, dashboard_id),
+                DashboardBackupSizeSensor(entry, index, dashboard_id),
+            )
+        )
+
+    _add_dashboard_sensors()
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, SIGNAL_BACKUPS_UPDATED, _add_dashboard_sensors)
+    )
+
+
+class _BackupEntity(SensorEntity):
+    """Sensor attached to the integration's service device."""
+
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(self, entry: ConfigEntry) -> None:
+        """Initialize the sensor."""
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name=NAME,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Update whenever backups or metrics change."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_BACKUPS_UPDATED, self.async_write_ha_state
+            )
+        )
+
+
+class DashboardBackupSensor(_BackupEntity):
+    """Figure of the latest backup or restore, or a failure counter."""
+
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        stats: BackupStats,
+        description: SensorEntityDescription,
+        value_fn: Callable[[BackupStats], Any],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry)
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._stats = stats
+        self._value_fn = value_fn
+
+    @property
+    def native_value(self) -> Any:
+        """Return the sensor value."""
+        return self._value_fn(self._stats)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Describe the backup or restore the figure belongs to."""
+        if self.entity_description.key == "last_restore_duration":
+            return self._stats.last_restore
+        if self.entity_description.key == "last_backup":
+            return self._stats.last_backup
+        return None
+
+
+class DashboardBackupCountSensor(_BackupEntity):
+    """Number of backups of a dashboard."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:backup-restore"
+
+    def __init__(self, entry: ConfigEntry, index: BackupIndex, dashboard_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry)
+        self._index = index
+        self._dashboard_id = dashboard_id
+        self._attr_unique_id = f"{entry.entry_id}_{dashboard_id}_backup_count"
+        self._attr_name = f"{dashboard_id} backups"
+
+    @property
+    def native_value(self) -> int:
+        """Return the number of backups."""
+        return self._index.summary(self._dashboard_id)[0]
+
+
+class DashboardBackupSizeSensor(_BackupEntity):
+    """Total size of a dashboard's backups."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfInformation.BYTES
+
+    def __init__(self, entry: ConfigEntry, index: BackupIndex, dashboard_id: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry)
+        self._index = index
+        self._dashboard_id = dashboard_id
+        self._attr_unique_id = f"{entry.entry_id}_{dashboard_id}_backup_size"
+        self._attr_name = f"{dashboard_id} backup size"
+
+    @property
+    def native_value(self) -> int:
+        """Return the total size of the backups in bytes."""
+        return self._index.summary(self._dashboard_id)[1]
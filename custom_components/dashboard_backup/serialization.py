@@ -0,0 +1,171 @@
+"""JSON and YAML serialization for Dashboard Backup.
+
+Every document the integration reads or writes goes through this module,
+which picks the fastest backend available at import time:
+
+* YAML uses PyYAML's libyaml bindings (``CSafeLoader``/``CSafeDumper``)
+  when PyYAML was built with them, else the pure Python safe classes,
+* JSON uses ``orjson`` when it is installed, else the standard library.
+
+Output never depends on the backend, since blob hashes in the object store
+and diffs between backups rely on it:
+
+* YAML is written without line folding (libyaml folds long quoted strings
+  differently from PyYAML), and documents libyaml lays out differently
+  (a top level scalar, an empty key or a key containing a carriage return)
+  are written by the pure Python dumper,
+* JSON that orjson formats differently from the standard library (floats
+  that need an exponent, NaN and infinities, which orjson writes as
+  ``null``, integers over 64 bits, non-string keys) is written by the
+  standard library,
+* each fast dumper is also checked once against a sample document at
+  import, and dropped if its output differs.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+from typing import IO, Any
+
+import yaml
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_LOGGER = logging.getLogger(__name__)
+
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Floats orjson may write differently: any exponent (1e16 for 1e+16) and
+# small numbers the standard library writes with one (0.00005 for 5e-05)
+_DIVERGENT_FLOAT = re.compile(rb"\d[eE]|0\.0000")
+
+# Lines are never folded, see above
+_YAML_WIDTH = 2**31 - 1
+
+_SAMPLE = {
+    "title": "Sample",
+    "views": [
+        {
+            "path": "home",
+            "cards": [
+                {"type": "markdown", "content": "Line one\nLine two: with a colon\n"},
+                {"type": "entities", "entities": ["light.kitchen", {"entity": "sensor.t"}]},
+                {"type": "gauge", "min": 0, "max": 1.5, "step": 0.001, "severity": None},
+                {"type": "button", "name": "Café ☕", "tap_action": {}},
+                {"type": "custom:card", "text": "yes", "number": "1.0", "blank": " x ", "empty": []},
+                {"type": "iframe", "url": "https://example.com/" + "a" * 100},
+                {"type": "markdown", "content": "Caf\u00e9 \u2615 \"quoted\"\t" * 10},
+            ],
+        }
+    ],
+}
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the standard library accept what orjson rejects (NaN, huge ints)
+            pass
+    return json.loads(data)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return True if a document holds NaN or an infinity."""
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, float):
+            if not math.isfinite(node):
+                return True
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, (list, tuple)):
+            stack.extend(node)
+    return False
+
+
+def _stdlib_dumps_json(obj: Any, indent: bool) -> bytes:
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON, compact or indented by two spaces."""
+    if _orjson_dumps is not None:
+        try:
+            data = _orjson_dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            data = None
+        # orjson writes NaN and infinities as null, which None also produces
+        if (
+            data is not None
+            and not _DIVERGENT_FLOAT.search(data)
+            and not (b"null" in data and _has_non_finite(obj))
+        ):
+            return data
+    return _stdlib_dumps_json(obj, indent)
+
+
+def load_yaml(stream: IO | str | bytes) -> Any:
+    """Parse a YAML document with the safe loader."""
+    return yaml.load(stream, Loader=_YAML_LOADER)
+
+
+def _libyaml_compatible(obj: Any) -> bool:
+    """Return True if libyaml lays out a document like PyYAML."""
+    if not isinstance(obj, (dict, list)):
+        return False
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "" or (isinstance(key, str) and "\r" in key):
+                    return False
+                if isinstance(value, (dict, list)):
+                    stack.append(value)
+        else:
+            stack.extend(item for item in node if isinstance(item, (dict, list)))
+    return True
+
+
+def dump_yaml(obj: Any, stream: IO | None = None) -> str | None:
+    """Serialize to block style YAML, returning it if no stream is given."""
+    dumper = _YAML_DUMPER
+    if dumper is not yaml.SafeDumper and not _libyaml_compatible(obj):
+        dumper = yaml.SafeDumper
+    return yaml.dump(obj, stream, Dumper=dumper, default_flow_style=False, width=_YAML_WIDTH)
+
+
+def _check_backends() -> None:
+    """Drop fast backends whose output differs from the pure Python one."""
+    global _YAML_DUMPER, _orjson_dumps  # pylint: disable=global-statement
+
+    if _YAML_DUMPER is not yaml.SafeDumper:
+        expected = yaml.dump(
+            _SAMPLE, Dumper=yaml.SafeDumper, default_flow_style=False, width=_YAML_WIDTH
+        )
+        if dump_yaml(_SAMPLE) != expected:
+            _LOGGER.debug("libyaml output differs from PyYAML, using the pure Python dumper")
+            _YAML_DUMPER = yaml.SafeDumper
+
+    if _orjson_dumps is not None:
+        for indent in (False, True):
+            if dumps_json(_SAMPLE, indent) != _stdlib_dumps_json(_SAMPLE, indent):
+                _LOGGER.debug("orjson output differs from json, using the standard library")
+                _orjson_dumps = None
+                break
+
+
+_orjson_dumps = orjson.dumps if orjson is not None else None
+_check_backends()
@@ -0,0 +1,140 @@
+"""Backup and restore metrics for Dashboard Backup.
+
+Keeps the figures of the most recent backup and restore and counts
+failures since startup. Every change is announced on a dispatcher signal so
+the sensors update without polling.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+import time
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    ATTR_BACKUP_FILE,
+    ATTR_DASHBOARD_ID,
+    ATTR_TIMESTAMP,
+    SIGNAL_BACKUPS_UPDATED,
+    TIMESTAMP_FORMAT,
+)
+
+
+def _artifact_size(entry: dict) -> int | None:
+    """Return the size of a backup's main file, without the YAML companion."""
+    record = (entry.get("checksums") or {}).get(entry["file"])
+    if record is not None:
+        return record.get("size")
+    # Older entries only know the size of all their files together
+    return entry.get("size") if len(entry.get("files") or [entry["file"]]) == 1 else None
+
+
+def backup_metrics(entry: dict) -> dict:
+    """Return the size and timing figures of a backup index entry."""
+    bytes_read = entry.get("bytes_read")
+    artifact_size = _artifact_size(entry)
+    return {
+        "duration": entry.get("duration"),
+        "bytes_read": bytes_read,
+        "bytes_written": entry.get("size"),
+        "compression_ratio": (
+            round(bytes_read / artifact_size, 2) if bytes_read and artifact_size else None
+        ),
+    }
+
+
+def describe_backup(entry: dict) -> dict:
+    """Return the public description of a backup index entry."""
+    created = datetime.strptime(entry["timestamp"], TIMESTAMP_FORMAT)
+    return {
+        ATTR_DASHBOARD_ID: entry["dashboard_id"],
+        ATTR_BACKUP_FILE: entry["file"],
+        "files": entry["files"],
+        ATTR_TIMESTAMP: entry["timestamp"],
+        "created": created.isoformat(),
+        "format": entry["format"],
+        "compression": entry["compression"],
+        "size": entry["size"],
+        "hash": entry["hash"],
+        **backup_metrics(entry),
+    }
+
+
+class SetupTimer:
+    """Durations of the phases of setting up the integration.
+
+    Phases run during setup add to Home Assistant's boot time. Deferred
+    phases run once Home Assistant has started and are reported apart.
+    """
+
+    def __init__(self) -> None:
+        """Start timing."""
+        self._started = self._last = time.monotonic()
+        self.phases: dict[str, float] = {}
+        self.deferred: dict[str, float] = {}
+
+    def lap(self, phase: str) -> None:
+        """Record the time since the previous phase as the duration of a phase."""
+        now = time.monotonic()
+        self.phases[phase] = round(now - self._last, 3)
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        """Return the time from the start to the end of the last phase."""
+        return round(self._last - self._started, 3)
+
+    def as_dict(self) -> dict:
+        """Return the durations in seconds."""
+        return {"total": self.total, "phases": self.phases, "deferred": self.deferred}
+
+
+class BackupStats:
+    """Latest backup and restore figures and failure counters."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the metrics."""
+        self.hass = hass
+        self.last_backup: dict | None = None
+        self.last_restore: dict | None = None
+        self.backup_failures = 0
+        self.restore_failures = 0
+
+    @callback
+    def async_record_backup(self, dashboard_id: str, entry: dict) -> None:
+        """Record a successful backup."""
+        self.last_backup = {
+            ATTR_DASHBOARD_ID: dashboard_id,
+            ATTR_BACKUP_FILE: entry["file"],
+            ATTR_TIMESTAMP: entry["timestamp"],
+            **backup_metrics(entry),
+        }
+        self.async_updated()
+
+    @callback
+    def async_record_backup_failure(self) -> None:
+        """Count a failed backup."""
+        self.backup_failures += 1
+        self.async_updated()
+
+    @callback
+    def async_record_restore(self, dashboard_id: str, backup_file: str, duration: float) -> None:
+        """Record a successful restore."""
+        self.last_restore = {
+            ATTR_DASHBOARD_ID: dashboard_id,
+            ATTR_BACKUP_FILE: backup_file,
+            "duration": duration,
+        }
+        self.async_updated()
+
+    @callback
+    def async_record_restore_failure(self) -> None:
+        """Count a failed restore."""
+        self.restore_failures += 1
+        self.async_updated()
+
+    @callback
+    def async_updated(self) -> None:
+        """Tell the sensors that backups or metrics changed."""
+        async_dispatcher_send(self.hass, SIGNAL_BACKUPS_UPDATED)
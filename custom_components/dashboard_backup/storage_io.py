@@ -0,0 +1,207 @@
+"""Filesystem helpers for Dashboard Backup.
+
+All disk access made by the integration goes through this module. The plain
+functions block and must only be called from a worker thread; the ``async_``
+variants schedule them on the Home Assistant executor so the event loop never
+waits on the filesystem.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime
+import logging
+import os
+import shutil
+import tempfile
+from typing import IO, Any, Callable, Iterator, TypeVar
+
+from homeassistant.core import HomeAssistant
+
+from .serialization import dump_yaml, dumps_json, load_yaml, loads_json
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+def read_bytes(path: str) -> bytes:
+    """Read a whole file as bytes."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def write_bytes(path: str, data: bytes) -> None:
+    """Write bytes to a file, replacing any existing content."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def read_json(path: str) -> Any:
+    """Load a JSON document from a file."""
+    return loads_json(read_bytes(path))
+
+
+def write_json(path: str, data: Any) -> None:
+    """Dump a JSON document to a file."""
+    write_bytes(path, dumps_json(data, indent=True))
+
+
+def read_yaml(path: str) -> Any:
+    """Load a YAML document from a file using the safe loader."""
+    with open(path, "r") as f:
+        return load_yaml(f)
+
+
+@contextmanager
+def atomic_writer(path: str) -> Iterator[IO[bytes]]:
+    """Open a temporary file that atomically replaces ``path`` on success.
+
+    The temporary file lives in the same directory and is fsynced before it
+    is renamed over the target, so a crash leaves either the old or the new
+    content, never a truncated file.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist a rename by syncing its directory, where supported."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_bytes_atomic(path: str, data: bytes) -> None:
+    """Atomically replace a file with bytes."""
+    with atomic_writer(path) as f:
+        f.write(data)
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """Atomically replace a file with a JSON document."""
+    write_bytes_atomic(path, dumps_json(data, indent=True))
+
+
+def write_yaml_atomic(path: str, data: Any) -> None:
+    """Atomically replace a file with a YAML document in block style."""
+    write_bytes_atomic(path, dump_yaml(data).encode("utf-8"))
+
+
+def preserve_file(path: str, snapshot_dir: str, keep: int) -> str | None:
+    """Keep a rotated copy of a file before it is replaced.
+
+    The copy is a hard link where possible, so no data is read or written.
+    Only the newest ``keep`` copies of each file are kept. Returns the path
+    of the copy, or None if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return None
+
+    make_dirs(snapshot_dir)
+    name = os.path.basename(path)
+    snapshot = os.path.join(
+        snapshot_dir, f"{name}.{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+    )
+    try:
+        os.link(path, snapshot)
+    except OSError:
+        # Different filesystem or no hard link support
+        shutil.copy2(path, snapshot)
+
+    snapshots = sorted(f for f in list_dir(snapshot_dir) if f.startswith(f"{name}."))
+    for old in snapshots[:-keep]:
+        try:
+            os.remove(os.path.join(snapshot_dir, old))
+        except OSError as ex:
+            _LOGGER.debug("Could not remove old snapshot %s: %s", old, str(ex))
+
+    return snapshot
+
+
+def list_dir(path: str) -> list[str]:
+    """List a directory, returning an empty list if it does not exist."""
+    try:
+        return os.listdir(path)
+    except FileNotFoundError:
+        return []
+
+
+def path_exists(path: str) -> bool:
+    """Return True if the path exists."""
+    return os.path.exists(path)
+
+
+def make_dirs(path: str) -> None:
+    """Create a directory and its parents if missing."""
+    os.makedirs(path, exist_ok=True)
+
+
+async def async_run(hass: HomeAssistant, func: Callable[..., _T], *args: Any) -> _T:
+    """Run a blocking function in the executor and return its result."""
+    return await hass.async_add_executor_job(func, *args)
+
+
+async def async_read_json(hass: HomeAssistant, path: str) -> Any:
+    """Load a JSON file without blocking the event loop."""
+    return await async_run(hass, read_json, path)
+
+
+async def async_write_json(hass: HomeAssistant, path: str, data: Any) -> None:
+    """Dump a JSON file without blocking the event loop."""
+    await async_run(hass, write_json, path, data)
+
+
+async def async_read_yaml(hass: HomeAssistant, path: str) -> Any:
+    """Load a YAML file without blocking the event loop."""
+    return await async_run(hass, read_yaml, path)
+
+
+async def async_write_json_atomic(hass: HomeAssistant, path: str, data: Any) -> None:
+    """Atomically replace a file with JSON without blocking the event loop."""
+    await async_run(hass, write_json_atomic, path, data)
+
+
+async def async_write_yaml_atomic(hass: HomeAssistant, path: str, data: Any) -> None:
+    """Atomically replace a file with YAML without blocking the event loop."""
+    await async_run(hass, write_yaml_atomic, path, data)
+
+
+async def async_preserve_file(
+    hass: HomeAssistant, path: str, snapshot_dir: str, keep: int
+) -> str | None:
+    """Keep a rotated copy of a file without blocking the event loop."""
+    return await async_run(hass, preserve_file, path, snapshot_dir, keep)
+
+
+async def async_path_exists(hass: HomeAssistant, path: str) -> bool:
+    """Check whether a path exists without blocking the event loop."""
+    return await async_run(hass, path_exists, path)
+
+
+async def async_make_dirs(hass: HomeAssistant, path: str) -> None:
+    """Create a directory tree without blocking the event loop."""
+    await async_run(hass, make_dirs, path)
@@ -0,0 +1,144 @@
+"""Strategy registry for Dashboard Backup.
+
+Reading and saving a dashboard configuration can be done several ways, and
+which one works depends on the Home Assistant version and on how the
+dashboard is stored. Instead of trying every method in order on each call,
+the registry remembers the strategy that last worked for each dashboard and
+tries it first; the others are only probed again when it fails.
+
+Winners are persisted with a Home Assistant ``Store`` together with the Home
+Assistant version, and forgotten after an upgrade. Every attempt is timed,
+and the figures are part of the integration's diagnostics.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = f"{DOMAIN}.strategies"
+STORAGE_VERSION = 1
+
+# Seconds to wait before persisting a new winner
+SAVE_DELAY = 10
+
+# A strategy returns None when it does not apply or did not work
+Strategy = Callable[..., Awaitable[Any]]
+
+
+class StrategyRegistry:
+    """Remember which strategy works for each dashboard, and time them all."""
+
+    def __init__(self, hass: HomeAssistant, persist: bool = True) -> None:
+        """Initialize the registry."""
+        self.hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY) if persist else None
+        # Operation -> dashboard id -> name of the strategy that worked
+        self._winners: dict[str, dict[str, str]] = {}
+        # Operation -> strategy name -> timing figures
+        self._timings: dict[str, dict[str, dict]] = {}
+
+    async def async_load(self) -> None:
+        """Load the winners recorded by this Home Assistant version."""
+        if self._store is None:
+            return
+        data = await self._store.async_load() or {}
+        if data.get("ha_version") == HA_VERSION:
+            self._winners = data.get("winners", {})
+        elif data:
+            _LOGGER.debug(
+                "Home Assistant changed from %s, probing dashboard strategies again",
+                data.get("ha_version"),
+            )
+
+    def _data_to_save(self) -> dict:
+        return {"ha_version": HA_VERSION, "winners": self._winners}
+
+    def _set_winner(self, operation: str, dashboard_id: str, name: str | None) -> None:
+        """Remember or forget the strategy that works for a dashboard."""
+        winners = self._winners.setdefault(operation, {})
+        if name is None:
+            winners.pop(dashboard_id, None)
+        else:
+            winners[dashboard_id] = name
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def _record(self, operation: str, name: str, elapsed: float, error: str | None) -> None:
+        """Add an attempt to a strategy's timing figures."""
+        timing = self._timings.setdefault(operation, {}).setdefault(
+            name,
+            {"attempts": 0, "successes": 0, "total_time": 0.0, "last_time": None, "last_error": None},
+        )
+        timing["attempts"] += 1
+        timing["total_time"] += elapsed
+        timing["last_time"] = elapsed
+        if error is None:
+            timing["successes"] += 1
+        else:
+            timing["last_error"] = error
+
+    async def async_run(
+        self,
+        operation: str,
+        dashboard_id: str,
+        strategies: list[tuple[str, Strategy]],
+        *args: Any,
+    ) -> tuple[str, Any] | None:
+        """Run strategies until one returns a result.
+
+        The strategy that last worked for the dashboard goes first, the rest
+        follow in their given order. Returns the name and result of the
+        strategy that worked, or None if none did.
+        """
+        winner = self._winners.get(operation, {}).get(dashboard_id)
+        # Stable sort: the winner moves to the front, the rest keep their order
+        ordered = sorted(strategies, key=lambda strategy: strategy[0] != winner)
+
+        for name, strategy in ordered:
+            start = time.perf_counter()
+            try:
+                result = await strategy(*args)
+                error = None if result is not None else "no result"
+            except Exception as ex:  # pylint: disable=broad-except
+                result = None
+                error = str(ex) or type(ex).__name__
+            self._record(operation, name, time.perf_counter() - start, error)
+
+            if result is not None:
+                if name != winner:
+                    _LOGGER.debug("Using strategy %s to %s %s", name, operation, dashboard_id)
+                    self._set_winner(operation, dashboard_id, name)
+                return name, result
+
+            _LOGGER.debug("Strategy %s could not %s %s: %s", name, operation, dashboard_id, error)
+            if name == winner:
+                # Probe the others, and forget it if none of them works either
+                self._set_winner(operation, dashboard_id, None)
+
+        return None
+
+    def diagnostics(self) -> dict:
+        """Return the winners and per-strategy timings."""
+        return {
+            "ha_version": HA_VERSION,
+            "winners": self._winners,
+            "timings": {
+                operation: {
+                    name: {
+                        **timing,
+                        "average_time": timing["total_time"] / timing["attempts"],
+                    }
+                    for name, timing in timings.items()
+                }
+                for operation, timings in self._timings.items()
+            },
+        }
@@ -0,0 +1,153 @@
+"""Background integrity scrub for Dashboard Backup.
+
+Reads every backup file and object store blob and checks it against its
+checksum: the record kept in the backup index, or the hash a blob is named
+by. Backups without a record (written before checksums were recorded, or
+found by an index rebuild) are decompressed and parsed instead, which
+catches truncation and most corruption.
+
+Each file is read in the executor, one at a time, and the scrub sleeps
+between files so the average read rate stays under a limit.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+
+from homeassistant.core import HomeAssistant
+
+from .index import BackupIndex, backup_format_of
+from .integrity import CorruptBackupError, HashingReader, open_verified
+from .object_store import OBJECTS_DIR, referenced_objects, verify_object
+from .serialization import load_yaml, loads_json
+from .storage_io import async_run, list_dir
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def verify_backup_file(full_backup_path: str, filename: str, expected: dict | None) -> int:
+    """Check one backup file and return the number of bytes read.
+
+    Raises if the file is missing, corrupt or cannot be parsed. Runs in the
+    executor.
+    """
+    path = os.path.join(full_backup_path, filename)
+    if expected is not None:
+        # The record covers the bytes on disk, so nothing needs decoding
+        with open(path, "rb") as f:
+            actual = HashingReader(f).checksum()
+        if actual != expected:
+            raise CorruptBackupError(f"Backup file {filename} is corrupt (checksum mismatch)")
+        return actual["size"]
+
+    with open_verified(path) as f:
+        content = f.read()
+    if backup_format_of(filename) == "yaml":
+        load_yaml(content)
+    else:
+        loads_json(content)
+    return os.path.getsize(path)
+
+
+def list_objects(full_backup_path: str) -> list[str]:
+    """Return the hash of every blob in the object store. Runs in the executor."""
+    objects_path = os.path.join(full_backup_path, OBJECTS_DIR)
+    return [
+        prefix + name
+        for prefix in list_dir(objects_path)
+        for name in list_dir(os.path.join(objects_path, prefix))
+        if not name.endswith(".tmp")
+    ]
+
+
+def dashboard_objects(full_backup_path: str, entries: list[dict]) -> list[str]:
+    """Return the blobs used by a dashboard's deduplicated backups. Runs in the executor."""
+    digests: set[str] = set()
+    for entry in entries:
+        if entry.get("tree"):
+            digests |= referenced_objects(full_backup_path, entry["tree"])
+    return sorted(digests)
+
+
+def _verify_object(full_backup_path: str, digest: str) -> int:
+    """Check one blob and return its size."""
+    return len(verify_object(full_backup_path, digest))
+
+
+async def async_verify_backups(
+    hass: HomeAssistant,
+    index: BackupIndex,
+    max_rate: int,
+    dashboard_id: str | None = None,
+) -> dict:
+    """Scrub the backup directory, reading at most ``max_rate`` bytes per second.
+
+    With a dashboard id only its backups, and the blobs they use, are
+    checked. Returns the number of files checked, those without a checksum
+    record, the corrupt ones with the reason, and the bytes read.
+    """
+    full_backup_path = index.full_backup_path
+    backups = index.snapshot()
+    if dashboard_id is not None:
+        backups = {dashboard_id: backups.get(dashboard_id, [])}
+
+    files = sorted(
+        {
+            filename
+            for entries in backups.values()
+            for entry in entries
+            for filename in entry.get("files") or [entry["file"]]
+        }
+    )
+    checksums = await async_run(hass, index.chain_checksums, files)
+    if dashboard_id is None:
+        objects = await async_run(hass, list_objects, full_backup_path)
+    else:
+        try:
+            objects = await async_run(
+                hass, dashboard_objects, full_backup_path, backups[dashboard_id]
+            )
+        except (OSError, ValueError) as ex:
+            # A tree that cannot be read is reported below, as a corrupt blob
+            _LOGGER.debug("Could not list the blobs of %s: %s", dashboard_id, ex)
+            objects = sorted(
+                {entry["tree"] for entry in backups[dashboard_id] if entry.get("tree")}
+            )
+
+    work = [
+        (filename, verify_backup_file, (full_backup_path, filename, checksums.get(filename)))
+        for filename in files
+    ] + [
+        (f"{OBJECTS_DIR}/{digest[:2]}/{digest[2:]}", _verify_object, (full_backup_path, digest))
+        for digest in objects
+    ]
+
+    started = time.monotonic()
+    bytes_read = 0
+    corrupt = []
+    for name, check, args in work:
+        try:
+            bytes_read += await async_run(hass, check, *args)
+        except FileNotFoundError:
+            corrupt.append({"file": name, "error": "missing"})
+        except Exception as ex:  # pylint: disable=broad-except
+            # Codecs and parsers raise many types, all of them mean corrupt
+            corrupt.append({"file": name, "error": str(ex) or type(ex).__name__})
+
+        # Sleep until the average rate is back under the limit
+        delay = bytes_read / max_rate - (time.monotonic() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    for item in corrupt:
+        _LOGGER.warning("Backup %s failed verification: %s", item["file"], item["error"])
+
+    return {
+        "checked": len(work),
+        "unverified": sum(1 for filename in files if filename not in checksums),
+        "corrupt": corrupt,
+        "bytes_read": bytes_read,
+        "duration": round(time.monotonic() - started, 3),
+    }
@@ -0,0 +1,128 @@
+"""Change-driven automatic backups for Dashboard Backup.
+
+The watcher listens for ``lovelace_updated`` events, which Lovelace fires
+every time a UI dashboard is saved, so nothing runs while dashboards are
+left alone. Saves are debounced per dashboard: a burst of edits results in a
+single check once the dashboard has been quiet for the configured delay.
+The check compares the storage file's SHA-256 with the latest backup and
+only backs up dashboards whose content actually changed; an unchanged size
+and mtime skip even the hash.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+from typing import Awaitable, Callable
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import EVENT_LOVELACE_UPDATED
+from .index import BackupIndex
+from .resolver import MAIN_DASHBOARD, StoragePathResolver
+from .storage_io import async_run, read_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def storage_fingerprint(
+    path: str, previous: tuple[int, int] | None
+) -> tuple[tuple[int, int], str | None]:
+    """Return a file's (mtime, size) and SHA-256. Runs in the executor.
+
+    The hash is None when the (mtime, size) matches ``previous``.
+    """
+    stat = os.stat(path)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    if stat_key == previous:
+        return stat_key, None
+    return stat_key, hashlib.sha256(read_bytes(path)).hexdigest()
+
+
+class DashboardWatcher:
+    """Back up dashboards shortly after they change."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        index: BackupIndex,
+        resolver: StoragePathResolver,
+        delay: float,
+        backup: Callable[[str, str], Awaitable[dict | None]],
+    ) -> None:
+        """Initialize the watcher.
+
+        ``backup`` is called with a dashboard id and its storage file and
+        returns the new index entry, or None if the backup failed.
+        """
+        self.hass = hass
+        self.index = index
+        self.resolver = resolver
+        self.delay = delay
+        self._backup = backup
+        self._pending: dict[str, CALLBACK_TYPE] = {}
+        # Last seen (mtime, size) of each dashboard
+        self._stats: dict[str, tuple[int, int]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening for dashboard saves."""
+        self._unsub = self.hass.bus.async_listen(EVENT_LOVELACE_UPDATED, self._changed)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening and drop pending checks."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        for cancel in self._pending.values():
+            cancel()
+        self._pending.clear()
+
+    @callback
+    def _changed(self, event: Event) -> None:
+        """Restart the debounce timer of the dashboard that was saved."""
+        key = event.data.get("url_path") or MAIN_DASHBOARD
+        if cancel := self._pending.pop(key, None):
+            cancel()
+
+        @callback
+        def _fire(now) -> None:
+            self._pending.pop(key, None)
+            self.hass.async_create_task(self._async_check(key))
+
+        self._pending[key] = async_call_later(self.hass, self.delay, _fire)
+
+    async def _async_check(self, key: str) -> None:
+        """Back up a dashboard if its content changed since the last backup."""
+        dashboard_id = await async_run(self.hass, self.resolver.dashboard_id, key)
+        if dashboard_id is None:
+            _LOGGER.debug("Ignoring change to dashboard %s without a storage file", key)
+            return
+        storage_file = await async_run(self.hass, self.resolver.resolve, dashboard_id)
+
+        try:
+            stat_key, digest = await async_run(
+                self.hass, storage_fingerprint, storage_file, self._stats.get(dashboard_id)
+            )
+        except FileNotFoundError:
+            return
+        if digest is None:
+            return
+        self._stats[dashboard_id] = stat_key
+
+        latest = self.index.latest(dashboard_id)
+        if latest and latest.get("hash") == digest:
+            _LOGGER.debug("Dashboard %s is unchanged, skipping automatic backup", dashboard_id)
+            return
+
+        _LOGGER.debug("Dashboard %s changed, backing it up", dashboard_id)
+        index_entry = await self._backup(dashboard_id, storage_file)
+        if index_entry is not None and index_entry.get("hash") != digest:
+            # Joined a backup in flight that read the file before this save
+            index_entry = await self._backup(dashboard_id, storage_file)
+        if index_entry is None:
+            # Retry on the next save
+            self._stats.pop(dashboard_id, None)
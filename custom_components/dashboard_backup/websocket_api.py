@@ -0,0 +1,225 @@
+"""Websocket API for the Dashboard Backup card.
+
+The card uses these commands instead of fire-and-forget service calls:
+
+* ``dashboard_backup/backups/list`` pages through the backup index with an
+  opaque cursor, newest first by default.
+* ``dashboard_backup/backups/get`` returns the metadata of one backup.
+* ``dashboard_backup/jobs/subscribe`` streams the progress events of
+  background jobs, starting with the state of the jobs already known.
+* ``dashboard_backup/diff`` previews what restoring a backup would change.
+
+``get`` and ``diff`` expose backup contents and are limited to admins.
+Backup files are looked up in the index, never joined onto the backup
+directory as given.
+"""
+from __future__ import annotations
+
+from typing import Any, Awaitable, Callable
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import Event, HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_BACKUP_FILE,
+    ATTR_DASHBOARD_ID,
+    ATTR_FROM_BACKUP,
+    ATTR_JOB_ID,
+    ATTR_LIMIT,
+    ATTR_ORDER,
+    ATTR_TO_BACKUP,
+    DATA_INDEX,
+    DATA_JOBS,
+    DEFAULT_LIST_LIMIT,
+    DOMAIN,
+    EVENT_JOB_PROGRESS,
+    MAX_LIST_LIMIT,
+    ORDER_NEWEST,
+    ORDER_OLDEST,
+)
+from .index import is_bare_filename
+from .stats import describe_backup
+
+ATTR_CURSOR = "cursor"
+
+# Returns the storage id of a dashboard given by id or alias
+CanonicalId = Callable[[str], Awaitable[str]]
+
+# Compares two backups, or a backup and the live dashboard
+DiffBackups = Callable[[str, str | None, str | None], Awaitable[dict]]
+
+
+def _encode_cursor(entry: dict) -> str:
+    """Return the cursor pointing after a backup."""
+    return f"{entry['timestamp']}:{entry['dashboard_id']}"
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str]:
+    """Return the (timestamp, dashboard id) a cursor points after."""
+    timestamp, separator, dashboard_id = cursor.partition(":")
+    if not separator or not dashboard_id:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return timestamp, dashboard_id
+
+
+@callback
+def async_register_websocket_commands(
+    hass: HomeAssistant, canonical_id: CanonicalId, diff: DiffBackups
+) -> None:
+    """Register the websocket commands.
+
+    ``canonical_id`` turns a dashboard id or alias into the id backups are
+    indexed by. ``diff`` is called with a dashboard id and the two backup
+    files, either of which may be None for the live dashboard.
+    """
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{DOMAIN}/backups/list",
+            vol.Optional(ATTR_DASHBOARD_ID): cv.string,
+            vol.Optional(ATTR_CURSOR): cv.string,
+            vol.Optional(ATTR_ORDER, default=ORDER_NEWEST): vol.In(
+                [ORDER_NEWEST, ORDER_OLDEST]
+            ),
+            vol.Optional(ATTR_LIMIT, default=DEFAULT_LIST_LIMIT): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=MAX_LIST_LIMIT)
+            ),
+        }
+    )
+    @websocket_api.async_response
+    async def websocket_list_backups(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        """Return one page of backups and the cursor of the next one."""
+        try:
+            after = _decode_cursor(msg[ATTR_CURSOR]) if ATTR_CURSOR in msg else None
+        except ValueError as ex:
+            connection.send_error(msg["id"], websocket_api.ERR_INVALID_FORMAT, str(ex))
+            return
+        dashboard_id = msg.get(ATTR_DASHBOARD_ID)
+        if dashboard_id is not None:
+            dashboard_id = await canonical_id(dashboard_id)
+        limit = msg[ATTR_LIMIT]
+        # One extra backup tells whether there is a next page
+        entries = hass.data[DOMAIN][DATA_INDEX].page(
+            dashboard_id=dashboard_id,
+            after=after,
+            newest_first=msg[ATTR_ORDER] == ORDER_NEWEST,
+            limit=limit + 1,
+        )
+        connection.send_result(
+            msg["id"],
+            {
+                "backups": [describe_backup(entry) for entry in entries[:limit]],
+                ATTR_CURSOR: _encode_cursor(entries[limit - 1]) if len(entries) > limit else None,
+            },
+        )
+
+    @websocket_api.require_admin
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{DOMAIN}/backups/get",
+            vol.Required(ATTR_BACKUP_FILE): cv.string,
+        }
+    )
+    @callback
+    def websocket_get_backup(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        """Return the metadata of a backup."""
+        backup_file = msg[ATTR_BACKUP_FILE]
+        if not is_bare_filename(backup_file):
+            connection.send_error(
+                msg["id"], websocket_api.ERR_INVALID_FORMAT, f"Invalid backup file {backup_file}"
+            )
+            return
+        entry = hass.data[DOMAIN][DATA_INDEX].find(backup_file)
+        if entry is None:
+            connection.send_error(
+                msg["id"], websocket_api.ERR_NOT_FOUND, f"Backup {msg[ATTR_BACKUP_FILE]} not found"
+            )
+            return
+        connection.send_result(
+            msg["id"],
+            {
+                **describe_backup(entry),
+                "checksums": entry.get("checksums"),
+                # The backup a delta applies to, or the tree of a deduplicated backup
+                "base": entry.get("base"),
+                "tree": entry.get("tree"),
+            },
+        )
+
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{DOMAIN}/jobs/subscribe",
+            vol.Optional(ATTR_JOB_ID): cv.string,
+            vol.Optional(ATTR_DASHBOARD_ID): cv.string,
+        }
+    )
+    @websocket_api.async_response
+    async def websocket_subscribe_jobs(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        """Stream job progress, for one job or the jobs of one dashboard if given."""
+        job_id = msg.get(ATTR_JOB_ID)
+        dashboard_id = msg.get(ATTR_DASHBOARD_ID)
+        # Jobs are submitted with the storage id, the card may use an alias
+        if dashboard_id is not None:
+            dashboard_id = await canonical_id(dashboard_id)
+
+        def wanted(job: dict) -> bool:
+            return (job_id is None or job[ATTR_JOB_ID] == job_id) and (
+                dashboard_id is None or job[ATTR_DASHBOARD_ID] in (dashboard_id, None)
+            )
+
+        @callback
+        def forward(event: Event) -> None:
+            if wanted(event.data):
+                connection.send_message(websocket_api.event_message(msg["id"], event.data))
+
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(EVENT_JOB_PROGRESS, forward)
+        connection.send_result(msg["id"])
+
+        # Start with the jobs already known, oldest first like the events
+        for job in reversed(hass.data[DOMAIN][DATA_JOBS].jobs()):
+            description = job.summary()
+            if wanted(description):
+                connection.send_message(websocket_api.event_message(msg["id"], description))
+
+    @websocket_api.require_admin
+    @websocket_api.websocket_command(
+        {
+            vol.Required("type"): f"{DOMAIN}/diff",
+            vol.Optional(ATTR_DASHBOARD_ID, default="lovelace"): cv.string,
+            vol.Optional(ATTR_FROM_BACKUP): cv.string,
+            vol.Optional(ATTR_TO_BACKUP): cv.string,
+        }
+    )
+    @websocket_api.async_response
+    async def websocket_diff(
+        hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        """Compare two backups, or a backup and the live dashboard."""
+        from_backup = msg.get(ATTR_FROM_BACKUP)
+        to_backup = msg.get(ATTR_TO_BACKUP)
+        if from_backup is None and to_backup is None:
+            connection.send_error(
+                msg["id"],
+                websocket_api.ERR_INVALID_FORMAT,
+                f"At least one of {ATTR_FROM_BACKUP} and {ATTR_TO_BACKUP} is required",
+            )
+            return
+        # Errors are sent back by the websocket API, and diff only reads
+        # backup files the index knows for the dashboard
+        connection.send_result(
+            msg["id"], await diff(msg[ATTR_DASHBOARD_ID], from_backup, to_backup)
+        )
+
+    websocket_api.async_register_command(hass, websocket_list_backups)
+    websocket_api.async_register_command(hass, websocket_get_backup)
+    websocket_api.async_register_command(hass, websocket_subscribe_jobs)
+    websocket_api.async_register_command(hass, websocket_diff)
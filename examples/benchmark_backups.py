@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the Dashboard Backup component.
+Generates synthetic Lovelace storage files from 10 KB up to 50 MB (many views,
+deeply nested stacks and long markdown strings) in a temporary config
+directory, then runs the component's own code paths against the minimal
+stand-in for the Home Assistant core object the tests use (tests/common.py):
+
+* the create_backup service in each backup mode,
+* the restore_backup service,
+* get_storage_file_path,
+* restore_dashboard_config.
+
+For each operation it reports throughput, peak Python memory (tracemalloc)
+and the longest time the event loop was blocked. Run it from the repository
+root inside a Home Assistant development environment:
+
+    python examples/benchmark_backups.py --sizes 10K,1M,50M
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from custom_components.dashboard_backup import (  # noqa: E402
+    get_storage_file_path,
+    restore_dashboard_config,
+)
+from custom_components.dashboard_backup.const import (  # noqa: E402
+    BACKUP_MODES,
+    CONF_BACKUP_MODE,
+    DOMAIN,
+    SERVICE_CREATE_BACKUP,
+    SERVICE_RESTORE_BACKUP,
+)
+from tests.common import async_setup_hass  # noqa: E402
+
+SIZE_SUFFIXES = {"K": 1024, "M": 1024 * 1024}
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark Dashboard Backup operations offline")
+    parser.add_argument("--sizes", default="10K,100K,1M,10M,50M",
+                        help="Comma separated storage file sizes to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--modes", default=",".join(BACKUP_MODES), help="Backup modes to benchmark")
+    return parser.parse_args()
+
+
+def parse_size(value):
+    """Turn '10K' or '50M' into bytes."""
+    value = value.strip().upper()
+    if value[-1] in SIZE_SUFFIXES:
+        return int(float(value[:-1]) * SIZE_SUFFIXES[value[-1]])
+    return int(value)
+
+
+def synthetic_view(number):
+    """Build a view with nested stacks and long markdown cards."""
+    def leaf(depth, index):
+        return {
+            "type": "entities",
+            "title": f"Room {number}.{depth}.{index}",
+            "entities": [
+                {"entity": f"sensor.view_{number}_{depth}_{index}_{e}", "name": f"Sensor {e}"}
+                for e in range(4)
+            ],
+        }
+
+    def stack(depth):
+        if depth == 0:
+            return leaf(depth, 0)
+        return {
+            "type": "vertical-stack" if depth % 2 else "horizontal-stack",
+            "cards": [stack(depth - 1), leaf(depth, 1)],
+        }
+
+    return {
+        "title": f"View {number}",
+        "path": f"view-{number}",
+        "cards": [
+            stack(6),
+            {
+                "type": "markdown",
+                "content": "\n".join(
+                    f"Line {line} of the notes for view {number}, long enough to wrap in YAML."
+                    for line in range(20)
+                ),
+            },
+        ],
+    }
+
+
+def synthetic_storage(target_size):
+    """Build a storage file of roughly target_size bytes."""
+    view_size = len(json.dumps(synthetic_view(0), indent=2))
+    views = max(1, target_size // view_size)
+    return {
+        "version": 1,
+        "minor_version": 1,
+        "key": "lovelace",
+        "data": {"title": "Synthetic", "views": [synthetic_view(v) for v in range(views)]},
+    }
+
+
+async def run_once(func, before=None):
+    """Run func once and return (seconds, longest event loop block in seconds)."""
+    if before:
+        await before()
+    longest = 0.0
+    done = False
+
+    async def watch_loop():
+        # Every iteration yields to the loop, so a long gap means it was blocked
+        nonlocal longest
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            longest = max(longest, time.perf_counter() - start)
+
+    watcher = asyncio.get_running_loop().create_task(watch_loop())
+    start = time.perf_counter()
+    await func()
+    elapsed = time.perf_counter() - start
+    done = True
+    await watcher
+    return elapsed, longest
+
+
+async def measure(repeat, func, before=None):
+    """Return (best seconds, peak bytes, longest event loop block in seconds).
+
+    Timed runs are made without tracemalloc, which slows allocation down; one
+    extra run measures the peak memory.
+    """
+    runs = [await run_once(func, before) for _ in range(repeat)]
+    tracemalloc.start()
+    await run_once(func, before)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(run[0] for run in runs), peak, max(run[1] for run in runs)
+
+
+def report(name, size, result):
+    """Print one result line."""
+    elapsed, peak, block = result
+    print(
+        f"{name:<34} {size / elapsed / 1024 / 1024:>9.1f} {peak / 1024 / 1024:>10.1f} "
+        f"{block * 1000:>9.1f} {elapsed * 1000:>10.1f}"
+    )
+
+
+async def benchmark_size(size, args):
+    """Benchmark every operation on one generated storage file."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        storage_dir = os.path.join(config_dir, ".storage")
+        os.makedirs(storage_dir)
+        storage_file = os.path.join(storage_dir, "lovelace")
+        storage_data = synthetic_storage(size)
+        raw = json.dumps(storage_data, indent=2).encode("utf-8")
+        with open(storage_file, "wb") as f:
+            f.write(raw)
+
+        # Set up like the tests, so the benchmark follows the integration's setup
+        hass = await async_setup_hass(config_dir)
+
+        print(f"\nStorage file: {len(raw):,} bytes, {len(storage_data['data']['views'])} views")
+        print(f"{'operation':<34} {'MB/s':>9} {'peak MB':>10} {'block ms':>9} {'time ms':>10}")
+
+        for mode in args.modes.split(","):
+            hass.data[DOMAIN][CONF_BACKUP_MODE] = mode
+
+            async def next_second():
+                # Backups made within the same second share a timestamp
+                await asyncio.sleep(1.0 - time.time() % 1.0)
+
+            async def backup():
+                await hass.services.async_call(DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"})
+
+            report(f"create_backup ({mode})", len(raw), await measure(args.repeat, backup, next_second))
+
+            async def restore():
+                await hass.services.async_call(DOMAIN, SERVICE_RESTORE_BACKUP, {"dashboard_id": "lovelace"})
+
+            report(f"restore_backup ({mode})", len(raw), await measure(args.repeat, restore))
+
+        async def resolve():
+            await hass.async_add_executor_job(get_storage_file_path, hass, "lovelace")
+
+        report("get_storage_file_path", len(raw), await measure(args.repeat, resolve))
+
+        async def restore_config():
+            await restore_dashboard_config(hass, "lovelace", storage_data["data"])
+
+        report("restore_dashboard_config", len(raw), await measure(args.repeat, restore_config))
+
+
+async def main():
+    """Main function."""
+    args = parse_args()
+    for size in args.sizes.split(","):
+        await benchmark_size(parse_size(size), args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
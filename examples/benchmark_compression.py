@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compression codecs offered by the Dashboard Backup component.
+For each codec and level this writes a JSON backup of a Lovelace storage file
+the way the component does, then restores it through the streaming decoder,
+and reports size, compression ratio, write time and restore time.
+
+Run it from the repository root inside a Home Assistant development
+environment, optionally pointing it at a real storage file:
+
+    python examples/benchmark_compression.py --storage-file /config/.storage/lovelace
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from custom_components.dashboard_backup.compression import (  # noqa: E402
+    CHUNK_SIZE,
+    compressed_name,
+)
+from custom_components.dashboard_backup.const import COMPRESSIONS  # noqa: E402
+from custom_components.dashboard_backup.integrity import (  # noqa: E402
+    open_verified,
+    write_with_checksum,
+)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark backup compression codecs")
+    parser.add_argument("--storage-file", help="Lovelace storage file to compress (default: synthetic)")
+    parser.add_argument("--views", type=int, default=40, help="Views in the synthetic dashboard")
+    parser.add_argument("--cards", type=int, default=30, help="Cards per view in the synthetic dashboard")
+    parser.add_argument("--levels", default="1,6,9", help="Comma separated compression levels to try")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    return parser.parse_args()
+
+
+def synthetic_storage(views, cards):
+    """Build a Lovelace storage file with repetitive, realistic cards."""
+    return {
+        "version": 1,
+        "minor_version": 1,
+        "key": "lovelace",
+        "data": {
+            "title": "Synthetic",
+            "views": [
+                {
+                    "title": f"View {v}",
+                    "path": f"view-{v}",
+                    "cards": [
+                        {
+                            "type": "entities",
+                            "title": f"Room {v}.{c}",
+                            "entities": [
+                                {"entity": f"light.room_{v}_{c}_{e}", "name": f"Light {e}"}
+                                for e in range(5)
+                            ],
+                        }
+                        for c in range(cards)
+                    ],
+                }
+                for v in range(views)
+            ],
+        },
+    }
+
+
+def best_of(repeat, func):
+    """Return the fastest wall-clock time of several runs of func."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Main function."""
+    args = parse_args()
+
+    if args.storage_file:
+        with open(args.storage_file, "rb") as f:
+            raw = f.read()
+    else:
+        raw = json.dumps(synthetic_storage(args.views, args.cards), indent=2).encode("utf-8")
+
+    levels = [int(level) for level in args.levels.split(",")]
+    print(f"Source size: {len(raw):,} bytes\n")
+    print(f"{'codec':<6} {'level':>5} {'size':>12} {'ratio':>7} {'write ms':>9} {'restore ms':>11}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        restored_path = os.path.join(tmp_dir, "restored")
+        for codec in COMPRESSIONS:
+            for level in levels if codec != "none" else [0]:
+                path = os.path.join(tmp_dir, compressed_name("backup.json", codec))
+
+                # The same write and streaming restore the integration uses
+                write_time = best_of(
+                    args.repeat, lambda: write_with_checksum(path, raw, codec, level)
+                )
+
+                def restore():
+                    with open_verified(path) as src, open(restored_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+                restore_time = best_of(args.repeat, restore)
+
+                with open(restored_path, "rb") as f:
+                    if f.read() != raw:
+                        print(f"{codec}: restored content does not match the source!")
+
+                size = os.path.getsize(path)
+                print(
+                    f"{codec:<6} {level:>5} {size:>12,} {len(raw) / size:>6.1f}x "
+                    f"{write_time * 1000:>9.1f} {restore_time * 1000:>11.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
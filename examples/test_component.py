@@ -20,6 +20,7 @@ def parse_args():
     parser.add_argument("--action", choices=["backup", "restore", "list"], default="backup", 
                         help="Action to perform (backup, restore, or list backups)")
     parser.add_argument("--backup-file", help="Specific backup file to restore (for restore action)")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of backups to list (for list action)")
     return parser.parse_args()
 
 def get_headers(token):
@@ -69,65 +70,29 @@ def restore_backup(args):
 
 def list_backups(args):
     """List available backups for the specified dashboard."""
-    url = f"{args.url}/api/config"
+    url = f"{args.url}/api/services/dashboard_backup/list_backups?return_response"
+    data = {"dashboard_id": args.dashboard, "limit": args.limit}
     
-    print(f"Fetching Home Assistant configuration...")
-    response = requests.get(url, headers=get_headers(args.token))
+    print(f"Fetching backups of dashboard '{args.dashboard}'...")
+    response = requests.post(url, headers=get_headers(args.token), json=data)
     
     if response.status_code != 200:
-        print(f"Error fetching configuration: {response.status_code} - {response.text}")
+        print(f"Error listing backups: {response.status_code} - {response.text}")
         return False
     
-    config = response.json()
-    config_dir = config.get("config_dir", "")
-    
-    # Try to find the backup directory
-    backup_dirs = [
-        os.path.join(config_dir, "dashboard_backups"),
-        os.path.join(config_dir, "backup", "dashboard_backups"),
-        os.path.join(config_dir, "backups", "dashboard_backups"),
-    ]
-    
-    backup_files = []
-    for backup_dir in backup_dirs:
-        try:
-            # Use the API to list files in the directory
-            files_url = f"{args.url}/api/template"
-            template = (
-                "{{ states.sensor.date.last_updated }}"
-                "{% set files = states('sensor.date') %}"
-                f"{{% for file in states.sensor.date.attributes.files %}}"
-                f"{{% if file.startswith('dashboard_{args.dashboard}_') and file.endswith('.yaml') %}}"
-                "{{ file }},"
-                f"{{% endif %}}"
-                f"{{% endfor %}}"
-            )
-            template_data = {"template": template}
-            
-            files_response = requests.post(files_url, headers=get_headers(args.token), json=template_data)
-            if files_response.status_code == 200:
-                file_list = files_response.text.strip().split(",")
-                if file_list and file_list[0]:
-                    backup_files = file_list
-                    break
-        except Exception as e:
-            print(f"Error listing files in {backup_dir}: {str(e)}")
+    result = response.json().get("service_response", {})
+    backups = result.get("backups", [])
     
-    if not backup_files:
+    if not backups:
         print(f"No backups found for dashboard '{args.dashboard}'")
         return False
     
-    print(f"\nAvailable backups for dashboard '{args.dashboard}':")
-    for i, file in enumerate(sorted(backup_files, reverse=True)):
-        if file:  # Skip empty entries
-            # Try to parse the timestamp from the filename
-            try:
-                timestamp_str = file.split("_", 2)[2].split(".")[0]
-                timestamp = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
-                formatted_time = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                print(f"{i+1}. {file} (Created: {formatted_time})")
-            except:
-                print(f"{i+1}. {file}")
+    print(f"\nAvailable backups for dashboard '{args.dashboard}' "
+          f"(showing {len(backups)} of {result.get('total', len(backups))}):")
+    for i, backup in enumerate(backups):
+        created = datetime.fromisoformat(backup["created"]).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"{i+1}. {backup['backup_file']} (Created: {created}, "
+              f"{backup['format']}, {backup['size']} bytes)")
     
     return True
 
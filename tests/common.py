@@ -0,0 +1,120 @@
+"""Stand-ins for Home Assistant shared by the tests and the offline benchmark.
+
+The integration runs against a minimal stand-in for the Home Assistant core
+object. ``examples/benchmark_backups.py`` imports this module too, so the
+benchmark is set up exactly like the tests.
+"""
+import asyncio
+import os
+
+
+class _Config:
+    def __init__(self, config_dir):
+        self.config_dir = config_dir
+
+
+class _Bus:
+    def __init__(self):
+        self.events = []
+
+    def async_fire(self, event_type, event_data=None):
+        self.events.append((event_type, event_data))
+
+
+class _Call:
+    def __init__(self, data):
+        self.data = data
+
+
+class _Services:
+    """Service registry that only knows the services registered on it."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def async_register(self, domain, service, handler, schema=None, **kwargs):
+        self.handlers[(domain, service)] = (handler, schema)
+
+    def async_remove(self, domain, service):
+        self.handlers.pop((domain, service), None)
+
+    def has_service(self, domain, service):
+        return (domain, service) in self.handlers
+
+    async def async_call(self, domain, service, service_data=None, **kwargs):
+        from homeassistant.exceptions import HomeAssistantError
+
+        if (domain, service) not in self.handlers:
+            raise HomeAssistantError(f"Service {domain}.{service} not found")
+        handler, schema = self.handlers[(domain, service)]
+        return await handler(_Call(schema(service_data or {}) if schema else service_data))
+
+
+class FakeHass:
+    """Just enough of the Home Assistant core object for the integration."""
+
+    def __init__(self, config_dir):
+        self.config = _Config(config_dir)
+        self.data = {}
+        self.bus = _Bus()
+        self.services = _Services()
+        # Services the integration calls after a backup or restore
+        for domain, service in (("persistent_notification", "create"), ("lovelace", "reload")):
+            self.services.async_register(domain, service, self._noop)
+        self.loop = asyncio.get_running_loop()
+
+    @staticmethod
+    async def _noop(call):
+        return None
+
+    async def async_add_executor_job(self, func, *args):
+        return await self.loop.run_in_executor(None, func, *args)
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+
+async def async_setup_hass(config_dir):
+    """Return a fake hass with the integration's data and services set up."""
+    from custom_components.dashboard_backup import register_services
+    from custom_components.dashboard_backup.const import (
+        CONF_BACKUP_PATH,
+        DATA_COORDINATOR,
+        DATA_INDEX,
+        DATA_JOBS,
+        DATA_RESOLVER,
+        DATA_STATS,
+        DATA_STRATEGIES,
+        DEFAULT_BACKUP_PATH,
+        DOMAIN,
+    )
+    from custom_components.dashboard_backup.coordinator import JobCoordinator
+    from custom_components.dashboard_backup.index import BackupIndex
+    from custom_components.dashboard_backup.jobs import JobQueue
+    from custom_components.dashboard_backup.resolver import StoragePathResolver
+    from custom_components.dashboard_backup.stats import BackupStats
+    from custom_components.dashboard_backup.storage_io import make_dirs
+    from custom_components.dashboard_backup.strategies import StrategyRegistry
+
+    class _Stats(BackupStats):
+        """Metrics without sensors to notify."""
+
+        def async_updated(self):
+            pass
+
+    hass = FakeHass(str(config_dir))
+    backup_path = os.path.join(str(config_dir), DEFAULT_BACKUP_PATH)
+    await hass.async_add_executor_job(make_dirs, backup_path)
+    index = BackupIndex(backup_path)
+    await hass.async_add_executor_job(index.load)
+    hass.data[DOMAIN] = {
+        CONF_BACKUP_PATH: DEFAULT_BACKUP_PATH,
+        DATA_INDEX: index,
+        DATA_RESOLVER: StoragePathResolver(str(config_dir)),
+        DATA_STATS: _Stats(hass),
+        DATA_STRATEGIES: StrategyRegistry(hass, persist=False),
+        DATA_COORDINATOR: JobCoordinator(hass),
+        DATA_JOBS: JobQueue(hass, 1, 10),
+    }
+    register_services(hass)
+    return hass
@@ -0,0 +1,47 @@
+"""Fixtures for the Dashboard Backup tests.
+
+The integration runs against the minimal stand-in for the Home Assistant
+core object in ``common.py``. Tests are plain functions driving their own
+event loop with ``asyncio.run``.
+"""
+import asyncio
+import builtins
+import functools
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Calls that touch the filesystem; os.path.exists and friends go through os.stat
+BLOCKING_CALLS = [
+    (builtins, "open"),
+    (os, "open"),
+    (os, "stat"),
+    (os, "listdir"),
+    (os, "scandir"),
+    (os, "mkdir"),
+    (os, "replace"),
+    (os, "remove"),
+    (os, "unlink"),
+    (os, "link"),
+    (os, "fsync"),
+]
+
+
+@pytest.fixture
+def no_blocking_io(monkeypatch):
+    """Fail any filesystem call made on the thread running the event loop."""
+
+    def guard(func, name):
+        @functools.wraps(func)
+        def guarded(*args, **kwargs):
+            if asyncio._get_running_loop() is not None:
+                raise AssertionError(f"Blocking call {name}{args!r} on the event loop")
+            return func(*args, **kwargs)
+
+        return guarded
+
+    for module, name in BLOCKING_CALLS:
+        monkeypatch.setattr(module, name, guard(getattr(module, name), f"{module.__name__}.{name}"))
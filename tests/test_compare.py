@@ -0,0 +1,32 @@
+"""Tests for comparing dashboard snapshots."""
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup.compare import (  # noqa: E402
+    diff_trees,
+    tree_from_storage,
+)
+
+
+def _tree(*views):
+    return tree_from_storage({"data": {"title": "Home", "views": list(views)}})
+
+
+def test_views_sharing_a_title_are_paired_in_order():
+    """Every old view with a repeated title is matched, not just the last one."""
+    old = _tree(
+        {"title": "Room", "icon": "mdi:sofa", "cards": []},
+        {"title": "Room", "icon": "mdi:bed", "cards": []},
+    )
+    new = _tree(
+        {"title": "Room", "icon": "mdi:sofa-outline", "cards": []},
+        {"title": "Room", "icon": "mdi:bed-outline", "cards": []},
+    )
+
+    views = diff_trees(old, new)["views"]
+
+    assert [(view["change"], view["from_index"], view["index"]) for view in views] == [
+        ("modified", 0, 0),
+        ("modified", 1, 1),
+    ]
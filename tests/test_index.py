@@ -0,0 +1,117 @@
+"""Tests for the backup index."""
+import contextlib
+import json
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup import index as index_module  # noqa: E402
+from custom_components.dashboard_backup.index import (  # noqa: E402
+    INDEX_FILENAME,
+    BackupIndex,
+    is_bare_filename,
+)
+from custom_components.dashboard_backup.pipeline import (  # noqa: E402
+    create_incremental_backup_files,
+)
+
+
+def _backup_chain(tmp_path, count):
+    """Write an incremental chain of backups and index them."""
+    storage_file = tmp_path / "lovelace"
+    backup_path = tmp_path / "backups"
+    backup_path.mkdir()
+    index = BackupIndex(str(backup_path))
+    index.load()
+    previous = None
+    for number in range(count):
+        storage_file.write_text(json.dumps({"data": {"title": f"Version {number}"}}))
+        timestamp = f"20240101_00000{number}"
+        entry = create_incremental_backup_files(
+            str(storage_file),
+            str(backup_path),
+            f"dashboard_lovelace_{timestamp}",
+            previous["file"] if previous else None,
+            10,
+        )
+        entry["timestamp"] = timestamp
+        index.add("lovelace", entry)
+        previous = entry
+    return backup_path, index
+
+
+def test_chain_checksums_follow_deltas(tmp_path):
+    """Only the files of the requested chains are looked up."""
+    _, index = _backup_chain(tmp_path, 3)
+    files = [entry["file"] for entry in index.entries("lovelace")]
+
+    assert list(index.chain_checksums([files[2]])) == files[::-1]
+    assert list(index.chain_checksums([files[0], None])) == [files[0]]
+    assert index.chain_checksums(["dashboard_lovelace_20990101_000000.json"]) == {}
+
+
+def test_rebuild_skips_unreadable_backups(tmp_path):
+    """A corrupt delta is left out of a rebuilt index instead of failing the load."""
+    backup_path, index = _backup_chain(tmp_path, 3)
+    files = [entry["file"] for entry in index.entries("lovelace")]
+    (backup_path / files[1]).write_bytes(b"not a delta")
+    (backup_path / INDEX_FILENAME).unlink()
+
+    rebuilt = BackupIndex(str(backup_path))
+    rebuilt.load()
+
+    assert [entry["file"] for entry in rebuilt.entries("lovelace")] == [files[0], files[2]]
+
+
+@pytest.mark.parametrize(
+    ("filename", "bare"),
+    [
+        ("dashboard_lovelace_20240101_000000.json", True),
+        ("../secrets.yaml", False),
+        ("objects/ab/cdef", False),
+        ("dashboard_lovelace_20240101_000000..json", False),
+    ],
+)
+def test_is_bare_filename(filename, bare):
+    """Only names that stay inside the backup directory are bare."""
+    assert is_bare_filename(filename) is bare
+
+
+def test_lookups_do_not_wait_for_index_writes(tmp_path, monkeypatch):
+    """Reading the index while it is being written returns at once."""
+    _, index = _backup_chain(tmp_path, 2)
+    files = [entry["file"] for entry in index.entries("lovelace")]
+    writing = threading.Event()
+    looked_up = threading.Event()
+    real_writer = index_module.atomic_writer
+    waited = []
+
+    @contextlib.contextmanager
+    def slow_writer(path):
+        writing.set()
+        waited.append(looked_up.wait(2))
+        with real_writer(path) as f:
+            yield f
+
+    monkeypatch.setattr(index_module, "atomic_writer", slow_writer)
+    writer = threading.Thread(target=index.remove, args=("lovelace", {"20240101_000001"}))
+    writer.start()
+    try:
+        assert writing.wait(5)
+        assert index.find(files[0])["dashboard_id"] == "lovelace"
+        assert index.latest("lovelace")["file"] == files[0]
+    finally:
+        looked_up.set()
+        writer.join()
+    # The write was still waiting when the lookups returned
+    assert waited == [True]
+
+
+def test_index_is_written_atomically(tmp_path):
+    """Saving the index leaves no temporary file behind."""
+    backup_path, _ = _backup_chain(tmp_path, 2)
+
+    assert not [name for name in os.listdir(backup_path) if name.endswith(".tmp")]
@@ -0,0 +1,45 @@
+"""Tests for the background job queue."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup.const import (  # noqa: E402
+    EVENT_JOB_COMPLETED,
+    EVENT_JOB_PROGRESS,
+)
+from custom_components.dashboard_backup.jobs import JOB_BACKUP_ALL, JobQueue  # noqa: E402
+
+from .common import FakeHass  # noqa: E402
+
+
+def test_events_carry_a_summary_of_the_result(tmp_path):
+    """Result lists stay out of job events, and get_job still has them."""
+    backups = [
+        {"backup_file": f"dashboard_{number}_20240101_000000.json"} for number in range(50)
+    ]
+
+    async def run():
+        hass = FakeHass(str(tmp_path))
+        jobs = JobQueue(hass, 1, 10)
+        jobs.async_start()
+
+        async def work(report):
+            report(0.5)
+            return {"backups": backups, "failed": [], "duration": 1.5}
+
+        job = jobs.async_submit(JOB_BACKUP_ALL, None, work)
+        while job.finished is None:
+            await asyncio.sleep(0)
+        jobs.async_stop()
+        return hass.bus.events, jobs.get(job.job_id).as_dict()
+
+    events, description = asyncio.run(run())
+
+    assert [event_type for event_type, _ in events] == [EVENT_JOB_PROGRESS] * 4 + [
+        EVENT_JOB_COMPLETED
+    ]
+    assert all("result" not in data for _, data in events)
+    assert events[-1][1]["summary"] == {"backups": 50, "failed": 0, "duration": 1.5}
+    assert description["result"]["backups"] == backups
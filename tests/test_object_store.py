@@ -0,0 +1,35 @@
+"""Tests for the content-addressed object store."""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup import object_store  # noqa: E402
+from custom_components.dashboard_backup.object_store import (  # noqa: E402
+    OBJECTS_DIR,
+    get_object,
+    put_object,
+)
+
+
+def test_concurrent_writers_store_one_blob(tmp_path, monkeypatch):
+    """Backups storing the same blob at once each succeed and leave one file."""
+    card = {"type": "markdown", "content": "x" * 100000}
+    # Every writer finds the blob missing before any of them writes it
+    barrier = threading.Barrier(8)
+
+    def make_dirs(path):
+        barrier.wait(5)
+        os.makedirs(path, exist_ok=True)
+
+    monkeypatch.setattr(object_store, "make_dirs", make_dirs)
+    with ThreadPoolExecutor(8) as pool:
+        digests = set(pool.map(lambda _: put_object(str(tmp_path), card), range(8)))
+
+    assert len(digests) == 1
+    digest = digests.pop()
+    assert get_object(str(tmp_path), digest) == card
+    assert os.listdir(tmp_path / OBJECTS_DIR / digest[:2]) == [digest[2:]]
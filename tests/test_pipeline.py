@@ -0,0 +1,80 @@
+"""Tests for the backup pipeline."""
+import json
+import os
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup.const import COMPRESSION_GZIP  # noqa: E402
+from custom_components.dashboard_backup.integrity import CorruptBackupError  # noqa: E402
+from custom_components.dashboard_backup.pipeline import (  # noqa: E402
+    create_backup_files,
+    create_incremental_backup_files,
+    load_storage_data,
+    restore_storage_file,
+)
+from custom_components.dashboard_backup.stats import backup_metrics  # noqa: E402
+
+
+def _storage(title):
+    return {"version": 1, "key": "lovelace", "data": {"title": title, "views": [{"cards": []}]}}
+
+
+def test_incremental_deltas_are_compressed_and_verified(tmp_path):
+    """Deltas go through the codec, and a damaged delta is detected on restore."""
+    storage_file = tmp_path / "lovelace"
+    backup_path = tmp_path / "backups"
+    backup_path.mkdir()
+
+    storage_file.write_text(json.dumps(_storage("First")))
+    first = create_incremental_backup_files(
+        str(storage_file), str(backup_path), "dashboard_lovelace_20240101_000000", None, 5,
+        COMPRESSION_GZIP,
+    )
+    storage_file.write_text(json.dumps(_storage("Second")))
+    second = create_incremental_backup_files(
+        str(storage_file), str(backup_path), "dashboard_lovelace_20240101_000001", first["file"], 5,
+        COMPRESSION_GZIP,
+    )
+
+    assert second["format"] == "delta"
+    assert second["file"] == "dashboard_lovelace_20240101_000001.delta.json.gz"
+    assert second["compression"] == COMPRESSION_GZIP
+    assert second["base"] == first["file"]
+    assert (backup_path / second["file"]).read_bytes()[:2] == b"\x1f\x8b"
+    # Files are written through a temporary file that replaces them
+    assert sorted(os.listdir(backup_path)) == sorted(first["files"] + second["files"])
+
+    checksums = {**first["checksums"], **second["checksums"]}
+    restored = tmp_path / "restored"
+    restore_storage_file(str(backup_path), second["file"], str(restored), checksums)
+    assert json.loads(restored.read_text())["data"]["title"] == "Second"
+
+    delta = backup_path / second["file"]
+    delta.write_bytes(delta.read_bytes()[:-4] + b"\x00\x00\x00\x00")
+    with pytest.raises((CorruptBackupError, OSError, EOFError)):
+        load_storage_data(str(backup_path), second["file"], checksums)
+
+
+def test_compression_ratio_ignores_yaml_companion(tmp_path):
+    """A compressed full backup reports the ratio of its JSON file."""
+    storage_file = tmp_path / "lovelace"
+    backup_path = tmp_path / "backups"
+    backup_path.mkdir()
+    views = [
+        {"title": f"View {number}", "cards": [{"type": "markdown"}] * 20} for number in range(20)
+    ]
+    storage_file.write_text(
+        json.dumps({"version": 1, "key": "lovelace", "data": {"views": views}})
+    )
+
+    entry = create_backup_files(
+        str(storage_file), str(backup_path), "dashboard_lovelace_20240101_000000", None,
+        COMPRESSION_GZIP,
+    )
+
+    json_size = entry["checksums"][entry["file"]]["size"]
+    assert len(entry["files"]) == 2
+    assert backup_metrics(entry)["compression_ratio"] == round(entry["bytes_read"] / json_size, 2)
+    assert backup_metrics(entry)["compression_ratio"] > 1
@@ -0,0 +1,45 @@
+"""Tests for the retention policies."""
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup.pipeline import create_backup_files  # noqa: E402
+from custom_components.dashboard_backup.retention import (  # noqa: E402
+    RetentionPolicy,
+    plan_pruning,
+)
+
+
+def _manifest_backups(tmp_path, count):
+    """Write deduplicated backups that each hold a large card of their own."""
+    storage_file = tmp_path / "lovelace"
+    backup_path = tmp_path / "backups"
+    backup_path.mkdir()
+    entries = []
+    for number in range(count):
+        card = {"type": "markdown", "content": f"{number}" * 10000}
+        storage_file.write_text(
+            json.dumps({"data": {"title": "Home", "views": [{"cards": [card]}]}})
+        )
+        timestamp = f"20240101_00000{number}"
+        entry = create_backup_files(
+            str(storage_file), str(backup_path), f"dashboard_lovelace_{timestamp}", ["manifest"]
+        )
+        entry["timestamp"] = timestamp
+        entries.append(entry)
+    return str(backup_path), entries
+
+
+def test_max_bytes_counts_unshared_objects(tmp_path):
+    """Manifests are tiny, so the size limit has to count the objects they free."""
+    backup_path, entries = _manifest_backups(tmp_path, 4)
+    assert sum(entry["size"] for entry in entries) < 10000
+
+    plan = plan_pruning(backup_path, {"lovelace": entries}, RetentionPolicy(max_bytes=25000))
+
+    assert [entry["file"] for entry in plan["lovelace"]] == [
+        entries[1]["file"],
+        entries[0]["file"],
+    ]
@@ -0,0 +1,37 @@
+"""Tests for the JSON and YAML serialization layer."""
+import json
+import math
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.dashboard_backup.serialization import (  # noqa: E402
+    dump_yaml,
+    dumps_json,
+    loads_json,
+)
+
+
+@pytest.mark.parametrize("value", [math.nan, math.inf, -math.inf])
+@pytest.mark.parametrize("indent", [False, True])
+def test_non_finite_floats_match_the_standard_library(value, indent):
+    """NaN and infinities are written as the json module writes them, not as null."""
+    obj = {"min": value, "severity": None, "max": [1.5, value]}
+    expected = (
+        json.dumps(obj, indent=2, ensure_ascii=False)
+        if indent
+        else json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    )
+
+    data = dumps_json(obj, indent)
+
+    assert data == expected.encode("utf-8")
+    assert loads_json(data)["severity"] is None
+
+
+def test_yaml_does_not_fold_long_lines():
+    """Long strings stay on one line whichever YAML backend is in use."""
+    url = "https://example.com/" + "a" * 200
+
+    assert dump_yaml({"url": url}) == f"url: {url}\n"
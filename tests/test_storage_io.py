@@ -0,0 +1,147 @@
+"""Tests that backups and restores keep file I/O off the event loop."""
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.exceptions import ServiceValidationError  # noqa: E402
+
+from custom_components.dashboard_backup import async_diff_backups  # noqa: E402
+from custom_components.dashboard_backup.const import (  # noqa: E402
+    BACKUP_MODES,
+    CONF_BACKUP_MODE,
+    DATA_INDEX,
+    DOMAIN,
+    SERVICE_CREATE_BACKUP,
+    SERVICE_DIFF_BACKUPS,
+    SERVICE_LIST_BACKUPS,
+    SERVICE_RESTORE_BACKUP,
+)
+from custom_components.dashboard_backup.storage_io import read_bytes  # noqa: E402
+
+from .common import async_setup_hass  # noqa: E402
+
+
+def _write_dashboard(config_dir, title, storage_key="lovelace"):
+    """Write the storage file of a dashboard."""
+    storage_dir = os.path.join(config_dir, ".storage")
+    os.makedirs(storage_dir, exist_ok=True)
+    with open(os.path.join(storage_dir, storage_key), "w") as f:
+        json.dump(
+            {
+                "version": 1,
+                "minor_version": 1,
+                "key": storage_key,
+                "data": {"title": title, "views": [{"title": "Home", "cards": []}]},
+            },
+            f,
+            indent=2,
+        )
+
+
+def _read_title(config_dir):
+    """Return the title in the storage file of the main dashboard."""
+    with open(os.path.join(config_dir, ".storage", "lovelace")) as f:
+        return json.load(f)["data"]["title"]
+
+
+def test_guard_catches_blocking_calls(tmp_path, no_blocking_io):
+    """Reading a file on the event loop fails the test."""
+    path = tmp_path / "file"
+    path.write_bytes(b"data")
+
+    async def read_on_loop():
+        return read_bytes(str(path))
+
+    with pytest.raises(AssertionError, match="event loop"):
+        asyncio.run(read_on_loop())
+
+
+@pytest.mark.parametrize("mode", BACKUP_MODES)
+def test_backup_and_restore_do_not_block(tmp_path, no_blocking_io, mode):
+    """Backing up, listing, comparing and restoring run their I/O in the executor."""
+    config_dir = str(tmp_path)
+    _write_dashboard(config_dir, "First")
+
+    async def run():
+        hass = await async_setup_hass(config_dir)
+        hass.data[DOMAIN][CONF_BACKUP_MODE] = mode
+
+        first = await hass.services.async_call(
+            DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"}
+        )
+        await hass.async_add_executor_job(_write_dashboard, config_dir, "Second")
+        await hass.services.async_call(DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"})
+
+        listed = await hass.services.async_call(
+            DOMAIN, SERVICE_LIST_BACKUPS, {"dashboard_id": "lovelace"}
+        )
+        assert listed["total"] == 2
+
+        diff = await async_diff_backups(hass, "lovelace", first["backup_file"], None)
+        assert diff["changed"]
+
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_RESTORE_BACKUP,
+            {"dashboard_id": "lovelace", "backup_file": first["backup_file"]},
+        )
+        assert await hass.async_add_executor_job(_read_title, config_dir) == "First"
+
+        # Without a backup file the latest one is restored
+        await hass.services.async_call(DOMAIN, SERVICE_RESTORE_BACKUP, {"dashboard_id": "lovelace"})
+        assert await hass.async_add_executor_job(_read_title, config_dir) == "Second"
+
+    asyncio.run(run())
+
+
+def test_aliases_share_backups(tmp_path, no_blocking_io):
+    """A dashboard's id and its aliases index and restore the same backups."""
+    config_dir = str(tmp_path)
+    _write_dashboard(config_dir, "Kitchen", "lovelace.dashboard_kitchen")
+
+    async def run():
+        hass = await async_setup_hass(config_dir)
+
+        created = await hass.services.async_call(
+            DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "kitchen"}
+        )
+        listed = await hass.services.async_call(
+            DOMAIN, SERVICE_LIST_BACKUPS, {"dashboard_id": "dashboard_kitchen"}
+        )
+        assert [backup["backup_file"] for backup in listed["backups"]] == [created["backup_file"]]
+        assert list(hass.data[DOMAIN][DATA_INDEX].dashboards()) == ["dashboard_kitchen"]
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "backup_file", ["../secrets.yaml", "dashboard_kitchen_20240101_000000.json"]
+)
+def test_backup_files_are_checked_against_the_index(tmp_path, backup_file):
+    """Comparing or restoring only reads the dashboard's own backups."""
+    config_dir = str(tmp_path)
+    _write_dashboard(config_dir, "Home")
+    (tmp_path / "secrets.yaml").write_text("password: hunter2\n")
+
+    async def run():
+        hass = await async_setup_hass(config_dir)
+        await hass.services.async_call(DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"})
+
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_DIFF_BACKUPS,
+                {"dashboard_id": "lovelace", "to_backup": backup_file},
+            )
+        with pytest.raises(ServiceValidationError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_RESTORE_BACKUP,
+                {"dashboard_id": "lovelace", "backup_file": backup_file},
+            )
+
+    asyncio.run(run())
@@ -0,0 +1,128 @@
+"""Tests for the backup integrity scrub."""
+import asyncio
+import json
+import os
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+from custom_components import dashboard_backup  # noqa: E402
+from custom_components.dashboard_backup import get_backup_path  # noqa: E402
+from custom_components.dashboard_backup.const import (  # noqa: E402
+    DATA_INDEX,
+    DATA_VERIFY_TASK,
+    DOMAIN,
+    EVENT_VERIFY_COMPLETED,
+    SERVICE_CREATE_BACKUP,
+    SERVICE_RESTORE_BACKUP,
+    SERVICE_VERIFY_BACKUPS,
+)
+
+from .common import async_setup_hass  # noqa: E402
+
+
+def _write_dashboard(tmp_path):
+    storage_dir = tmp_path / ".storage"
+    storage_dir.mkdir(exist_ok=True)
+    (storage_dir / "lovelace").write_text(
+        json.dumps({"version": 1, "key": "lovelace", "data": {"views": [{"cards": []}]}})
+    )
+
+
+def _append(path, data):
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+async def _async_verify(hass, data=None):
+    """Call the verify service and wait for the scrub to finish."""
+    await hass.services.async_call(DOMAIN, SERVICE_VERIFY_BACKUPS, data or {})
+    await hass.data[DOMAIN][DATA_VERIFY_TASK]
+    return [data for event_type, data in hass.bus.events if event_type == EVENT_VERIFY_COMPLETED]
+
+
+def test_verify_service_checks_every_file(tmp_path):
+    """A scrub of healthy backups checks their files against the index."""
+    _write_dashboard(tmp_path)
+
+    async def run():
+        hass = await async_setup_hass(str(tmp_path))
+        await hass.services.async_call(DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"})
+        files = hass.data[DOMAIN][DATA_INDEX].latest("lovelace")["files"]
+        return files, await _async_verify(hass)
+
+    files, completed = asyncio.run(run())
+
+    assert len(completed) == 1
+    assert completed[0]["checked"] == len(files)
+    assert completed[0]["status"] == "completed"
+    assert completed[0]["unverified"] == 0
+    assert completed[0]["corrupt"] == []
+
+
+def test_verify_reports_corrupt_files(tmp_path):
+    """A backup file that no longer matches its checksum is reported."""
+    _write_dashboard(tmp_path)
+
+    async def run():
+        hass = await async_setup_hass(str(tmp_path))
+        created = await hass.services.async_call(
+            DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"}
+        )
+        path = os.path.join(get_backup_path(hass), created["backup_file"])
+        await hass.async_add_executor_job(_append, path, b" ")
+        return created, await _async_verify(hass, {"dashboard_id": "lovelace"})
+
+    created, completed = asyncio.run(run())
+
+    assert completed[0]["status"] == "completed"
+    assert [item["file"] for item in completed[0]["corrupt"]] == [created["backup_file"]]
+    assert "checksum mismatch" in completed[0]["corrupt"][0]["error"]
+
+
+def test_verify_failure_is_announced(tmp_path, monkeypatch):
+    """A scrub that fails fires its completion event with the error."""
+    _write_dashboard(tmp_path)
+
+    async def fail(*args):
+        raise OSError("backup directory is gone")
+
+    monkeypatch.setattr(dashboard_backup, "async_verify_backups", fail)
+
+    async def run():
+        hass = await async_setup_hass(str(tmp_path))
+        return await _async_verify(hass)
+
+    completed = asyncio.run(run())
+
+    assert completed == [
+        {"dashboard_id": None, "status": "failed", "error": "backup directory is gone"}
+    ]
+
+
+def test_restore_refuses_a_corrupt_backup(tmp_path):
+    """A restore checks the backup against its checksum and leaves the dashboard alone."""
+    _write_dashboard(tmp_path)
+    storage_file = tmp_path / ".storage" / "lovelace"
+
+    async def run():
+        hass = await async_setup_hass(str(tmp_path))
+        created = await hass.services.async_call(
+            DOMAIN, SERVICE_CREATE_BACKUP, {"dashboard_id": "lovelace"}
+        )
+        path = os.path.join(get_backup_path(hass), created["backup_file"])
+        await hass.async_add_executor_job(_append, path, b" ")
+        before = await hass.async_add_executor_job(storage_file.read_bytes)
+
+        with pytest.raises(HomeAssistantError, match="checksum mismatch"):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_RESTORE_BACKUP,
+                {"dashboard_id": "lovelace", "backup_file": created["backup_file"]},
+            )
+        assert await hass.async_add_executor_job(storage_file.read_bytes) == before
+
+    asyncio.run(run())